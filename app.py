@@ -1,14 +1,58 @@
 from flask import Flask
-from routes import routes
+from routes import routes, translate_remote
+from utils import dataset_store, translation_cache, render_pool, ai_pdf_generator, metrics, compression, profiling
 import os
+import threading
+import multiprocessing
 from flask_cors import CORS
 from dotenv import load_dotenv
 
 load_dotenv()
 
 app = Flask(__name__)
+# /download gövdesini önündeki sunucuya (Apache/lighttpd X-Sendfile) bırak
+app.config["USE_X_SENDFILE"] = os.getenv("USE_X_SENDFILE", "0") == "1"
 CORS(app)
 app.register_blueprint(routes)
+# İstek kimliği (X-Request-ID), istek süreleri ve loglarda kimlik öneki
+metrics.init_app(app)
+# JSON/HTML yanıtları istemci destekliyorsa brotli veya gzip ile sıkıştırılır
+compression.init_app(app)
+# İstek profilleri (PROFILE_SECRET / PROFILE_SAMPLE_RATE yoksa kapalı, kanca kurulmaz)
+profiling.init_app(app)
+
+
+
+def start_shared_services():
+    """Sunucu başına bir kez çalışan servisler; gunicorn altında master'ın açtığı ayrı süreçte başlar."""
+    # Veri seti yerel kopyasını arka planda indir / periyodik olarak doğrula (worker'lar yeni sürümü diskten fark eder)
+    dataset_store.start_refresher()
+    # Sık kullanılan konuların çevirilerini önceden önbelleğe al (disk önbelleği tüm worker'larca paylaşılır)
+    translation_cache.start_warm_up(os.getenv("TRANSLATION_WARM_FILE"), translate_remote)
+
+
+def run_shared_services():
+    """gunicorn.conf.py'nin açtığı servis sürecinin gövdesi: servisleri başlatır, master kapanana kadar bekler."""
+    start_shared_services()
+    metrics.start_flusher()
+    threading.Event().wait()
+
+
+def start_worker_services():
+    # PDF çizim worker'larını önceden başlat (RENDER_POOL_WORKERS=0 ise kapalı; boyut worker sayısına bölünür)
+    render_pool.start()
+    # Ağır kütüphaneleri ilk istekten önce arka planda yükle (varsayılan: ilk kullanımda)
+    if os.getenv("WARMUP_ON_START", "0") == "1":
+        threading.Thread(target=ai_pdf_generator.warm_up, name="warm-up", daemon=True).start()
+
+
+# Çizim worker'ları (spawn/forkserver) bu modülü yeniden içe aktarır; servisler yalnızca ana süreçte başlar.
+# gunicorn master'ı paylaşılan servisleri kendisi başlattıysa (SHARED_SERVICES=master) worker'lar yalnızca
+# kendi çizim havuzunu açar.
+if multiprocessing.current_process().name == "MainProcess":
+    if os.getenv("SHARED_SERVICES") != "master":
+        start_shared_services()
+    start_worker_services()
 
 if __name__ == "__main__":
 
@@ -0,0 +1,213 @@
+"""
+Ölçümler için canlı servislerin yerel taklitleri (hepsi 127.0.0.1'de, rastgele portta):
+  FakeLLMServer     OpenAI uyumlu /chat/completions (stream=True dahil), ayarlanabilir gecikme,
+                    ===STEPS=== içeren hazır plan çıktısı, hata enjeksiyonu (fail: 429/5xx, error_rate)
+  FakeDatasetServer sentetik skills CSV'si (ETag / If-None-Match destekli)
+  FakeWikipedia     MediaWiki API cevabı (WIKIPEDIA_API_URL)
+  fake_provider     YouTube / DuckDuckGo yerine gecikmeli sahte sağlayıcı
+"""
+import json
+import time
+import random
+import hashlib
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+SKILLS = ["8.NS.A.2-1", "7.EE.B.4a-1", "6.NS.B.3-3", "8.NS.A.2-2", "7.RP.A.1", "7.RP.A.2", "7.RP.A.3",
+          "6.EE.B.7", "8.EE.C.7", "8.F.B.5", "8.F.A.1", "8.SP.A.1", "8.G.A.3-1", "8.G.A.1", "7.EE.A.2",
+          "8.EE.A.1", "8.EE.A.2", "7.SP.C.5"]
+
+PLAN_HTML = "<h3>Haftalık Plan</h3><table><tr><th>Hafta</th><th>Konu</th><th>Pratik</th></tr>" + "".join(
+    f"<tr><td>{i}. Hafta</td><td>Oran ve orantı, bölüm {i}</td><td>20 soru, 2 deneme</td></tr>" for i in range(1, 9)
+) + "</table><h3>Kaynak Önerileri</h3><ul>" + "".join(
+    f"<li><a href='https://example.com/{i}'>Kaynak {i}</a></li>" for i in range(6)
+) + "</ul>"
+PLAN_STEPS = [f"{i}. Adım: Konu tekrarı ve soru çözümü" for i in range(1, 9)]
+PLAN_CONTENT = PLAN_HTML + "\n===STEPS===\n" + "\n".join(PLAN_STEPS)
+
+
+class _Server:
+    handler = None
+
+    def __init__(self):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self.handler)
+        self.httpd.daemon_threads = True
+        self.httpd.owner = self
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.httpd.server_port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    @property
+    def owner(self):
+        return self.server.owner
+
+    def _send(self, status, body, content_type="application/json", headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+# --- LLM ---
+
+class _LLMHandler(_Handler):
+    def do_POST(self):
+        if not self.path.endswith("/chat/completions"):
+            return self._send(404, b"{}")
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        owner = self.owner
+        owner.requests += 1
+        failure = owner.next_failure()
+        if failure:
+            status, retry_after = failure
+            headers = {"Retry-After": str(retry_after)} if retry_after is not None else None
+            return self._send(status, json.dumps({"error": {"message": f"fake {status}"}}).encode(), headers=headers)
+
+        system = " ".join(m.get("content", "") for m in request.get("messages", []) if m.get("role") == "system")
+        content = "Ratio" if "Translate" in system else PLAN_CONTENT
+        time.sleep(owner.latency)
+
+        base = {"id": "chatcmpl-fake", "created": int(time.time()), "model": request.get("model", "fake")}
+        if not request.get("stream"):
+            body = dict(base, object="chat.completion", choices=[{
+                "index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"
+            }], usage={"prompt_tokens": 100, "completion_tokens": len(content) // 4, "total_tokens": 0})
+            return self._send(200, json.dumps(body).encode())
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        pieces = [content[i:i + owner.chunk_size] for i in range(0, len(content), owner.chunk_size)]
+        for i, piece in enumerate(pieces):
+            chunk = dict(base, object="chat.completion.chunk", choices=[{
+                "index": 0, "delta": {"content": piece}, "finish_reason": "stop" if i == len(pieces) - 1 else None
+            }])
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.flush()
+            time.sleep(owner.chunk_delay)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+
+class FakeLLMServer(_Server):
+    """base_url olarak `server.url + '/v1'` verilir (GROQ_BASE_URL)."""
+
+    handler = _LLMHandler
+
+    def __init__(self, latency=0.0, chunk_delay=0.0, chunk_size=40, error_rate=0.0, error_status=503):
+        super().__init__()
+        self.latency = latency
+        self.chunk_delay = chunk_delay
+        self.chunk_size = chunk_size
+        # fail() ile planlanmış hatalara ek olarak isteklerin bu oranı error_status ile cevaplanır
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.requests = 0
+        self._failures = []
+        self._lock = threading.Lock()
+
+    def fail(self, status=503, count=1, retry_after=None):
+        """Sonraki `count` isteğe (None = kalıcı) `status` ile cevap verir; fail(count=0) hataları temizler."""
+        with self._lock:
+            self._failures = [] if count == 0 else [(status, retry_after, count)]
+
+    def next_failure(self):
+        with self._lock:
+            if not self._failures:
+                return (self.error_status, None) if random.random() < self.error_rate else None
+            status, retry_after, count = self._failures[0]
+            if count is not None:
+                self._failures = [(status, retry_after, count - 1)] if count > 1 else []
+            return status, retry_after
+
+
+# --- Veri Seti ---
+
+def synthetic_csv(rows, problems=1000, seed=42):
+    """order_id,skills,problem_id,correct; correct'in ~%10'u boş (NaN)."""
+    rng = random.Random(seed)
+    lines = ["order_id,skills,problem_id,correct"]
+    for i in range(rows):
+        correct = "" if rng.random() < 0.1 else str(int(rng.random() < 0.6))
+        lines.append(f"{i},{rng.choice(SKILLS)},P{rng.randrange(problems)},{correct}")
+    return ("\n".join(lines) + "\n").encode()
+
+
+class _DatasetHandler(_Handler):
+    def do_GET(self):
+        owner = self.owner
+        etag = owner.etag
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self._send(200, owner.body, "text/csv", {"ETag": etag})
+
+
+class FakeDatasetServer(_Server):
+    """DATASET_URL olarak `server.url + '/skills.csv'` verilir."""
+
+    handler = _DatasetHandler
+
+    def __init__(self, rows=100000, problems=1000):
+        super().__init__()
+        self.body = synthetic_csv(rows, problems)
+        self.etag = '"' + hashlib.sha256(self.body).hexdigest()[:16] + '"'
+
+
+# --- Kaynak Sağlayıcıları ---
+
+class _WikipediaHandler(_Handler):
+    def do_GET(self):
+        time.sleep(self.owner.latency)
+        body = {"query": {"pages": [{
+            "title": "Oran", "extract": "Oran, iki çokluğun birbirine bölünmesiyle elde edilen ifadedir.",
+            "fullurl": "https://tr.wikipedia.org/wiki/Oran"
+        }]}}
+        self._send(200, json.dumps(body).encode())
+
+
+class FakeWikipedia(_Server):
+    """WIKIPEDIA_API_URL olarak `server.url + '/w/api.php'` verilir."""
+
+    handler = _WikipediaHandler
+
+    def __init__(self, latency=0.0):
+        super().__init__()
+        self.latency = latency
+
+
+def fake_provider(kind, latency=0.0, count=3):
+    """PROVIDERS sözlüğüne konulabilen, gecikmeli sahte sağlayıcı fonksiyonu."""
+
+    def provider(topic):
+        time.sleep(latency)
+        return [{"title": f"{kind}: {topic} {i}", "url": f"https://example.com/{kind}/{i}", "desc": "Sahte sonuç."}
+                for i in range(count)]
+
+    return provider
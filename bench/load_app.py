@@ -0,0 +1,30 @@
+"""
+Yük testi (bench/load_test.py) için uygulama girişi: app'i içe aktarır ve YouTube/DuckDuckGo
+sağlayıcılarını bench/fakes.py'deki gecikmeli taklitlerle değiştirir (diğer dış adresler ortam
+değişkenleriyle zaten taklitlere yönlenir).
+
+    gunicorn -c gunicorn.conf.py -w 4 bench.load_app:app
+    python -m bench.load_app --port 10000          (Werkzeug, threaded; app.run ile aynı)
+"""
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.fakes import fake_provider  # noqa: E402
+from app import app  # noqa: E402
+from utils import ai_pdf_generator  # noqa: E402
+
+
+PROVIDER_LATENCY = float(os.getenv("LOAD_PROVIDER_LATENCY", 0.05))
+
+for _name in ("Videos", "Articles"):
+    ai_pdf_generator.PROVIDERS[_name] = fake_provider(_name, PROVIDER_LATENCY)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", 10000)))
+    args = parser.parse_args()
+    app.run(host="127.0.0.1", port=args.port, debug=False, threaded=True)
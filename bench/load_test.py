@@ -0,0 +1,452 @@
+"""
+Uçtan uca yük testi: uygulama ayrı bir süreçte (Werkzeug veya gunicorn, bench/load_app.py) yerel
+taklitlere karşı başlatılır (Groq -> FakeLLMServer, Drive -> FakeDatasetServer, Wikipedia -> FakeWikipedia,
+YouTube/DuckDuckGo -> fake_provider) ve /, /generate (web ve mobil), /resources, /download karışımıyla yüklenir.
+
+- closed: N sanal kullanıcı, her biri cevabı alınca bir sonraki isteği atar (--concurrency 10,50,200).
+- open: istekler sabit ortalama hızla (Poisson) gelir (--rates); gecikme planlanan gönderim anından ölçülür,
+  böylece sunucu yavaşladıkça biriken bekleme de sonuca girer.
+
+Her sunucu yapılandırması (--servers werkzeug,gunicorn:2x4 = 2 worker x 4 thread) ve her yük düzeyi için
+verim (istek/sn), p50/p95/p99 gecikme (ms, uç nokta bazında da), hata oranı, durum kodları ve süreç başına
+en yüksek RSS (MB; gunicorn'da derinlik 1 = worker) JSON olarak yazılır. Özet tablo stderr'e gider.
+
+Kullanım (proje kökünden):
+    python -m bench.load_test --servers werkzeug --concurrency 10,50,200 --duration 20
+    python -m bench.load_test --servers gunicorn:1x8,gunicorn:4x8 --mode both --rates 20,50 \\
+        --llm-latency 0.5 --llm-error-rate 0.05 --output yuk.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import socket
+import argparse
+import itertools
+import tempfile
+import threading
+import subprocess
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests  # noqa: E402
+
+from bench.fakes import FakeLLMServer, FakeDatasetServer, FakeWikipedia  # noqa: E402
+from bench.pipeline_bench import TOPICS, configure, percentile  # noqa: E402
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENDPOINTS = ("index", "generate", "mobile", "resources", "download")
+DEFAULT_MIX = "index=2,generate=2,mobile=3,resources=2,download=3"
+DURATIONS = [None, "1 hafta", "2 hafta", "1 ay", "3 ay"]
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ENDPOINTS:
+            raise ValueError(f"bilinmeyen uç nokta: {name}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def parse_server(spec):
+    """'werkzeug' veya 'gunicorn:<worker>x<thread>' -> (tür, worker, thread)"""
+    kind, _, shape = spec.partition(":")
+    if kind == "werkzeug":
+        return kind, 1, None
+    if kind != "gunicorn":
+        raise ValueError(f"bilinmeyen sunucu: {spec}")
+    workers, _, threads = (shape or "1x8").partition("x")
+    return kind, int(workers), int(threads or 1)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+# --- Sunucu ---
+
+class AppServer:
+    """Uygulamayı ayrı süreçte başlatır; çalışma dizini (outputs/, data/) geçicidir."""
+
+    def __init__(self, spec, workdir, env):
+        self.spec = spec
+        self.kind, self.workers, self.threads = parse_server(spec)
+        self.port = free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.workdir = workdir
+        self.env = env
+        self.process = None
+
+    def command(self):
+        if self.kind == "werkzeug":
+            return [sys.executable, "-m", "bench.load_app", "--port", str(self.port)]
+        return [sys.executable, "-m", "gunicorn", "-c", os.path.join(ROOT, "gunicorn.conf.py"),
+                "-b", f"127.0.0.1:{self.port}", "-w", str(self.workers), "--threads", str(self.threads),
+                "bench.load_app:app"]
+
+    def __enter__(self):
+        os.makedirs(self.workdir, exist_ok=True)
+        self.log = open(os.path.join(self.workdir, "server.log"), "w", encoding="utf-8")
+        self.process = subprocess.Popen(self.command(), cwd=self.workdir, env=self.env,
+                                        stdout=self.log, stderr=subprocess.STDOUT)
+        deadline = time.monotonic() + 90
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"sunucu açılamadı ({self.spec}), log: {self.log.name}")
+            try:
+                if requests.get(self.url + "/", timeout=1).status_code == 200:
+                    return self
+            except requests.RequestException:
+                pass
+            time.sleep(0.2)
+        raise RuntimeError(f"sunucu zamanında hazır olmadı ({self.spec})")
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        try:
+            self.process.wait(15)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.log.close()
+
+
+# --- Bellek ---
+
+def _children(pid):
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(child) for child in f.read().split()]
+    except OSError:
+        return []
+
+
+def _rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+class MemorySampler:
+    """Sunucu süreç ağacının RSS'ini periyodik örnekler (Linux /proc; başka sistemlerde boş kalır)."""
+
+    def __init__(self, pid, interval=0.5):
+        self.pid = pid
+        self.interval = interval
+        self.peaks = {}
+        self.total_peak = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def sample(self):
+        total = 0.0
+        stack = [(self.pid, 0)]
+        while stack:
+            pid, depth = stack.pop()
+            rss = _rss_mb(pid)
+            if rss is None:
+                continue
+            total += rss
+            peak = self.peaks.get(pid)
+            self.peaks[pid] = (depth, max(rss, peak[1] if peak else 0.0))
+            stack.extend((child, depth + 1) for child in _children(pid))
+        self.total_peak = max(self.total_peak, total)
+
+    def _run(self):
+        while True:
+            self.sample()
+            if self._stop.wait(self.interval):
+                break
+
+    def report(self):
+        processes = [{"pid": pid, "depth": depth, "peak_mb": round(rss, 1)}
+                     for pid, (depth, rss) in sorted(self.peaks.items(), key=lambda item: item[1][0])]
+        workers = [p["peak_mb"] for p in processes if p["depth"] == 1]
+        return {
+            "total_peak_mb": round(self.total_peak, 1),
+            "per_worker_peak_mb": max(workers) if workers else None,
+            "processes": processes
+        }
+
+
+# --- İstek Karışımı ---
+
+class Workload:
+    def __init__(self, base_url, mix, topic_pool, timeout, seed=7):
+        self.base_url = base_url
+        self.names = list(mix)
+        self.weights = [mix[name] for name in self.names]
+        self.topics = [(topic, duration) for duration in DURATIONS for topic in TOPICS][:topic_pool]
+        self.timeout = timeout
+        self.downloads = []
+        self._local = threading.local()
+        self._seed = seed
+        self._thread_ids = itertools.count()
+
+    def _state(self):
+        """Thread başına oturum (bağlantı yeniden kullanımı) ve tekrarlanabilir rastgele sayı üreteci."""
+        state = self._local
+        if not hasattr(state, "session"):
+            state.session = requests.Session()
+            state.rng = random.Random(self._seed * 1000 + next(self._thread_ids))
+        return state
+
+    def prime(self, count):
+        """İndirme isteklerinin kullanacağı PDF bağlantılarını üretir (ilk indirmede çizilirler)."""
+        for topic, duration in self.topics[:count]:
+            try:
+                response = requests.post(f"{self.base_url}/generate", json={"topic": topic, "duration": duration},
+                                         timeout=self.timeout)
+                if response.ok:
+                    data = response.json()
+                    self.downloads += [data["resource_url"], data["roadmap_url"]]
+            except requests.RequestException as e:
+                print(f"  hazırlık hatası: {e}", file=sys.stderr)
+
+    def issue(self, name=None):
+        """Bir istek atar: (uç nokta, durum kodu veya 'exc')."""
+        state = self._state()
+        rng = state.rng
+        name = name or rng.choices(self.names, self.weights)[0]
+        topic, duration = rng.choice(self.topics)
+        session = state.session
+        try:
+            if name == "index":
+                response = session.get(f"{self.base_url}/", timeout=self.timeout)
+            elif name == "generate":
+                response = session.post(f"{self.base_url}/generate", json={"topic": topic, "duration": duration},
+                                        timeout=self.timeout)
+            elif name == "mobile":
+                response = session.post(f"{self.base_url}/generate", timeout=self.timeout,
+                                        json={"topic": topic, "duration": duration, "source": "mobile"},
+                                        headers={"Accept-Encoding": "br, gzip"})
+            elif name == "resources":
+                response = session.post(f"{self.base_url}/resources", json={"topic": topic}, timeout=self.timeout)
+            else:
+                if not self.downloads:
+                    return name, "skip"
+                response = session.get(rng.choice(self.downloads), timeout=self.timeout)
+            response.content  # gövde de okunur
+            return name, response.status_code
+        except requests.RequestException:
+            return name, "exc"
+
+
+class Recorder:
+    def __init__(self):
+        self.samples = []  # (uç nokta, gecikme sn, durum)
+        self.dropped = 0
+
+    def add(self, name, seconds, status):
+        self.samples.append((name, seconds, status))
+
+    def summarize(self, elapsed):
+        samples = [s for s in self.samples if s[2] != "skip"]
+        return dict(_latency_stats(samples, elapsed), dropped=self.dropped, endpoints={
+            name: _latency_stats([s for s in samples if s[0] == name], elapsed)
+            for name in sorted({s[0] for s in samples})
+        })
+
+
+def _latency_stats(samples, elapsed):
+    durations = [s[1] for s in samples]
+    errors = sum(1 for s in samples if s[2] == "exc" or s[2] >= 400)
+    stats = {
+        "requests": len(samples),
+        "throughput_rps": round(len(samples) / elapsed, 2) if elapsed else None,
+        "error_rate": round(errors / len(samples), 4) if samples else None,
+        "status": dict(Counter(str(s[2]) for s in samples))
+    }
+    if durations:
+        stats["latency_ms"] = {
+            "p50": round(percentile(durations, 0.50) * 1000, 1),
+            "p95": round(percentile(durations, 0.95) * 1000, 1),
+            "p99": round(percentile(durations, 0.99) * 1000, 1),
+            "max": round(max(durations) * 1000, 1)
+        }
+    return stats
+
+
+def closed_loop(workload, users, duration, think=0.0):
+    recorder = Recorder()
+    deadline = time.perf_counter() + duration
+
+    def user():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            name, status = workload.issue()
+            recorder.add(name, time.perf_counter() - start, status)
+            if think:
+                time.sleep(think)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=user, daemon=True) for _ in range(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return recorder.summarize(time.perf_counter() - start)
+
+
+def open_loop(workload, rate, duration, max_inflight=1000, seed=11):
+    """Poisson gelişler; gecikme planlanan gönderim anından ölçülür. Eşzamanlı istek sınırı aşılırsa düşülür."""
+    recorder = Recorder()
+    rng = random.Random(seed)
+    slots = threading.BoundedSemaphore(max_inflight)
+
+    def send(scheduled):
+        try:
+            name, status = workload.issue()
+            recorder.add(name, time.perf_counter() - scheduled, status)
+        finally:
+            slots.release()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_inflight) as pool:
+        scheduled = start
+        while True:
+            scheduled += rng.expovariate(rate)
+            if scheduled >= start + duration:
+                break
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            if not slots.acquire(blocking=False):
+                recorder.dropped += 1
+                continue
+            pool.submit(send, scheduled)
+    return recorder.summarize(time.perf_counter() - start)
+
+
+def run_server(spec, args, base_env, workdir):
+    results = []
+    server_dir = os.path.join(workdir, spec.replace(":", "_"))
+    # Her yapılandırma soğuk önbellekle başlar (çeviri/kaynak önbelleği, PDF'ler)
+    env = dict(base_env, CACHE_DB=os.path.join(server_dir, "cache.sqlite3"))
+    with AppServer(spec, server_dir, env) as server:
+        workload = Workload(server.url, parse_mix(args.mix), args.topic_pool, args.timeout)
+        workload.prime(args.prime)
+        levels = []
+        if args.mode in ("closed", "both"):
+            levels += [("closed", int(level)) for level in args.concurrency.split(",") if level]
+        if args.mode in ("open", "both"):
+            levels += [("open", float(level)) for level in args.rates.split(",") if level]
+
+        for mode, level in levels:
+            print(f"{spec}: {mode} {level} ({args.duration} sn)", file=sys.stderr)
+            with MemorySampler(server.process.pid) as memory:
+                if mode == "closed":
+                    summary = closed_loop(workload, level, args.duration, args.think)
+                else:
+                    summary = open_loop(workload, level, args.duration, args.max_inflight)
+            key = "concurrency" if mode == "closed" else "rate_rps"
+            results.append(dict({"server": spec, "mode": mode, key: level}, **summary, memory=memory.report()))
+    return results
+
+
+def print_table(runs):
+    print(f"{'sunucu':<16}{'mod':<7}{'düzey':>7}{'istek/sn':>10}{'p50':>9}{'p95':>9}{'p99':>9}"
+          f"{'hata%':>7}{'RSS MB':>9}", file=sys.stderr)
+    for run in runs:
+        latency = run.get("latency_ms", {})
+        level = run.get("concurrency", run.get("rate_rps"))
+        error_rate = run["error_rate"] * 100 if run["error_rate"] is not None else 0
+        print(f"{run['server']:<16}{run['mode']:<7}{level:>7}{run['throughput_rps'] or 0:>10}"
+              f"{latency.get('p50', '-'):>9}{latency.get('p95', '-'):>9}{latency.get('p99', '-'):>9}"
+              f"{error_rate:>7.1f}{run['memory']['total_peak_mb']:>9}", file=sys.stderr)
+
+
+def main():
+    try:
+        import gunicorn  # noqa: F401
+        default_servers = "gunicorn:1x8,gunicorn:4x8"
+    except ImportError:
+        default_servers = "werkzeug"
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--servers", default=default_servers,
+                        help="virgülle: werkzeug, gunicorn:<worker>x<thread>")
+    parser.add_argument("--mode", choices=("closed", "open", "both"), default="closed")
+    parser.add_argument("--concurrency", default="10,50,200", help="closed: eşzamanlı kullanıcı sayıları")
+    parser.add_argument("--rates", default="10,25,50", help="open: ortalama istek/sn")
+    parser.add_argument("--duration", type=float, default=20, help="her düzeyin süresi (sn)")
+    parser.add_argument("--think", type=float, default=0.0, help="closed: istekler arası bekleme (sn)")
+    parser.add_argument("--max-inflight", type=int, default=1000, help="open: istemci tarafı eşzamanlı istek sınırı")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="uç nokta ağırlıkları")
+    parser.add_argument("--topic-pool", type=int, default=12, help="farklı (konu, süre) sayısı (önbellek isabeti)")
+    parser.add_argument("--prime", type=int, default=4, help="indirme için önceden üretilen plan sayısı")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--rows", type=int, default=100000, help="sahte veri seti satır sayısı")
+    parser.add_argument("--no-ingest", action="store_true", help="yerel kopya olmadan (Drive akışı yolu)")
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0, help="sahte LLM'in 503 döndürme oranı")
+    parser.add_argument("--provider-latency", type=float, default=0.05, help="sahte kaynak sağlayıcı gecikmesi (sn)")
+    parser.add_argument("--render-workers", type=int, default=1, help="worker başına PDF çizim süreci")
+    parser.add_argument("--output", help="JSON'u dosyaya da yaz")
+    args = parser.parse_args()
+
+    runs = []
+    with tempfile.TemporaryDirectory() as workdir, \
+            FakeLLMServer(args.llm_latency, error_rate=args.llm_error_rate) as llm, \
+            FakeDatasetServer(args.rows) as dataset, \
+            FakeWikipedia(args.provider_latency) as wikipedia:
+        configure(workdir, llm, dataset, wikipedia)
+        os.environ.update({
+            "RENDER_POOL_PER_WORKER": str(args.render_workers),
+            "LOAD_PROVIDER_LATENCY": str(args.provider_latency),
+            "SPAN_LOG": "0",
+            "PRELOAD_MODULES": "0"
+        })
+        pythonpath = os.environ.get("PYTHONPATH")
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in (ROOT, pythonpath) if p))
+
+        if not args.no_ingest:
+            # Tüm sunucular aynı yerel kopyayı kullanır (DATASET_DIR)
+            stdout, sys.stdout = sys.stdout, sys.stderr
+            try:
+                from utils import dataset_store
+                dataset_store.ingest(force=True)
+            finally:
+                sys.stdout = stdout
+
+        for spec in args.servers.split(","):
+            runs += run_server(spec, args, env, workdir)
+
+        report = {
+            "config": {k: v for k, v in vars(args).items() if k != "output"},
+            "llm_requests": llm.requests,
+            "runs": runs
+        }
+
+    print_table(runs)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
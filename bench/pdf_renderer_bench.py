@@ -0,0 +1,76 @@
+"""
+Kaynak PDF'i çizim ölçümü: eski yol (her belgede Template derleme + yeni FontConfiguration +
+satır içi CSS ayrıştırma) ile süreç başına kurulan PdfRenderer'ı karşılaştırır; belge başına
+süreyi (ilk, p50, p95) JSON olarak yazar.
+
+Kullanım (proje kökünden):
+    python -m bench.pdf_renderer_bench --count 30
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jinja2 import Template  # noqa: E402
+from weasyprint import HTML  # noqa: E402
+from weasyprint.text.fonts import FontConfiguration  # noqa: E402
+
+from utils import pdf_renderer  # noqa: E402
+from bench.render_pool_bench import SAMPLE_PLAN  # noqa: E402
+
+
+LEGACY_TEMPLATE = pdf_renderer.RESOURCES_TEMPLATE.replace(
+    "<html>", f"<html><head><style>{pdf_renderer.RESOURCES_CSS}</style></head>", 1
+)
+
+
+def legacy_render(topic, plan_html, duration):
+    """Değişiklikten önceki export_resources_pdf ile aynı adımlar."""
+    html = Template(LEGACY_TEMPLATE).render(
+        topic=topic,
+        subtitle=f"Hedef Süre: {duration}",
+        date=datetime.today().strftime("%d.%m.%Y"),
+        ai_plan=plan_html
+    )
+    return HTML(string=html).write_pdf(font_config=FontConfiguration())
+
+
+def warm_render(topic, plan_html, duration):
+    return pdf_renderer.get_renderer().write_resources_pdf(topic, plan_html, None, duration)
+
+
+def measure(name, render, count):
+    durations = []
+    for _ in range(count):
+        start = time.perf_counter()
+        render("Oran Orantı", SAMPLE_PLAN, "4 hafta")
+        durations.append(time.perf_counter() - start)
+    first, rest = durations[0], sorted(durations[1:]) or durations
+    return {
+        "renderer": name,
+        "count": count,
+        "first_ms": round(first * 1000, 1),
+        "p50_ms": round(rest[len(rest) // 2] * 1000, 1),
+        "p95_ms": round(rest[min(len(rest) - 1, int(len(rest) * 0.95))] * 1000, 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=30)
+    args = parser.parse_args()
+
+    before = measure("legacy", legacy_render, args.count)
+    after = measure("warm", warm_render, args.count)
+    print(json.dumps({
+        "results": [before, after],
+        "speedup_p50": round(before["p50_ms"] / after["p50_ms"], 2) if after["p50_ms"] else None
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+/generate ve /resources hattının aşama aşama ölçümü; tüm dış servisler yerel taklitlerle
+(bench/fakes.py) değiştirilir: Groq -> FakeLLMServer, Drive -> FakeDatasetServer,
+Wikipedia -> FakeWikipedia, YouTube/DuckDuckGo -> fake_provider.
+
+Her aşama için p50/p95/p99 (ms) ve aşama sonundaki en yüksek RSS (MB) JSON olarak yazılır.
+
+Kullanım (proje kökünden):
+    python -m bench.pipeline_bench --rows 100000 --iterations 30 --llm-latency 0.2
+    python -m bench.pipeline_bench --stages dataset_search,difficulty_stream --output sonuc.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.fakes import FakeLLMServer, FakeDatasetServer, FakeWikipedia, fake_provider, PLAN_CONTENT  # noqa: E402
+
+
+TOPICS = ["oran orantı", "denklem çözme", "fonksiyonlar", "olasılık", "kareköklü sayılar", "geometri"]
+STAGES = ("dataset_ingest", "dataset_search", "difficulty_stream", "difficulty_tables", "llm_parse", "llm_plan",
+          "llm_stream", "export_resources_pdf", "create_timeline_pdf", "resources", "resources_cached")
+
+
+def percentile(values, q):
+    """Doğrusal ara değerli yüzdelik (numpy.percentile varsayılanı ile aynı)."""
+    values = sorted(values)
+    if not values:
+        return None
+    position = (len(values) - 1) * q
+    low = int(position)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (position - low)
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux'ta KB, macOS'ta bayt
+    return round(peak / 1024 / (1024 if sys.platform == "darwin" else 1), 1)
+
+
+def measure(fn, iterations, warmup=1):
+    """İlk `warmup` çağrı (modül yükleme, bağlantı kurma) ölçüme girmez."""
+    for i in range(warmup):
+        try:
+            fn(-1 - i)
+        except Exception:
+            pass
+    durations, errors = [], 0
+    for i in range(iterations):
+        start = time.perf_counter()
+        try:
+            ok = fn(i)
+        except Exception as e:
+            print(f"  hata: {e}", file=sys.stderr)
+            ok = False
+        durations.append(time.perf_counter() - start)
+        if ok is False:
+            errors += 1
+    return {
+        "count": len(durations),
+        "errors": errors,
+        "p50_ms": round(percentile(durations, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(durations, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(durations, 0.99) * 1000, 3),
+        "peak_rss_mb": peak_rss_mb()
+    }
+
+
+def configure(workdir, llm, dataset, wikipedia):
+    """Uygulama modülleri içe aktarılmadan önce: tüm dış adresler ve disk yolları geçici/yerel."""
+    os.environ.update({
+        "GROQ_API_KEY": "fake",
+        "GROQ_BASE_URL": f"{llm.url}/v1",
+        "DATASET_URL": f"{dataset.url}/skills.csv",
+        "DATASET_DIR": os.path.join(workdir, "skills"),
+        "DATASET_REFRESH_SECONDS": "0",
+        "CACHE_DB": os.path.join(workdir, "cache.sqlite3"),
+        "WIKIPEDIA_API_URL": f"{wikipedia.url}/w/api.php",
+        "TEMPLATE_CACHE_DIR": os.path.join(workdir, "template_cache"),
+        "RENDER_POOL_WORKERS": "0"
+    })
+
+
+def build_stages(workdir, args):
+    from utils import dataset_store, ai_pdf_generator as gen
+    import routes
+
+    for name in ("Videos", "Articles"):
+        gen.PROVIDERS[name] = fake_provider(name, args.provider_latency)
+
+    state = {}
+
+    def topic(i):
+        return TOPICS[i % len(TOPICS)]
+
+    def ingest(i):
+        return dataset_store.ingest(force=True) is not None
+
+    def search(i):
+        rows = list(routes.iter_dataset_rows(topic(i)))
+        state.setdefault("rows", rows)
+        return bool(rows)
+
+    def difficulty_stream(i):
+        rows = state.get("rows") or list(routes.iter_dataset_rows(topic(0)))
+        state["rows"] = rows
+        return bool(gen.analyze_difficulty(iter(rows)))
+
+    def difficulty_tables(i):
+        return bool(dataset_store.get_store().weakest_problems(routes.topic_skills(topic(i))))
+
+    def llm_parse(i):
+        return bool(gen.parse_plan_content(PLAN_CONTENT)[1])
+
+    def llm_plan(i):
+        return bool(gen.get_ai_learning_plan_and_steps(topic(i), ["P1", "P2"], None, "4 hafta")[1])
+
+    def llm_stream(i):
+        events = list(gen.stream_ai_learning_plan(topic(i), ["P1", "P2"], None, "4 hafta"))
+        return bool(events and events[-1][1][1])
+
+    def export_pdf(i):
+        path = os.path.join(workdir, "resources.pdf")
+        if os.path.exists(path):
+            os.remove(path)
+        gen.export_resources_pdf(topic(i), PLAN_CONTENT.split("===STEPS===")[0], path, "4 hafta")
+        return os.path.exists(path)
+
+    def timeline_pdf(i):
+        path = os.path.join(workdir, "roadmap.pdf")
+        gen.create_timeline_pdf(PLAN_CONTENT.split("===STEPS===")[1].strip().splitlines(), path)
+        return os.path.exists(path)
+
+    def resources(i):
+        # Her turda farklı konu: önbellek kaçırılır, sağlayıcılar paralel çağrılır
+        _, status = gen.get_real_resources_with_status(f"{topic(i)} {i} {time.time()}")
+        return all(s in ("ok", "empty") for s in status.values())
+
+    def resources_cached(i):
+        _, status = gen.get_real_resources_with_status(topic(0))
+        return True
+
+    return {
+        "dataset_ingest": ingest,
+        "dataset_search": search,
+        "difficulty_stream": difficulty_stream,
+        "difficulty_tables": difficulty_tables,
+        "llm_parse": llm_parse,
+        "llm_plan": llm_plan,
+        "llm_stream": llm_stream,
+        "export_resources_pdf": export_pdf,
+        "create_timeline_pdf": timeline_pdf,
+        "resources": resources,
+        "resources_cached": resources_cached
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000, help="sentetik veri setinin satır sayısı")
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--ingest-iterations", type=int, default=3)
+    parser.add_argument("--warmup", type=int, default=1, help="aşama başına ölçülmeyen ısınma çağrısı")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="sahte LLM ilk yanıt gecikmesi (sn)")
+    parser.add_argument("--llm-chunk-delay", type=float, default=0.0, help="akışta parçalar arası gecikme (sn)")
+    parser.add_argument("--provider-latency", type=float, default=0.0, help="sahte kaynak sağlayıcı gecikmesi (sn)")
+    parser.add_argument("--stages", default=",".join(STAGES))
+    parser.add_argument("--output", help="JSON'u dosyaya da yaz")
+    args = parser.parse_args()
+
+    selected = [s for s in args.stages.split(",") if s]
+    unknown = set(selected) - set(STAGES)
+    if unknown:
+        parser.error(f"bilinmeyen aşama: {', '.join(sorted(unknown))}")
+
+    with tempfile.TemporaryDirectory() as workdir, \
+            FakeLLMServer(args.llm_latency, args.llm_chunk_delay) as llm, \
+            FakeDatasetServer(args.rows) as dataset, \
+            FakeWikipedia(args.provider_latency) as wikipedia:
+        configure(workdir, llm, dataset, wikipedia)
+        stages = build_stages(workdir, args)
+
+        # Aşama çıktıları (print) ölçüm JSON'una karışmasın
+        stdout, sys.stdout = sys.stdout, sys.stderr
+        try:
+            from utils import dataset_store
+            if "dataset_ingest" not in selected:
+                dataset_store.ingest(force=True)
+
+            results = {}
+            for name in STAGES:
+                if name in selected:
+                    print(f"ölçülüyor: {name}")
+                    iterations = args.ingest_iterations if name == "dataset_ingest" else args.iterations
+                    warmup = 0 if name == "dataset_ingest" else args.warmup
+                    results[name] = measure(stages[name], iterations, warmup)
+        finally:
+            sys.stdout = stdout
+
+        report = {
+            "config": {k: v for k, v in vars(args).items() if k != "output"},
+            "llm_requests": llm.requests,
+            "stages": results,
+            "peak_rss_mb": peak_rss_mb()
+        }
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+PDF çizim havuzu ölçümü: aynı belge çiftini (kaynak PDF + yol haritası) farklı worker
+sayılarıyla çizer ve saniyedeki belge sayısını JSON olarak yazar.
+
+Kullanım (proje kökünden):
+    python -m bench.render_pool_bench --pairs 16 --workers 1,2,4
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import render_pool  # noqa: E402
+
+
+SAMPLE_PLAN = "<h3>Haftalık Plan</h3><table><tr><th>Hafta</th><th>Konu</th><th>Pratik</th></tr>" + "".join(
+    f"<tr><td>{i}. Hafta</td><td>Oran ve orantı, bölüm {i}</td><td>20 soru, 2 deneme</td></tr>" for i in range(1, 13)
+) + "</table><h3>Kaynak Önerileri</h3><ul>" + "".join(
+    f"<li><a href='https://example.com/{i}'>Kaynak {i}</a></li>" for i in range(8)
+) + "</ul>"
+SAMPLE_STEPS = [f"{i}. Adım: Konu tekrarı ve soru çözümü" for i in range(1, 9)]
+
+
+def run(workers, pairs, directory):
+    render_pool._reset_pool()
+    render_pool.RENDER_WORKERS = workers
+    render_pool.start()
+
+    def one(i):
+        return render_pool.render_all([
+            ("resources_pdf", "resources", os.path.join(directory, f"{workers}_{i}_resources.pdf"),
+             ("Oran Orantı", SAMPLE_PLAN, "4 hafta")),
+            ("roadmap_pdf", "timeline", os.path.join(directory, f"{workers}_{i}_roadmap.pdf"), (SAMPLE_STEPS,))
+        ])
+
+    start = time.perf_counter()
+    # İstemci tarafı eşzamanlılığı worker sayısı kadar: havuz doygun tutulur
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as clients:
+        results = list(clients.map(one, range(pairs)))
+    elapsed = time.perf_counter() - start
+
+    failed = sum(1 for r in results for ok in r.values() if not ok)
+    return {
+        "workers": workers,
+        "pairs": pairs,
+        "seconds": round(elapsed, 3),
+        "documents_per_second": round(pairs * 2 / elapsed, 2),
+        "failed": failed
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pairs", type=int, default=16)
+    parser.add_argument("--workers", default=",".join(str(w) for w in sorted({1, 2, os.cpu_count() or 1})),
+                        help="virgülle ayrılmış worker sayıları; 0 = havuzsuz (sıralı) çizim")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        report = [run(int(w), args.pairs, directory) for w in args.workers.split(",")]
+    render_pool._reset_pool()
+
+    baseline = report[0]["documents_per_second"]
+    for row in report:
+        row["speedup"] = round(row["documents_per_second"] / baseline, 2) if baseline else None
+    print(json.dumps({"cpu_count": os.cpu_count(), "results": report}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Yol haritası çizici ölçümü: aynı adım listesini matplotlib ve vektör çizicisiyle çizer;
+belge başına süre (p50/p95), çıktı boyutu ve thread'li vektör çiziminin belge/saniye
+değerini JSON olarak yazar.
+
+Kullanım (proje kökünden):
+    python -m bench.timeline_bench --count 50 --threads 4
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import ai_pdf_generator, timeline_vector  # noqa: E402
+
+
+SAMPLE_STEPS = [f"{i}. Adım: Oran ve orantı konu tekrarı, günlük 20 soru çözümü" for i in range(1, 11)]
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def measure(name, render, count, directory):
+    durations = []
+    path = os.path.join(directory, f"{name}.pdf")
+    for _ in range(count):
+        start = time.perf_counter()
+        render(SAMPLE_STEPS, path)
+        durations.append(time.perf_counter() - start)
+    return {
+        "renderer": name,
+        "count": count,
+        "p50_ms": round(_percentile(durations, 0.5) * 1000, 2),
+        "p95_ms": round(_percentile(durations, 0.95) * 1000, 2),
+        "bytes": os.path.getsize(path)
+    }
+
+
+def measure_threads(threads, count, directory):
+    def one(i):
+        timeline_vector.write_pdf(SAMPLE_STEPS, os.path.join(directory, f"thread_{i}.pdf"))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(one, range(count)))
+    elapsed = time.perf_counter() - start
+    return {"threads": threads, "count": count, "documents_per_second": round(count / elapsed, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        report = {
+            "results": [
+                measure("matplotlib", ai_pdf_generator._create_timeline_pdf_matplotlib, args.count, directory),
+                measure("vector", timeline_vector.write_pdf, args.count, directory)
+            ],
+            "vector_threaded": measure_threads(args.threads, args.count, directory)
+        }
+
+    baseline, vector = report["results"]
+    report["speedup_p50"] = round(baseline["p50_ms"] / vector["p50_ms"], 1) if vector["p50_ms"] else None
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+gunicorn ayarları:  gunicorn -c gunicorn.conf.py app:app
+
+Ağır modüller (openai, pandas, WeasyPrint...) master süreçte bir kez yüklenir, worker'lar
+fork ile hazır devralır. app.py master'da içe aktarılmaz.
+Sunucu başına bir kez çalışması gereken servisler (veri seti yenileyici, çeviri ısıtma) master'ın
+açtığı tek bir servis sürecinde başlar; worker'lar yalnızca kendi çizim havuzunu açar ve havuz boyutu
+(RENDER_POOL_WORKERS) worker sayısına bölünür.
+"""
+import os
+import signal
+import multiprocessing
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', 10000)}"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 120))
+
+
+def on_starting(server):
+    # Worker'lar ortamı devralır: paylaşılan servisleri başlatmazlar, çizim havuzunu worker sayısına bölerler
+    os.environ["SHARED_SERVICES"] = "master"
+    os.environ["SERVER_WORKERS"] = str(server.cfg.workers)
+    # METRICS_DIR: /metrics tüm worker'ların toplamını döner; önceki çalıştırmanın dosyaları silinir
+    from utils import metrics
+    metrics.clear_dir()
+
+    if os.getenv("PRELOAD_MODULES", "1") != "1":
+        return
+    from utils.ai_pdf_generator import warm_up
+    server.log.info(f"Ağır modüller önceden yüklendi: {warm_up()}")
+
+
+def _shared_services(signals):
+    # fork, master'ın sinyal işleyicilerini de kopyalar; varsayılana dönülmezse SIGTERM süreci kapatmaz
+    for sig in signals:
+        signal.signal(sig, signal.SIG_DFL)
+    from app import run_shared_services
+    run_shared_services()
+
+
+def when_ready(server):
+    # Master henüz tek thread'li (worker'lar bundan sonra açılır), fork burada güvenlidir.
+    # daemon: master kapanırken servis süreci de sonlandırılır.
+    process = multiprocessing.get_context("fork").Process(
+        target=_shared_services,
+        args=(list(getattr(server, "SIGNALS", [])) + [signal.SIGCHLD],),
+        name="shared-services",
+        daemon=True
+    )
+    process.start()
+    server.log.info(f"Paylaşılan servisler başlatıldı (pid {process.pid}).")
@@ -1,14 +1,28 @@
-from flask import Blueprint, render_template, request, send_from_directory, jsonify
+from flask import (Blueprint, render_template, request, send_from_directory, send_file, jsonify, Response,
+                   stream_with_context)
 import os
-import pandas as pd
-from openai import OpenAI
-from utils.ai_pdf_generator import generate_two_pdfs_hybrid, get_ai_resources
+from utils.ai_pdf_generator import (generate_two_pdfs_hybrid, get_real_resources_with_status, find_weak_problems,
+                                   analyze_difficulty, plan_cache_key, stream_ai_learning_plan,
+                                   save_plan, is_complete, generate_mobile_plan, render_deferred,
+                                   render_deferred_many, deferred_task, warm_up, DEFER_RENDER,
+                                   GENERATION_STAGES)
+from utils import (dataset_store, translation_cache, resource_cache, artifact_cache, render_pool, metrics, llm_gateway,
+                   difficulty, profiling)
+from utils.multi_match import AhoCorasick
+from utils.llm_gateway import LLMError, LLMUnavailable
+from utils.jobs import JobManager, QueueFull
+from utils.single_flight import SingleFlight, make_key
+from utils.topic_resolver import resolve as resolve_topic, turkish_casefold
+from utils.sse import format_event
 from dotenv import load_dotenv
 import requests
-import re
 import csv
 import io
+import json
 import time
+import zipfile
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 load_dotenv()
 
@@ -18,127 +32,258 @@ routes = Blueprint("routes", __name__)
 UPLOAD_FOLDER = "outputs"
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
-FILE_ID = "1EU6wifU-cdpeSHjKdl2jvxzLD26Lq-bs"
-DRIVE_URL = "https://drive.google.com/uc?export=download"
-
-client = OpenAI(
-    base_url="https://api.groq.com/openai/v1",
-    api_key=os.getenv("GROQ_API_KEY")
-)
-AI_MODEL = "llama-3.3-70b-versatile"
-
-USER_TOPIC_MAP = {
-    "matematik": ["8.NS.A.2-1", "7.EE.B.4a-1", "6.NS.B.3-3"],
-    "sayılar": ["8.NS.A.2-1", "6.NS.B.3-3", "8.NS.A.2-2"],
-    "oran orantı": ["7.RP.A.1", "7.RP.A.2", "7.RP.A.3"],
-    "oran": ["7.RP.A.1"],
-    "orantı": ["7.RP.A.2"],
-    "denklem çözme": ["6.EE.B.7", "7.EE.B.4a-1", "8.EE.C.7"],
-    "denklemler": ["6.EE.B.7", "8.EE.C.7"],
-    "fonksiyonlar": ["8.F.B.5", "8.F.A.1"],
-    "veri": ["8.SP.A.1"],
-    "geometri": ["8.G.A.3-1", "8.G.A.1"],
-    "ifadeler": ["7.EE.A.2"],
-    "üslü sayılar": ["8.EE.A.1"],
-    "kareköklü sayılar": ["8.EE.A.2"],
-    "olasılık": ["7.SP.C.5"]
-}
+# Asenkron /generate işleri (durum dosyaları outputs/.jobs altında)
+job_manager = JobManager(os.path.join(UPLOAD_FOLDER, ".jobs"), stages=GENERATION_STAGES)
+
+# Aynı anda gelen özdeş /generate ve /resources istekleri tek hesaplamayı paylaşır
+generation_flight = SingleFlight("generate")
+resource_flight = SingleFlight("resources")
+# Ertelenmiş bir PDF'in eşzamanlı ilk indirmeleri tek çizimi bekler (süreçler arası dahil)
+render_flight = SingleFlight("render")
+
+# /generate/batch: istek başına en fazla konu ve aynı anda üretilen plan sayısı
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", 50))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", 4))
+
+# Çeviri aramanın önünde durduğu için kısa tutulur; süre dolarsa orijinal metinle aranır
+LLM_TRANSLATE_TIMEOUT = float(os.getenv("LLM_TRANSLATE_TIMEOUT", 10))
+
+
+def translate_remote(text):
+    """ 'Python Programlama' -> 'Python' çevirisi yapar (önbelleksiz, hata fırlatır) """
+    content, _ = llm_gateway.chat(
+        [{"role": "system", "content": "Translate to English technical term. Only output the word."},
+         {"role": "user", "content": text}],
+        kind="translate",
+        timeout=LLM_TRANSLATE_TIMEOUT,
+        temperature=0.1
+    )
+    return content.strip().replace('"', '').replace('.', '')
+
+
 def get_english_term(text):
-    """ 'Python Programlama' -> 'Python' çevirisi yapar """
-    try:
-        response = client.chat.completions.create(
-            model=AI_MODEL,
-            messages=[{"role": "system", "content": "Translate to English technical term. Only output the word."},
-                      {"role": "user", "content": text}],
-            temperature=0.1
-        )
-        return response.choices[0].message.content.strip().replace('"', '').replace('.', '')
-    except:
-        return text
+    """ Çeviriyi kalıcı önbellekten verir; başarısız olursa orijinal metni döndürür """
+    return translation_cache.cached_translation(text, translate_remote)
 
 
-def smart_search_stream(topic):
+# Zayıf problem analizi için taranan en fazla satır (satırlar biriktirilmeden akış halinde toplanır)
+DIFFICULTY_ROW_LIMIT = int(os.getenv("DIFFICULTY_ROW_LIMIT", 5000))
+# Yerel kopya hazır değilken Drive akışını tarama süresi (sn)
+DRIVE_SCAN_SECONDS = 8
+# Mobil hızlı yolda taranan en fazla satır (yalnızca yerel kopya; Drive akışı taranmaz)
+MOBILE_ROW_LIMIT = int(os.getenv("MOBILE_ROW_LIMIT", 1000))
+
+
+TOPIC_RESOLUTIONS = metrics.counter("topic_resolution_total", "Konu çözümleme yolu (exact/synonym/fuzzy/llm)",
+                                     ("method",))
+
+
+def topic_skills(topic):
+    """Konunun USER_TOPIC_MAP'teki beceri kodları (yerel bulanık eşleşme dahil), yoksa None."""
+    return resolve_topic(topic).skills
+
+
+def search_terms_for(topic):
     """
-    HİBRİT ARAMA MOTORU (Harita Destekli):
-    1. Önce USER_TOPIC_MAP'e bakar (Nokta Atışı).
-    2. Bulamazsa İngilizce çeviri ile arar.
-    3. Maksimum 8 saniye çalışır (Timeout Koruması).
+    1. Önce USER_TOPIC_MAP'e bakar (Nokta Atışı; Türkçe harf/aksan katlama, eş anlamlılar, trigram benzerliği).
+    2. Yeterince emin eşleşme yoksa İngilizce çeviri ile arar.
     """
-    print(f"[WEB] Veri Seti Taranıyor: '{topic}'...")
-
-    topic_lower = topic.lower().strip()
-    search_terms = []
+    resolution = resolve_topic(topic)
 
     # 1. HARİTA KONTROLÜ (Öncelikli)
-    if topic_lower in USER_TOPIC_MAP:
-        search_terms = USER_TOPIC_MAP[topic_lower]
-        print(f" Harita Eşleşmesi: {topic} -> {search_terms}")
+    if resolution.skills:
+        TOPIC_RESOLUTIONS.inc(method=resolution.method)
+        search_terms = resolution.skills
+        print(f" Harita Eşleşmesi: {topic} -> {resolution.key} {search_terms} "
+              f"({resolution.method}, güven {resolution.confidence})")
     else:
         # 2. ÇEVİRİ KONTROLÜ (Yedek)
+        TOPIC_RESOLUTIONS.inc(method="llm")
         eng_term = get_english_term(topic)
         search_terms = [t.lower() for t in [topic, eng_term] if t]
         print(f"  Haritada yok, Kelime Bazlı Arama: {search_terms}")
+    return search_terms
 
-    start_time = time.time()
 
-    try:
-        session = requests.Session()
-        response = session.get(DRIVE_URL, params={'id': FILE_ID}, stream=True)
+def iter_dataset_rows(topic, limit=DIFFICULTY_ROW_LIMIT):
+    """
+    HİBRİT ARAMA MOTORU (Harita Destekli): konuyla eşleşen satırları
+    ({skills, problem_id, correct}) liste kurmadan tek tek üretir.
+    Arama yerel (mmap'li) veri setinin trigram indeksinde yapılır; kopya hazır değilse
+    Drive akışı maksimum 8 saniye taranır (Timeout Koruması).
+    """
+    print(f"[WEB] Veri Seti Taranıyor: '{topic}'...")
+    with metrics.span("search_terms"):
+        search_terms = search_terms_for(topic)
+
+    # 3. YEREL KOPYA (mmap'li sütunlu veri seti)
+    store = dataset_store.get_store()
+    if store is not None:
+        return metrics.timed_iter("dataset_scan", store.iter_search(search_terms, limit), target="index")
+
+    # Yerel kopya henüz hazır değilse (ilk açılış) eski akış yöntemiyle ara
+    print("Yerel veri seti hazır değil, Drive akışı taranıyor.")
+    return metrics.timed_iter("dataset_scan", _iter_drive_stream(search_terms, limit), target="drive")
+
+
+def mobile_weak_problems(topic):
+    """
+    Mobil için kısıtlı zayıf problem analizi: konu yalnızca yerelde çözülür (çeviri/LLM yok),
+    yalnızca yerel kopyada en fazla MOBILE_ROW_LIMIT satır taranır; kopya hazır değilse analiz atlanır.
+    """
+    resolution = resolve_topic(topic)
+    TOPIC_RESOLUTIONS.inc(method=resolution.method or "none")
+    store = dataset_store.get_store()
+    if store is None:
+        return []
+    search_terms = resolution.skills or [topic.lower()]
+    rows = metrics.timed_iter("dataset_scan", store.iter_search(search_terms, MOBILE_ROW_LIMIT), target="index")
+    with metrics.span("difficulty"):
+        return find_weak_problems(rows, resolution.skills)
 
-        if "text/html" in response.headers.get('Content-Type', ''):
-            html = ""
-            for chunk in response.iter_content(chunk_size=1024):
-                if chunk: html += chunk.decode('utf-8', errors='ignore')
-                if len(html) > 10000: break
 
-            confirm_match = re.search(r'name="confirm" value="([^"]+)"', html)
-            confirm = confirm_match.group(1) if confirm_match else "t"
+def smart_search_stream(topic):
+    """Eşleşen ilk 50 satırı DataFrame olarak döndürür (tablo isteyen çağıranlar için)."""
+    import pandas as pd
+
+    found_rows = list(iter_dataset_rows(topic, limit=50))
+    if found_rows:
+        print(f"Veri setinde {len(found_rows)} satır bulundu.")
+        return pd.DataFrame(found_rows)
+
+    print("Veri bulunamadı (Harita/Çeviri eşleşmedi).")
+    return pd.DataFrame()
+
+
+def _row_text(row):
+    """Satırın aranan metni; terimlerle aynı Türkçe katlamadan geçer (tekil ve toplu tarama aynı sonucu verir)."""
+    return turkish_casefold(str(row.get('skills', '')) + " " + str(row.get('problem_id', '')))
 
-            uuid_match = re.search(r'name="uuid" value="([^"]+)"', html)
-            params = {'id': FILE_ID, 'confirm': confirm}
-            if uuid_match:
-                params['uuid'] = uuid_match.group(1)
 
-            response = session.get("https://drive.usercontent.google.com/download", params=params, stream=True)
+def _iter_drive_stream(search_terms, limit):
+    start_time = time.time()
+    scanned = 0
 
-        response.raw.decode_content = True
+    try:
+        session = requests.Session()
+        response = dataset_store.open_drive_stream(session)
         text_stream = io.TextIOWrapper(response.raw, encoding='utf-8')
 
         reader = csv.DictReader(text_stream)
 
-        found_rows = []
-        limit = 0
+        found = 0
+        folded_terms = [turkish_casefold(term) for term in search_terms]
 
-        for i, row in enumerate(reader):
-            if time.time() - start_time > 8:
+        for row in reader:
+            scanned += 1
+            if time.time() - start_time > DRIVE_SCAN_SECONDS:
                 print(" Süre doldu. Arama güvenli şekilde durduruluyor.")
                 break
 
 
-            row_content = (str(row.get('skills', '')) + " " + str(row.get('problem_id', ''))).lower()
+            row_content = _row_text(row)
 
 
-            if any(term.lower() in row_content for term in search_terms):
-                found_rows.append({
+            if any(term in row_content for term in folded_terms):
+                yield {
                     "skills": row.get('skills'),
                     "problem_id": row.get('problem_id'),
                     "correct": row.get('correct')
-                })
-                limit += 1
+                }
+                found += 1
 
-                if limit >= 50:
-                    print(f"Yeterli veri ({limit} satır) bulundu.")
+                if found >= limit:
+                    print(f"Yeterli veri ({found} satır) bulundu.")
                     break
 
-        if found_rows:
-            return pd.DataFrame(found_rows)
+    except Exception as e:
+        print(f"Arama Hatası: {e}")
+    finally:
+        metrics.DATASET_ROWS.inc(scanned, source="drive", kind="scanned")
+
+
+def _iter_drive_stream_many(term_lists, limit):
+    """
+    Drive CSV'sini tüm konular için bir kez tarar: her satır Aho-Corasick ile bütün terimlere karşı
+    tek geçişte eşlenir. (liste_indeksi, satır) çiftleri üretir; her liste en fazla `limit` satır alır.
+    """
+    patterns = sorted({turkish_casefold(t) for terms in term_lists for t in terms if t})
+    owners = {pattern: set() for pattern in patterns}
+    for i, terms in enumerate(term_lists):
+        for term in terms:
+            if term:
+                owners[turkish_casefold(term)].add(i)
+    owners = [owners[pattern] for pattern in patterns]
+    # Kalıplar ve satır metni (_row_text) aynı Türkçe katlamadan geçer
+    matcher = AhoCorasick(patterns)
+    found = [0] * len(term_lists)
+    open_lists = len(term_lists)
+
+    start_time = time.time()
+    scanned = 0
+    try:
+        session = requests.Session()
+        response = dataset_store.open_drive_stream(session)
+        reader = csv.DictReader(io.TextIOWrapper(response.raw, encoding='utf-8'))
+
+        for row in reader:
+            scanned += 1
+            if time.time() - start_time > DRIVE_SCAN_SECONDS:
+                print(" Süre doldu. Toplu arama güvenli şekilde durduruluyor.")
+                break
 
-        print("Veri bulunamadı (Harita/Çeviri eşleşmedi).")
-        return pd.DataFrame()
+            row_content = _row_text(row)
+            matched = set()
+            for pattern_id in matcher.search(row_content):
+                matched |= owners[pattern_id]
+            for i in matched:
+                if found[i] >= limit:
+                    continue
+                yield i, {"skills": row.get('skills'), "problem_id": row.get('problem_id'),
+                          "correct": row.get('correct')}
+                found[i] += 1
+                if found[i] == limit:
+                    open_lists -= 1
+            if not open_lists:
+                break
 
     except Exception as e:
-        print(f"Arama Hatası: {e}")
-        return pd.DataFrame()
+        print(f"Toplu Arama Hatası: {e}")
+    finally:
+        metrics.DATASET_ROWS.inc(scanned, source="drive", kind="scanned")
+
+
+def batch_weak_problems(term_lists, skill_lists, k=5):
+    """
+    Toplu üretimde her konunun zayıf problemleri (tekil /generate ile aynı sonuç).
+    Beceri kodu bilinenler zorluk tablolarından okunur; kalanlar için veri seti tüm konulara bir kez
+    sorgulanır (yerel indeks: ortak terimler bir kez; Drive: tek akış geçişi).
+    """
+    problems = [None] * len(term_lists)
+    store = dataset_store.get_store()
+    if store is not None:
+        for i, skills in enumerate(skill_lists):
+            if skills:
+                problems[i] = find_weak_problems(None, skills, k) or None
+
+    pending = [i for i, found in enumerate(problems) if found is None]
+    if not pending:
+        return problems
+
+    if store is not None:
+        row_lists = store.search_many([term_lists[i] for i in pending], DIFFICULTY_ROW_LIMIT)
+        metrics.DATASET_ROWS.inc(sum(len(rows) for rows in row_lists), source="index", kind="matched")
+        for i, rows in zip(pending, row_lists):
+            problems[i] = analyze_difficulty((store.row(r) for r in rows), k)
+        return problems
+
+    print("Yerel veri seti hazır değil, Drive akışı toplu taranıyor.")
+    aggregators = [difficulty.DifficultyAggregator() for _ in pending]
+    for j, row in _iter_drive_stream_many([term_lists[i] for i in pending], DIFFICULTY_ROW_LIMIT):
+        aggregators[j].add(row.get("problem_id"), row.get("correct"))
+    for i, aggregator in zip(pending, aggregators):
+        problems[i] = aggregator.weakest(k)
+    return problems
 
 
 # --- Endpointler ---
@@ -161,7 +306,72 @@ def chatbot(): return render_template("pages/chatbot.html")
 
 @routes.route("/generate", methods=["POST"])
 def generate():
+    user_input, duration, source = _read_generate_params()
+
+    if not user_input:
+        return jsonify({"error": "Konu girilmedi."}), 400
+
+    base_url = request.host_url.rstrip("/")
+
+    if source == 'mobile':
+        print(f"[MOBİL] Hız Modu: '{user_input}'")
+        # Mobil istemci her durumda JSON bekler; hiçbir hata Flask'ın HTML 500 sayfasına düşmemeli
+        try:
+            plan = generation_flight.do(make_key(user_input, duration, source), _run_mobile_generation, user_input,
+                                        duration)
+            return jsonify(_mobile_payload(plan, base_url))
+        except LLMError as e:
+            print(f"LLM ERROR: {e}")
+            return _llm_error_response(e)
+        except Exception as e:
+            print(f"MOBİL HATA: {e}")
+            return jsonify({"error": f"Plan oluşturulamadı: {str(e)}"}), 500
+
+    # ASENKRON MOD: 202 + iş kimliği döner, durum /jobs/<id> veya /jobs/<id>/events ile izlenir
+    if _wants_async():
+        try:
+            job_id = job_manager.submit(_generation_job, user_input, duration, base_url, source)
+        except QueueFull:
+            return jsonify({"error": "Sunucu yoğun, lütfen biraz sonra tekrar deneyin."}), 503
+
+        return jsonify({
+            "job_id": job_id,
+            "status_url": f"{base_url}/jobs/{job_id}",
+            "events_url": f"{base_url}/jobs/{job_id}/events",
+            "queue_depth": job_manager.stats()["queue_depth"]
+        }), 202
+
+    try:
+        safe_topic = run_generation(user_input, duration, source=source)
+    except LLMError as e:
+        print(f"LLM ERROR: {e}")
+        return _llm_error_response(e)
+    except Exception as e:
+        print(f"PDF ERROR: {e}")
+        return jsonify({"error": f"PDF oluşturulamadı: {str(e)}"}), 500
 
+    if request.is_json:
+        return jsonify(_download_urls(base_url, safe_topic))
+    else:
+        return render_template(
+            "pages/results.html",
+            topic=user_input,
+            resource_pdf=f"{safe_topic}_resources.pdf",
+            timeline_pdf=f"{safe_topic}_roadmap.pdf"
+        )
+
+
+def _llm_error_response(error):
+    """LLM kullanılamıyorsa 503 (+ Retry-After), diğer LLM hatalarında 502."""
+    if isinstance(error, LLMUnavailable):
+        response = jsonify({"error": "Plan servisi şu an yoğun veya erişilemiyor, lütfen biraz sonra tekrar deneyin."})
+        response.status_code = 503
+        response.headers["Retry-After"] = str(max(1, int(error.retry_after or 1)))
+        return response
+    return jsonify({"error": "Plan üretilemedi."}), 502
+
+
+def _read_generate_params():
     if request.is_json:
         data = request.json
         user_input = data.get("topic", "").strip()
@@ -183,57 +393,353 @@ def generate():
             duration = None
         source = request.form.get("source", "web")
 
+    return user_input, duration, source
+
+
+@routes.route("/generate/stream", methods=["POST"])
+def generate_stream():
+    """
+    /generate'in akış (SSE) sürümü: plan HTML'i model ürettikçe 'plan' olaylarıyla gönderilir,
+    akış bitince PDF'ler üretilir ve 'done' olayı resource_url / roadmap_url ile gelir.
+    """
+    user_input, duration, source = _read_generate_params()
     if not user_input:
         return jsonify({"error": "Konu girilmedi."}), 400
 
-    df_filtered = pd.DataFrame()
-
+    base_url = request.host_url.rstrip("/")
 
-    if source == 'mobile':
-        print(f"[MOBİL] Hız Modu: '{user_input}' (Veri analizi yapılıyor...)")
+    def events():
+        yield format_event("stage", {"stage": "search"})
         try:
-
-            df_filtered = smart_search_stream(user_input)
+            rows = iter_dataset_rows(user_input)
         except Exception as e:
             print(f"Kritik Hata (Atlanıyor): {e}")
-            df_filtered = pd.DataFrame()
-    else:
+            rows = None
+        problems = find_weak_problems(rows, topic_skills(user_input))
+
+        key = plan_cache_key(user_input, duration, problems)
+        cached = artifact_cache.lookup(UPLOAD_FOLDER, key)
+        if is_complete(cached):
+            yield format_event("plan", {"html": cached["plan_html"]})
+            yield format_event("steps", {"steps": cached["steps"]})
+            yield format_event("done", _download_urls(base_url, cached["stem"]))
+            return
+
+        yield format_event("stage", {"stage": "plan"})
+        plan_html, steps = "", []
         try:
-            df_filtered = smart_search_stream(user_input)
+            for kind, payload in stream_ai_learning_plan(user_input, problems, None, duration):
+                if kind == "plan":
+                    yield format_event("plan", {"html": payload})
+                else:
+                    plan_html, steps = payload
+        except LLMError as e:
+            print(f"LLM ERROR: {e}")
+            unavailable = isinstance(e, LLMUnavailable)
+            yield format_event("error", {
+                "error": "Plan servisi şu an yoğun veya erişilemiyor." if unavailable else "Plan üretilemedi.",
+                "retry_after": max(1, int(e.retry_after or 1)) if unavailable else None
+            })
+            return
+        yield format_event("steps", {"steps": steps})
+
+        # Ertelenmiş çizimde yalnızca plan kaydedilir; PDF'ler ilk indirmede çizilir
+        yield format_event("stage", {"stage": "save" if DEFER_RENDER else "pdf"})
+        try:
+            stem = save_plan(user_input, plan_html, steps, key, problems, UPLOAD_FOLDER, duration)
         except Exception as e:
-            print(f"Kritik Hata (Atlanıyor): {e}")
-            df_filtered = pd.DataFrame()
+            print(f"PDF ERROR: {e}")
+            yield format_event("error", {"error": f"PDF oluşturulamadı: {str(e)}"})
+            return
+        yield format_event("done", _download_urls(base_url, stem))
+
+    return Response(
+        stream_with_context(metrics.bind_context(events())),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@routes.route("/generate/batch", methods=["POST"])
+def generate_batch():
+    """
+    Birden çok konu için plan + PDF üretir. Gövde: {"items": [{"topic": ..., "duration": ...} | "konu", ...]}.
+    Veri seti tüm konular için bir kez taranır, planlar en fazla BATCH_CONCURRENCY eşzamanlı üretilir.
+    Varsayılan yanıt NDJSON: her konu bitince bir satır, sonda özet satırı.
+    "zip": true (veya ?format=zip) ile tüm PDF'ler tek bir zip olarak döner.
+    """
+    data = request.get_json(silent=True) if request.is_json else None
+    items, error = _read_batch_items(data)
+    if error:
+        return jsonify({"error": error}), 400
+
+    base_url = request.host_url.rstrip("/")
+    as_zip = request.args.get("format") == "zip" or bool(data.get("zip"))
+
+    if as_zip:
+        stems = [None] * len(items)
+        for index, result in _iter_batch(items):
+            if isinstance(result, Exception):
+                print(f"Toplu üretim hatası ({items[index][0]}): {result}")
+            else:
+                stems[index] = result
+        if not any(stems):
+            return jsonify({"error": "Hiçbir plan üretilemedi."}), 502
+        return send_file(_zip_artifacts(stems), mimetype="application/zip", as_attachment=True,
+                         download_name="planlar.zip")
+
+    def lines():
+        done = failed = 0
+        for index, result in _iter_batch(items):
+            line = {"index": index, "topic": items[index][0]}
+            if isinstance(result, Exception):
+                failed += 1
+                line.update(status="error", error="Plan servisi şu an yoğun veya erişilemiyor."
+                            if isinstance(result, LLMUnavailable) else "Plan üretilemedi.")
+            else:
+                done += 1
+                line.update(status="done", **_download_urls(base_url, result))
+            yield json.dumps(line, ensure_ascii=False) + "\n"
+        yield json.dumps({"status": "complete", "done": done, "failed": failed}) + "\n"
+
+    return Response(
+        stream_with_context(metrics.bind_context(lines())),
+        mimetype="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _read_batch_items(data):
+    """[(konu, süre), ...] ve hata mesajı (geçerliyse None)."""
+    items = data.get("items") if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        return None, "items listesi boş olamaz."
+    if len(items) > BATCH_MAX_ITEMS:
+        return None, f"Tek istekte en fazla {BATCH_MAX_ITEMS} konu gönderilebilir."
+
+    parsed = []
+    for item in items:
+        if isinstance(item, str):
+            topic, duration = item, None
+        elif isinstance(item, dict):
+            topic, duration = item.get("topic"), item.get("duration")
+        else:
+            return None, "Her öğe bir konu veya {topic, duration} olmalı."
+        topic = str(topic or "").strip()
+        if not topic:
+            return None, "Konu boş olamaz."
+        duration = str(duration).strip() if duration and str(duration).strip() else None
+        parsed.append((topic, duration))
+    return parsed, None
 
 
+def _iter_batch(items):
+    """
+    Toplu üretimi çalıştırır, (indeks, sonuç) çiftlerini bitiş sırasıyla üretir; sonuç dosya kökü veya hata.
+    Aynı (konu, süre) tekil /generate ile aynı anahtarla birleştirilir (generation_flight).
+    """
+    executor = ThreadPoolExecutor(max_workers=BATCH_CONCURRENCY, thread_name_prefix="batch")
     try:
+        topics = [topic for topic, _ in items]
+        # Çeviri gerekenler (LLM) paralel çözülür
+        term_lists = [future.result() for future in
+                      [metrics.submit(executor, search_terms_for, topic) for topic in topics]]
+        with metrics.span("batch_search"):
+            try:
+                problems = batch_weak_problems(term_lists, [topic_skills(topic) for topic in topics])
+            except Exception as e:
+                print(f"Kritik Hata (Atlanıyor): {e}")
+                problems = [[] for _ in items]
+
+        futures = {
+            metrics.submit(executor, generation_flight.do, make_key(topic, duration, "web"), generate_two_pdfs_hybrid,
+                           topic, None, output_dir=UPLOAD_FOLDER, duration=duration, problems=problems[i]): i
+            for i, (topic, duration) in enumerate(items)
+        }
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result()
+            except Exception as e:
+                yield futures[future], e
+    finally:
+        # İstemci akışı yarıda keserse bekleyen konular hiç başlamaz
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _zip_artifacts(stems):
+    """
+    Üretilen PDF'leri sıkıştırmadan (PDF zaten sıkıştırılmış) tek bir zip dosyasına koyar.
+    Henüz çizilmemiş (ertelenmiş) belgeler önce tek bir render_pool çağrısıyla paralel çizilir.
+    """
+    entries, pending = [], []
+    for number, stem in enumerate(stems, 1):
+        if not stem:
+            continue
+        for kind in ("resources", "roadmap"):
+            filename = f"{stem}_{kind}.pdf"
+            entries.append((f"{number:02d}_{filename}", os.path.join(UPLOAD_FOLDER, filename)))
+            if not os.path.isfile(entries[-1][1]):
+                manifest = artifact_cache.manifest_for(UPLOAD_FOLDER, filename)
+                if manifest is not None:
+                    pending.append((manifest, filename))
+
+    if pending:
+        started = time.perf_counter()
+        rendered = render_deferred_many(UPLOAD_FOLDER, pending)
+        metrics.observe_stage("deferred_render", time.perf_counter() - started, "zip",
+                              "ok" if len(rendered) == len(pending) else "error")
+
+    buffer = tempfile.SpooledTemporaryFile(max_size=16 * 1024 * 1024)
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED) as archive:
+        for arcname, path in entries:
+            if os.path.isfile(path):
+                archive.write(path, arcname)
+    buffer.seek(0)
+    return buffer
+
+
+def _wants_async():
+    flag = request.args.get("async")
+    if flag is None:
+        flag = request.json.get("async") if request.is_json else request.form.get("async")
+    return str(flag).lower() in ("1", "true", "yes")
+
+
+def _download_urls(base_url, safe_topic):
+    return {
+        "resource_url": f"{base_url}/download/{safe_topic}_resources.pdf",
+        "roadmap_url": f"{base_url}/download/{safe_topic}_roadmap.pdf"
+    }
+
+
+def run_generation(user_input, duration, progress=None, source="web"):
+    """
+    Veri seti araması + plan + PDF'ler. Senkron ve asenkron /generate ortak kullanır.
+    Aynı (konu, süre, kaynak) için süren bir üretim varsa onun sonucu beklenir; progress bekleyenlere de
+    işi yapanın aşamalarını (GENERATION_STAGES) bildirir.
+    """
+    return generation_flight.do(make_key(user_input, duration, source), _run_generation, user_input, duration,
+                                progress=progress)
+
 
-        safe_topic = generate_two_pdfs_hybrid(user_input, df_filtered, output_dir=UPLOAD_FOLDER, duration=duration)
+def _run_generation(user_input, duration, progress=None):
+    if progress: progress("search")
+    try:
+        rows = iter_dataset_rows(user_input)
     except Exception as e:
-        print(f"PDF ERROR: {e}")
-        return jsonify({"error": f"PDF oluşturulamadı: {str(e)}"}), 500
+        print(f"Kritik Hata (Atlanıyor): {e}")
+        rows = None
 
-    base_url = request.host_url.rstrip("/")
+    return generate_two_pdfs_hybrid(user_input, rows, output_dir=UPLOAD_FOLDER, duration=duration,
+                                    progress=progress, skills=topic_skills(user_input))
 
-    if request.is_json:
-        return jsonify({
-            "resource_url": f"{base_url}/download/{safe_topic}_resources.pdf",
-            "roadmap_url": f"{base_url}/download/{safe_topic}_roadmap.pdf"
-        })
-    else:
-        return render_template(
-            "pages/results.html",
-            topic=user_input,
-            resource_pdf=f"{safe_topic}_resources.pdf",
-            timeline_pdf=f"{safe_topic}_roadmap.pdf"
-        )
+
+def _run_mobile_generation(user_input, duration):
+    try:
+        problems = mobile_weak_problems(user_input)
+    except Exception as e:
+        print(f"Kritik Hata (Atlanıyor): {e}")
+        problems = []
+    return generate_mobile_plan(user_input, problems, output_dir=UPLOAD_FOLDER, duration=duration)
+
+
+def _mobile_payload(plan, base_url):
+    """Mobil yanıt: yapılandırılmış plan ve kaynaklar; PDF bağlantıları ilk indirmede çizilir."""
+    return dict({
+        "topic": plan["topic"],
+        "duration": plan["duration"],
+        "summary": plan["summary"],
+        "steps": plan["steps"],
+        "resources": plan["resources"],
+        "problems": plan["problems"]
+    }, **_download_urls(base_url, plan["stem"]))
+
+
+def _generation_job(user_input, duration, base_url, source="web", progress=None):
+    safe_topic = run_generation(user_input, duration, progress=progress, source=source)
+    return _download_urls(base_url, safe_topic)
+
+
+@routes.route("/jobs")
+def jobs_stats():
+    return jsonify(job_manager.stats())
+
+
+@routes.route("/jobs/<job_id>")
+def job_status(job_id):
+    state = job_manager.get(job_id)
+    if state is None:
+        return jsonify({"error": "İş bulunamadı."}), 404
+    return jsonify(state)
+
+
+@routes.route("/jobs/<job_id>/events")
+def job_events(job_id):
+    if job_manager.get(job_id) is None:
+        return jsonify({"error": "İş bulunamadı."}), 404
+    return Response(
+        stream_with_context(metrics.bind_context(job_manager.events(job_id))),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 @routes.route("/download/<filename>")
 def download_file(filename):
+    """
+    Güçlü ETag (içerik özeti) ile sunar: If-None-Match -> 304, Range -> 206 (Werkzeug).
+    Dosya adı girdilerin özetidir, içeriğin değil: kayıt silinince aynı ad farklı bir PDF'le yeniden üretilebilir.
+    Bu yüzden immutable verilmez; max-age kaydın kalan ömrüyle sınırlanır, sonrası ETag ile doğrulanır.
+    Dosya gövdesi sunucunun wsgi.file_wrapper'ı ile (gunicorn: sendfile) veya USE_X_SENDFILE ile gönderilir.
+    """
     file_path = os.path.join(UPLOAD_FOLDER, filename)
-    if not os.path.exists(file_path):
+    if not os.path.isfile(file_path):
+        rendered = ensure_rendered(filename)
+        if rendered is None:
+            return jsonify({"error": "Dosya bulunamadı."}), 404
+        if not rendered:
+            return jsonify({"error": "PDF oluşturulamadı."}), 500
+    try:
+        etag = artifact_cache.etag(file_path)
+    except OSError:  # bu arada silindi
         return jsonify({"error": "Dosya bulunamadı."}), 404
-    return send_from_directory(UPLOAD_FOLDER, filename, as_attachment=True)
+
+    max_age = artifact_cache.remaining_ttl(UPLOAD_FOLDER, filename)
+    # send_from_directory göreli dizini uygulama köküne göre çözer; PDF'ler çalışma dizinine göre yazılır
+    response = send_from_directory(os.path.abspath(UPLOAD_FOLDER), filename, as_attachment=True, etag=etag,
+                                   max_age=max_age or None)
+    if not max_age:
+        response.cache_control.no_cache = True
+    artifact_cache.touch(UPLOAD_FOLDER, filename)
+    return response
+
+
+def ensure_rendered(filename):
+    """
+    Planı kaydedilmiş ama henüz çizilmemiş PDF'i çizer (ilk indirme). Dosya hazırsa True, çizim başarısızsa
+    False, böyle bir kayıt yoksa veya kayıt bu belgeyi üretemiyorsa (adımsız planın yol haritası) None.
+    Aynı dosyanın eşzamanlı ilk indirmeleri tek çizimi paylaşır.
+    """
+    if os.path.isfile(os.path.join(UPLOAD_FOLDER, filename)):
+        return True
+    manifest = artifact_cache.manifest_for(UPLOAD_FOLDER, filename)
+    if manifest is None or deferred_task(UPLOAD_FOLDER, manifest, filename) is None:
+        return None
+    return render_flight.do(filename, _render_once, filename, manifest)
+
+
+def _render_once(filename, manifest):
+    # Kilidi bekleyen başka bir süreç çizmiş olabilir
+    if os.path.isfile(os.path.join(UPLOAD_FOLDER, filename)):
+        return True
+    started = time.perf_counter()
+    ok = False
+    try:
+        ok = render_deferred(UPLOAD_FOLDER, manifest, filename)
+        return ok
+    finally:
+        metrics.observe_stage("deferred_render", time.perf_counter() - started,
+                              artifact_cache.ARTIFACT_NAME.search(filename).group(2), "ok" if ok else "error")
 
 
 @routes.route("/resources", methods=["GET", "POST"])
@@ -245,8 +751,91 @@ def resources():
             return jsonify({"error": "Konu boş olamaz."}) if request.is_json else render_template(
                 "pages/resources.html", error="Lütfen bir konu girin.")
 
-        raw_response = get_ai_resources(user_input)
-        return jsonify(raw_response) if request.is_json else render_template("pages/resources.html", topic=user_input,
-                                                                             resources=raw_response)
+        raw_response, status = resource_flight.do(make_key(user_input), get_real_resources_with_status, user_input)
+        # Zamanında yanıt vermeyen / hata veren sağlayıcılar (kısmi sonuç)
+        partial = [name for name, state in status.items() if state in ("timeout", "error")]
+
+        if request.is_json:
+            response = jsonify(raw_response)
+            response.headers["X-Resource-Status"] = ", ".join(f"{name}={state}" for name, state in status.items())
+            return response
+        return render_template("pages/resources.html", topic=user_input, resources=raw_response, partial=partial)
+
+    return render_template("pages/resources.html", resources=None, error=None)
+
 
-    return render_template("pages/resources.html", resources=None, error=None)
\ No newline at end of file
+@routes.route("/warmup", methods=["GET", "POST"])
+def warmup():
+    """
+    Ağır kütüphaneleri (openai, pandas, WeasyPrint...) önceden yükler; yeni açılan bir örneğe ilk
+    gerçek istekten önce çağrılabilir. Çizim havuzu kapalıysa fontlar da ısıtılır.
+    """
+    start = time.time()
+    modules = warm_up()
+    if render_pool.RENDER_WORKERS <= 0:
+        from utils.ai_pdf_generator import warm_up_renderers
+        warm_up_renderers()
+    return jsonify({"modules": modules, "seconds": round(time.time() - start, 3)})
+
+
+@routes.route("/metrics")
+def metrics_endpoint():
+    """Prometheus metin formatında aşama süreleri, sayaçlar ve servis istatistikleri."""
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4; charset=utf-8")
+
+
+def _profile_admin_allowed():
+    return profiling.verify_token(request.headers.get("X-Profile-Token") or request.args.get("token"))
+
+
+@routes.route("/admin/profiles")
+def profiles_list():
+    """Son istek profilleri (PROFILE_SECRET ile imzalı jeton gerekir)."""
+    if not _profile_admin_allowed():
+        return jsonify({"error": "Bulunamadı."}), 404
+    base_url = request.host_url.rstrip("/")
+    items = profiling.recent()
+    for item in items:
+        item["urls"] = [f"{base_url}/admin/profiles/{name}" for name in item.get("files", [])]
+    return jsonify({"profiles": items, "sample_rate": profiling.SAMPLE_RATE})
+
+
+@routes.route("/admin/profiles/<filename>")
+def profile_file(filename):
+    if not _profile_admin_allowed():
+        return jsonify({"error": "Bulunamadı."}), 404
+    return send_from_directory(os.path.abspath(profiling.PROFILE_DIR), filename, as_attachment=True)
+
+
+@metrics.register_collector
+def _service_stats():
+    jobs = job_manager.stats()
+    samples = [
+        ("jobs_queue_depth", "gauge", "Kuyrukta bekleyen /generate işleri", jobs["queue_depth"]),
+        ("jobs_running", "gauge", "Çalışan /generate işleri", jobs["running"])
+    ]
+    for name, stats in (("translation_cache", translation_cache.stats()), ("resource_cache", resource_cache.stats())):
+        samples += [
+            (f"{name}_hits_total", "counter", "Önbellek isabetleri", stats["hits"]),
+            (f"{name}_misses_total", "counter", "Önbellek ıskaları", stats["misses"]),
+            (f"{name}_entries", "gauge", "Önbellekteki kayıt sayısı", stats["entries"])
+        ]
+        if "stale_hits" in stats:
+            samples.append((f"{name}_stale_hits_total", "counter", "Bayat sunulan kayıtlar", stats["stale_hits"]))
+
+    store = dataset_store.get_store()
+    samples.append(("dataset_rows", "gauge", "Etkin veri seti versiyonunun satır sayısı",
+                    len(store) if store is not None else None))
+
+    artifacts = artifact_cache.stats()
+    samples += [
+        ("artifact_entries", "gauge", "Önbellekteki çıktı kayıtları (son temizlikte)", artifacts["entries"]),
+        ("artifact_bytes", "gauge", "Çıktı klasörünün boyutu (son temizlikte)", artifacts["bytes"]),
+        ("artifact_evicted_total", "counter", "Silinen çıktılar", artifacts["evicted"])
+    ]
+    return samples
+
+
+@routes.route("/resources/stats")
+def resources_stats():
+    return jsonify(resource_cache.stats())
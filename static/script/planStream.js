@@ -0,0 +1,90 @@
+// Plan Oluşturma (Akış Modu)
+// Tarayıcı destekliyorsa form /generate/stream'e gönderilir ve plan, model ürettikçe önizlemede görünür.
+// Desteklemiyorsa form normal şekilde /generate'e gider.
+const planForm = document.getElementById("planForm");
+
+function parseEvent(raw) {
+    let event = "message";
+    let data = "";
+    raw.split("\n").forEach(line => {
+        if (line.startsWith("event:")) event = line.slice(6).trim();
+        else if (line.startsWith("data:")) data += line.slice(5).trim();
+    });
+    return { event, data: data ? JSON.parse(data) : null };
+}
+
+async function streamPlan(event) {
+    if (!window.fetch || !window.ReadableStream || !window.TextDecoder) return;
+    event.preventDefault();
+
+    const status = document.getElementById("planStatus");
+    const preview = document.getElementById("planPreview");
+    const links = document.getElementById("planLinks");
+    const button = planForm.querySelector("button[type=submit]");
+    const stageLabels = {
+        search: "Veri seti taranıyor...",
+        plan: "Plan yazılıyor...",
+        save: "Plan kaydediliyor...",
+        pdf: "PDF'ler hazırlanıyor..."
+    };
+
+    button.disabled = true;
+    links.style.display = "none";
+    preview.style.display = "block";
+    status.textContent = "Başlatılıyor...";
+
+    let html = "";
+    let scheduled = false;
+    // Model çıktısı güvenilmeyen HTML: yalnızca sandbox'lı iframe içinde gösterilir
+    const render = () => {
+        scheduled = false;
+        preview.srcdoc = html;
+    };
+
+    try {
+        const response = await fetch(planForm.dataset.streamUrl, { method: "POST", body: new FormData(planForm) });
+        if (!response.ok) throw new Error((await response.json()).error || response.statusText);
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = "";
+
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+
+            let index;
+            while ((index = buffer.indexOf("\n\n")) >= 0) {
+                const raw = buffer.slice(0, index);
+                buffer = buffer.slice(index + 2);
+                if (!raw.trim() || raw.startsWith(":")) continue;
+
+                const { event: name, data } = parseEvent(raw);
+                if (name === "stage") {
+                    status.textContent = stageLabels[data.stage] || data.stage;
+                } else if (name === "plan") {
+                    html += data.html;
+                    if (!scheduled) {
+                        scheduled = true;
+                        requestAnimationFrame(render);
+                    }
+                } else if (name === "done") {
+                    status.textContent = "Planınız hazır!";
+                    document.getElementById("resourceLink").href = data.resource_url;
+                    document.getElementById("roadmapLink").href = data.roadmap_url;
+                    links.style.display = "block";
+                } else if (name === "error") {
+                    status.textContent = data.error;
+                }
+            }
+        }
+        render();
+    } catch (error) {
+        status.textContent = "Hata: " + error.message;
+    } finally {
+        button.disabled = false;
+    }
+}
+
+if (planForm) planForm.addEventListener("submit", streamPlan);
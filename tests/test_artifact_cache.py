@@ -0,0 +1,59 @@
+import os
+import time
+import multiprocessing
+
+import pytest
+
+from utils import artifact_cache
+
+
+KEY = "ef" * 32
+
+
+def _add(output_dir, name, barrier):
+    barrier.wait()
+    artifact_cache.add_files(output_dir, KEY, [name])
+
+
+def _slow_sizes(sizes):
+    # Oku ile yaz arasını genişletir: kilitsiz iki worker'dan biri diğerinin dosyasını kesin düşürür
+    def slow(output_dir, names):
+        time.sleep(0.05)
+        return sizes(output_dir, names)
+    return slow
+
+
+@pytest.mark.skipif(artifact_cache.fcntl is None, reason="flock yok")
+def test_concurrent_add_files_from_processes_keep_both_entries(tmp_path, monkeypatch):
+    context = multiprocessing.get_context("fork")
+    monkeypatch.setattr(artifact_cache, "_sizes", _slow_sizes(artifact_cache._sizes))
+    output_dir = str(tmp_path)
+    stem = artifact_cache.artifact_stem("konu", KEY)
+    names = [f"{stem}_resources.pdf", f"{stem}_roadmap.pdf"]
+    for name in names:
+        (tmp_path / name).write_bytes(b"%PDF")
+
+    for _ in range(5):
+        artifact_cache.store(output_dir, KEY, {"stem": stem, "topic": "konu", "steps": ["a"], "files": []})
+        barrier = context.Barrier(2)
+        workers = [context.Process(target=_add, args=(output_dir, name, barrier)) for name in names]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        manifest = artifact_cache.lookup(output_dir, KEY)
+        assert manifest["files"] == sorted(names)
+        assert set(manifest["sizes"]) == set(names)
+
+    # Kilit dosyaları bırakılınca silinir
+    assert not [n for n in os.listdir(tmp_path / ".cache") if n.endswith(".lock")]
+
+
+def test_remaining_ttl_is_bounded_by_the_record_lifetime(tmp_path):
+    stem = artifact_cache.artifact_stem("konu", KEY)
+    artifact_cache.store(str(tmp_path), KEY, {"stem": stem, "topic": "konu", "files": []})
+
+    remaining = artifact_cache.remaining_ttl(str(tmp_path), f"{stem}_roadmap.pdf", ttl=3600)
+    assert 3590 <= remaining <= 3600
+    assert artifact_cache.remaining_ttl(str(tmp_path), "baska.pdf") is None
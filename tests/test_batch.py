@@ -0,0 +1,103 @@
+import io
+import json
+import zipfile
+
+import pytest
+from flask import Flask
+
+import routes
+from utils.llm_gateway import LLMUnavailable
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(routes, "UPLOAD_FOLDER", str(tmp_path))
+    monkeypatch.setattr(routes, "search_terms_for", lambda topic: [topic.lower()])
+    monkeypatch.setattr(routes, "topic_skills", lambda topic: None)
+    monkeypatch.setattr(routes, "batch_weak_problems", lambda term_lists, skill_lists: [[] for _ in term_lists])
+
+    def generate(topic, rows, output_dir, duration=None, problems=None):
+        if topic == "hata":
+            raise LLMUnavailable("devre açık", 5)
+        stem = f"{topic}_{'0' * 16}"
+        for kind in ("resources", "roadmap"):
+            with open(f"{output_dir}/{stem}_{kind}.pdf", "wb") as f:
+                f.write(f"%PDF {topic} {kind}".encode())
+        return stem
+
+    monkeypatch.setattr(routes, "generate_two_pdfs_hybrid", generate)
+    app = Flask(__name__)
+    app.register_blueprint(routes.routes)
+    return app.test_client()
+
+
+@pytest.mark.parametrize("body, error", [
+    (None, "items listesi boş olamaz."),
+    ({"items": []}, "items listesi boş olamaz."),
+    ({"items": "geometri"}, "items listesi boş olamaz."),
+    ({"items": [3]}, "Her öğe bir konu veya {topic, duration} olmalı."),
+    ({"items": ["geometri", "  "]}, "Konu boş olamaz."),
+    ({"items": [{"duration": "2 hafta"}]}, "Konu boş olamaz."),
+])
+def test_invalid_batches_are_rejected(body, error):
+    assert routes._read_batch_items(body) == (None, error)
+
+
+def test_item_limit(monkeypatch):
+    monkeypatch.setattr(routes, "BATCH_MAX_ITEMS", 2)
+    items, error = routes._read_batch_items({"items": ["a", "b", "c"]})
+    assert items is None and "en fazla 2" in error
+    assert routes._read_batch_items({"items": ["a", "b"]}) == ([("a", None), ("b", None)], None)
+
+
+def test_items_are_normalized():
+    items, _ = routes._read_batch_items({"items": [" geometri ", {"topic": "oran", "duration": " 2 hafta "},
+                                                   {"topic": "veri", "duration": "  "}]})
+    assert items == [("geometri", None), ("oran", "2 hafta"), ("veri", None)]
+
+
+def test_invalid_batch_returns_json_400(client):
+    response = client.post("/generate/batch", json={"items": []})
+    assert response.status_code == 400
+    assert response.json == {"error": "items listesi boş olamaz."}
+
+
+def test_ndjson_has_one_line_per_item_and_a_summary(client):
+    response = client.post("/generate/batch", json={"items": ["geometri", "hata", {"topic": "oran"}]})
+    assert response.mimetype == "application/x-ndjson"
+
+    body = response.get_data(as_text=True)
+    assert body.endswith("\n")
+    lines = [json.loads(line) for line in body.splitlines()]
+    assert lines[-1] == {"status": "complete", "done": 2, "failed": 1}
+
+    by_index = {line["index"]: line for line in lines[:-1]}
+    assert sorted(by_index) == [0, 1, 2]
+    assert by_index[0]["status"] == "done"
+    assert by_index[0]["resource_url"].endswith(f"/download/geometri_{'0' * 16}_resources.pdf")
+    assert by_index[1] == {"index": 1, "topic": "hata", "status": "error",
+                           "error": "Plan servisi şu an yoğun veya erişilemiyor."}
+
+
+def test_zip_contains_the_pdfs_of_successful_items_in_order(client):
+    response = client.post("/generate/batch?format=zip", json={"items": ["geometri", "hata", "oran"]})
+    assert response.status_code == 200 and response.mimetype == "application/zip"
+
+    archive = zipfile.ZipFile(io.BytesIO(response.data))
+    stem = "0" * 16
+    assert archive.namelist() == [
+        f"01_geometri_{stem}_resources.pdf", f"01_geometri_{stem}_roadmap.pdf",
+        f"03_oran_{stem}_resources.pdf", f"03_oran_{stem}_roadmap.pdf",
+    ]
+    assert archive.read(f"03_oran_{stem}_roadmap.pdf") == b"%PDF oran roadmap"
+    assert all(info.compress_type == zipfile.ZIP_STORED for info in archive.infolist())
+
+
+def test_zip_with_no_successful_item_is_an_error(client):
+    response = client.post("/generate/batch", json={"items": ["hata"], "zip": True})
+    assert response.status_code == 502
+    assert response.json == {"error": "Hiçbir plan üretilemedi."}
+
+
+def test_row_text_uses_turkish_folding():
+    assert routes._row_text({"skills": "İFADELER", "problem_id": "P1"}) == "ifadeler p1"
@@ -0,0 +1,29 @@
+import pytest
+
+from utils.difficulty import DifficultyAggregator, weakest_problems, is_missing_id
+
+
+ROWS = [
+    {"problem_id": "p1", "correct": 1},
+    {"problem_id": "p1", "correct": 0},
+    {"problem_id": "p2", "correct": 1},
+    {"problem_id": "p3", "correct": "0.75"},
+]
+
+
+def test_weakest_orders_by_mean_accuracy():
+    assert weakest_problems(ROWS, k=3) == ["p1", "p3", "p2"]
+
+
+@pytest.mark.parametrize("missing", [None, float("nan"), "", "  ", "NaN", "null"])
+def test_rows_without_problem_id_are_not_a_problem(missing):
+    rows = ROWS + [{"problem_id": missing, "correct": 0}] * 5
+    aggregator = DifficultyAggregator().feed(rows)
+
+    assert aggregator.weakest(5) == ["p1", "p3", "p2"]
+    assert len(aggregator) == 3
+    assert aggregator.rows == len(rows)
+
+
+def test_is_missing_id_keeps_real_ids():
+    assert not any(is_missing_id(value) for value in ("0", 0, 0.0, "p-nan", 12))
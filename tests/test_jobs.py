@@ -0,0 +1,92 @@
+import time
+
+import pytest
+
+from utils.jobs import JobManager, QueueFull
+
+
+STAGES = ("search", "plan", "save")
+
+
+def wait_for(manager, job_id, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        state = manager.get(job_id)
+        if state and state["status"] in ("done", "failed"):
+            return state
+        time.sleep(0.01)
+    raise AssertionError("iş bitmedi")
+
+
+def planned(topic, progress=None):
+    for stage in STAGES:
+        progress(stage)
+        time.sleep(0.01)
+    return {"resource_url": f"/download/{topic}_resources.pdf"}
+
+
+def test_done_job_state_is_persisted(tmp_path):
+    manager = JobManager(str(tmp_path), stages=STAGES, workers=1)
+    job_id = manager.submit(planned, "geometri")
+
+    state = wait_for(manager, job_id)
+    assert state["status"] == "done"
+    assert state["result"] == {"resource_url": "/download/geometri_resources.pdf"}
+    assert state["error"] is None
+    assert state["expected_stages"] == list(STAGES)
+    assert list(state["stages"]) == list(STAGES)
+    assert all(state["stages"][stage]["duration"] >= 0 for stage in STAGES)
+    assert state["finished"] >= state["started"] >= state["created"]
+
+    # Durum dosyada tutulur: başka bir worker sürecindeki yönetici de aynı işi görür
+    other = JobManager(str(tmp_path), stages=STAGES, workers=1)
+    assert other.get(job_id) == state
+
+
+def test_failed_job_keeps_the_error_and_last_stage(tmp_path):
+    def broken(topic, progress=None):
+        progress("search")
+        progress("plan")
+        raise RuntimeError("plan üretilemedi")
+
+    manager = JobManager(str(tmp_path), stages=STAGES, workers=1)
+    state = wait_for(manager, manager.submit(broken, "geometri"))
+
+    assert state["status"] == "failed"
+    assert state["error"] == "plan üretilemedi"
+    assert state["result"] is None
+    assert state["stage"] == "plan"
+    assert "duration" in state["stages"]["plan"]
+
+
+def test_events_end_with_the_terminal_state(tmp_path):
+    manager = JobManager(str(tmp_path), stages=STAGES, workers=1)
+    job_id = manager.submit(planned, "geometri")
+
+    events = list(manager.events(job_id, poll_interval=0.005, timeout=5))
+    assert events[-1].startswith("event: done")
+    assert all(event.startswith("event: stage") for event in events[:-1])
+
+
+def test_unknown_or_invalid_job_ids(tmp_path):
+    manager = JobManager(str(tmp_path), stages=STAGES)
+    assert manager.get("../../etc/passwd") is None
+    assert manager.get("0" * 32) is None
+    assert list(manager.events("0" * 32))[0].startswith("event: error")
+
+
+def test_queue_limit_and_stage_stats(tmp_path):
+    manager = JobManager(str(tmp_path), stages=STAGES, workers=1, max_queue=2)
+    ids = [manager.submit(planned, "a"), manager.submit(planned, "b")]
+    with pytest.raises(QueueFull):
+        manager.submit(planned, "c")
+
+    for job_id in ids:
+        wait_for(manager, job_id)
+    # Sayaç son durum yazıldıktan hemen sonra düşer
+    while manager.stats()["running"]:
+        time.sleep(0.01)
+    stats = manager.stats()
+    assert list(stats["stages"]) == list(STAGES)
+    assert all(stats["stages"][stage]["count"] == 2 for stage in STAGES)
+    assert stats["queue_depth"] == 0
@@ -0,0 +1,167 @@
+import time
+import threading
+
+import pytest
+
+from utils import llm_gateway
+from utils.llm_gateway import CircuitBreaker, LLMError, LLMUnavailable
+
+
+class APITimeoutError(Exception):
+    """openai.APITimeoutError yerine (_classify sınıf adına bakar)."""
+
+
+@pytest.fixture
+def gateway(monkeypatch):
+    monkeypatch.setattr(llm_gateway, "breaker", CircuitBreaker(threshold=5, cooldown=30))
+    monkeypatch.setattr(llm_gateway, "LLM_BACKOFF_BASE", 0.001)
+    monkeypatch.setattr(llm_gateway, "LLM_BACKOFF_MAX", 0.001)
+    return llm_gateway
+
+
+def timing_out(seconds):
+    raise APITimeoutError("Request timed out.")
+
+
+def test_mobile_deadline_expiries_do_not_trip_the_breaker(gateway):
+    for _ in range(10):
+        with pytest.raises(LLMUnavailable):
+            gateway._call("mobile", gateway.deadline_after(0.05), timing_out)
+
+    assert gateway.breaker.state == "closed"
+    assert gateway._call("plan", gateway.deadline_after(5), lambda seconds: "plan") == "plan"
+
+
+def test_upstream_timeouts_with_a_long_budget_trip_the_breaker(gateway, monkeypatch):
+    monkeypatch.setattr(gateway, "LLM_BREAKER_MIN_TIMEOUT", 0.01)
+    for _ in range(5):
+        with pytest.raises(LLMUnavailable):
+            gateway._call("plan", gateway.deadline_after(0.05), timing_out)
+
+    assert gateway.breaker.state == "open"
+    with pytest.raises(LLMUnavailable):
+        gateway._call("stream", gateway.deadline_after(5), lambda seconds: "plan")
+
+
+class StatusError(Exception):
+    """openai.APIStatusError yerine: status_code ve response başlıkları."""
+
+    def __init__(self, status_code, retry_after=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = type("Response", (), {"headers": {"retry-after": retry_after} if retry_after else {}})()
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_breaker_open_half_open_closed():
+    clock = Clock()
+    breaker = CircuitBreaker(threshold=3, cooldown=10, clock=clock)
+
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+    assert breaker.retry_after() == 10
+
+    clock.now = 10
+    assert breaker.state == "half_open"
+    assert breaker.allow()          # tek deneme çağrısı
+    assert not breaker.allow()      # deneme sürerken diğerleri reddedilir
+
+    breaker.record_failure()        # deneme başarısız -> tekrar open, süre yeniden başlar
+    assert breaker.state == "open" and breaker.trips == 2
+    clock.now = 20
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow() and breaker.allow()
+
+
+def test_retries_stop_at_the_retry_budget(gateway):
+    calls = []
+
+    def failing(seconds):
+        calls.append(seconds)
+        raise StatusError(503)
+
+    with pytest.raises(LLMUnavailable):
+        gateway._call("plan", gateway.deadline_after(5), failing)
+    assert len(calls) == gateway.LLM_MAX_RETRIES + 1
+
+
+def test_backoff_never_sleeps_past_the_deadline(gateway, monkeypatch):
+    monkeypatch.setattr(gateway, "LLM_BACKOFF_BASE", 10)
+    monkeypatch.setattr(gateway, "LLM_BACKOFF_MAX", 10)
+    monkeypatch.setattr(gateway.random, "uniform", lambda low, high: high)
+    calls = []
+
+    def failing(seconds):
+        calls.append(seconds)
+        raise StatusError(429, retry_after="30")
+
+    started = time.monotonic()
+    with pytest.raises(LLMUnavailable) as error:
+        gateway._call("plan", gateway.deadline_after(0.5), failing)
+    assert time.monotonic() - started < 0.5
+    assert len(calls) == 1
+    assert all(seconds <= 0.5 for seconds in calls)
+    assert error.value.retry_after == 30
+
+
+def test_client_errors_are_not_retried_or_counted(gateway):
+    calls = []
+
+    def bad_request(seconds):
+        calls.append(seconds)
+        raise StatusError(400)
+
+    for _ in range(10):
+        with pytest.raises(LLMError) as error:
+            gateway._call("plan", gateway.deadline_after(5), bad_request)
+        assert not isinstance(error.value, LLMUnavailable)
+    assert len(calls) == 10
+    assert gateway.breaker.state == "closed"
+    assert gateway.breaker._failures == 0
+
+
+def test_semaphore_limits_concurrent_calls(gateway, monkeypatch):
+    monkeypatch.setattr(gateway, "_slots", threading.BoundedSemaphore(2))
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def slow(seconds):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        return "ok"
+
+    threads = [threading.Thread(target=gateway._call, args=("plan", gateway.deadline_after(5), slow))
+               for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak[0] == 2
+    assert gateway._in_flight == 0
+
+
+def test_full_queue_gives_up_at_the_deadline(gateway, monkeypatch):
+    slots = threading.BoundedSemaphore(1)
+    monkeypatch.setattr(gateway, "_slots", slots)
+    slots.acquire()
+    try:
+        with pytest.raises(LLMUnavailable):
+            gateway._call("plan", gateway.deadline_after(0.05), lambda seconds: "ok")
+    finally:
+        slots.release()
+    assert gateway.breaker.state == "closed"
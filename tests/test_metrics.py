@@ -0,0 +1,61 @@
+import importlib.util
+import multiprocessing
+
+from utils import metrics
+
+
+def record(amount, seconds):
+    metrics.DATASET_ROWS.inc(amount, source="test-merge", kind="matched")
+    metrics.STAGE_SECONDS.observe(seconds, stage="test-merge", target="", status="ok")
+
+
+def worker(amount, seconds):
+    record(amount, seconds)
+    metrics.flush()
+
+
+def sample(text, line_start):
+    return [line for line in text.splitlines() if line.startswith(line_start)]
+
+
+def test_metrics_dir_sums_all_processes(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_DIR", str(tmp_path))
+    monkeypatch.setattr(metrics, "_own_file", {"pid": None, "path": None})
+
+    context = multiprocessing.get_context("fork")
+    for amount, seconds in ((3, 0.2), (4, 3.0)):
+        process = context.Process(target=worker, args=(amount, seconds))
+        process.start()
+        process.join(10)
+        assert process.exitcode == 0
+    record(5, 0.02)
+
+    text = metrics.render()
+    assert sample(text, 'ogrenme_dataset_rows_total{source="test-merge",kind="matched"}') == [
+        'ogrenme_dataset_rows_total{source="test-merge",kind="matched"} 12'
+    ]
+    labels = '{stage="test-merge",target="",status="ok"}'
+    assert sample(text, f"ogrenme_stage_seconds_count{labels}") == [f"ogrenme_stage_seconds_count{labels} 3"]
+    assert sample(text, 'ogrenme_stage_seconds_bucket{stage="test-merge",target="",status="ok",le="0.25"}')[0] \
+        .endswith(" 2")
+
+    # Kapanan süreçlerin dosyaları kalır; tekrar okununca sayaç geri düşmez
+    assert len(list(tmp_path.glob("*.json"))) == 3
+    assert "12" in sample(metrics.render(), 'ogrenme_dataset_rows_total{source="test-merge"')[0]
+
+    metrics.clear_dir()
+    assert not list(tmp_path.glob("*.json"))
+
+
+def test_without_metrics_dir_only_this_process_is_reported(monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_DIR", None)
+    metrics.DATASET_ROWS.inc(7, source="test-local", kind="matched")
+    assert 'ogrenme_dataset_rows_total{source="test-local",kind="matched"} 7' in metrics.render()
+
+
+def test_span_log_is_opt_in(monkeypatch):
+    monkeypatch.delenv("SPAN_LOG", raising=False)
+    spec = importlib.util.spec_from_file_location("metrics_default", metrics.__file__)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    assert module.SPAN_LOG is False
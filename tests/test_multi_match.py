@@ -0,0 +1,39 @@
+from utils.multi_match import AhoCorasick
+from utils.topic_resolver import turkish_casefold
+
+
+def brute_force(patterns, text):
+    return {i for i, pattern in enumerate(patterns) if pattern and pattern in text}
+
+
+def test_overlapping_and_nested_patterns():
+    patterns = ["he", "she", "his", "hers", "7.rp", "7.rp.a.1", "rp.a"]
+    matcher = AhoCorasick(patterns)
+
+    for text in ["ushers", "7.rp.a.1 p12", "this", "she sells 7.rp.a.3", "", "xyz"]:
+        assert matcher.search(text) == brute_force(patterns, text)
+
+
+def test_matches_brute_force_on_dataset_like_rows():
+    patterns = ["8.ee", "8.ee.a.1", "ee.a", "a.1", "exponents", "7.rp", "ratio", "p1", "p12"]
+    rows = ["8.EE.A.1 P12", "7.RP.A.2 P1", "8.F.B.5 ratio", "8.EE.C.7 P120", "exponents 8.ee.a.2"]
+    matcher = AhoCorasick(patterns)
+
+    for row in rows:
+        assert matcher.search(row.lower()) == brute_force(patterns, row.lower())
+
+
+def test_empty_patterns_are_ignored():
+    matcher = AhoCorasick(["", "ab"])
+    assert matcher.search("cab") == {1}
+
+
+def test_turkish_case_folding_matches_dotted_and_dotless_i():
+    # str.lower("İ") iki karakterdir ("i̇"); kalıp ve metin aynı Türkçe katlamadan geçmelidir
+    patterns = [turkish_casefold(p) for p in ["OLASILIK", "İfadeler", "Işık"]]
+    matcher = AhoCorasick(patterns)
+
+    assert matcher.search(turkish_casefold("olasılık 7.SP.C.5")) == {0}
+    assert matcher.search(turkish_casefold("CEBİRSEL İFADELER")) == {1}
+    assert matcher.search(turkish_casefold("ışık hızı")) == {2}
+    assert matcher.search("İfadeler".lower()) == set()
@@ -0,0 +1,23 @@
+from utils import render_pool
+
+
+def test_pool_size_is_split_across_server_workers(monkeypatch):
+    monkeypatch.delenv("RENDER_POOL_PER_WORKER", raising=False)
+    monkeypatch.setattr(render_pool, "RENDER_POOL_SIZE", 8)
+    monkeypatch.setattr(render_pool, "SERVER_WORKERS", 4)
+    assert render_pool._workers_per_process() == 2
+
+    # Her worker en az bir çizim süreci alır; havuz kapalıysa kapalı kalır
+    monkeypatch.setattr(render_pool, "SERVER_WORKERS", 16)
+    assert render_pool._workers_per_process() == 1
+    monkeypatch.setattr(render_pool, "RENDER_POOL_SIZE", 0)
+    assert render_pool._workers_per_process() == 0
+
+
+def test_explicit_per_worker_size_wins(monkeypatch):
+    monkeypatch.setattr(render_pool, "RENDER_POOL_SIZE", 8)
+    monkeypatch.setattr(render_pool, "SERVER_WORKERS", 4)
+    monkeypatch.setenv("RENDER_POOL_PER_WORKER", "3")
+    assert render_pool._workers_per_process() == 3
+    monkeypatch.setenv("RENDER_POOL_PER_WORKER", "0")
+    assert render_pool._workers_per_process() == 0
@@ -0,0 +1,55 @@
+import time
+import threading
+
+import pytest
+
+from utils import ai_pdf_generator, resource_cache
+from utils.disk_cache import DiskCache
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(tmp_path, monkeypatch):
+    # Gerçek CACHE_DB'deki kayıtlar sağlayıcıları atlatmasın
+    monkeypatch.setattr(resource_cache, "_cache", DiskCache("resources", path=str(tmp_path / "cache.sqlite3")))
+
+
+def test_slow_provider_is_reported_as_timeout_while_others_return():
+    release = threading.Event()
+
+    def slow(topic):
+        release.wait(5)
+        return [{"title": "geç", "link": "https://example.com/slow"}]
+
+    def fast(topic):
+        return [{"title": f"{topic} özeti", "link": "https://example.com/fast"}]
+
+    providers = {"Wikipedia": fast, "Videos": slow, "Articles": lambda topic: []}
+    try:
+        started = time.monotonic()
+        results, status = ai_pdf_generator._run_providers("Graf Teorisi", providers=providers, deadline=0.3)
+        elapsed = time.monotonic() - started
+    finally:
+        release.set()
+
+    assert elapsed < 2
+    assert status == {"Wikipedia": "ok", "Videos": "timeout", "Articles": "empty"}
+    assert results["Wikipedia"] == [{"title": "Graf Teorisi özeti", "link": "https://example.com/fast"}]
+    assert results["Videos"] == []
+
+
+def test_failing_provider_does_not_hide_the_others():
+    def broken(topic):
+        raise ConnectionError("bağlantı yok")
+
+    def read_timeout(topic):
+        raise TimeoutError("okuma süresi doldu")
+
+    providers = {
+        "Wikipedia": lambda topic: [{"title": "Graf", "link": "https://example.com"}],
+        "Videos": broken,
+        "Articles": read_timeout
+    }
+    results, status = ai_pdf_generator._run_providers("Graf", providers=providers, deadline=2)
+
+    assert status == {"Wikipedia": "ok", "Videos": "error", "Articles": "timeout"}
+    assert len(results["Wikipedia"]) == 1
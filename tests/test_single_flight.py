@@ -0,0 +1,184 @@
+import os
+import time
+import threading
+import multiprocessing
+
+import pytest
+
+from utils import single_flight
+from utils.single_flight import SingleFlight, make_key
+
+
+needs_flock = pytest.mark.skipif(single_flight.fcntl is None, reason="flock yok")
+
+
+def run_concurrently(count, target):
+    results = [None] * count
+    barrier = threading.Barrier(count)
+
+    def call(i):
+        barrier.wait()
+        try:
+            results[i] = ("ok", target())
+        except Exception as e:
+            results[i] = ("error", e)
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_callers_share_one_execution(tmp_path):
+    flight = SingleFlight("test", lock_dir=str(tmp_path))
+    calls = []
+
+    def work():
+        calls.append(1)
+        time.sleep(0.1)
+        return {"stem": "geometri"}
+
+    results = run_concurrently(8, lambda: flight.do(make_key("Geometri", None, "web"), work))
+
+    assert len(calls) == 1
+    assert all(result == ("ok", {"stem": "geometri"}) for result in results)
+    assert len({id(result[1]) for result in results}) == 1
+    assert flight.in_flight() == 0
+
+
+def test_concurrent_callers_share_the_exception(tmp_path):
+    flight = SingleFlight("test", lock_dir=str(tmp_path))
+    calls = []
+
+    def work():
+        calls.append(1)
+        time.sleep(0.1)
+        raise ValueError("plan üretilemedi")
+
+    results = run_concurrently(5, lambda: flight.do("konu", work))
+
+    assert len(calls) == 1
+    errors = [result[1] for result in results]
+    assert all(status == "error" for status, _ in results)
+    assert all(error is errors[0] and str(error) == "plan üretilemedi" for error in errors)
+    # Hata sonrası ilk çağrı işi yeniden yapar
+    assert flight.do("konu", lambda: "tekrar") == "tekrar"
+
+
+def test_different_keys_do_not_wait_for_each_other(tmp_path):
+    flight = SingleFlight("test", lock_dir=str(tmp_path))
+    keys = iter(["geometri\x1f\x1fweb", "konu 156\x1f\x1fweb", "olasılık\x1f\x1fweb"])
+    lock = threading.Lock()
+
+    def target():
+        with lock:
+            key = next(keys)
+        return flight.do(key, time.sleep, 0.2)
+
+    started = time.monotonic()
+    run_concurrently(3, target)
+    assert time.monotonic() - started < 0.4
+
+
+@needs_flock
+def test_lock_file_is_unlinked_after_release(tmp_path):
+    flight = SingleFlight("test", lock_dir=str(tmp_path))
+    seen = []
+    flight.do("konu", lambda: seen.append(os.listdir(tmp_path)))
+
+    assert seen == [[os.path.basename(flight._lock_path("konu"))]]
+    assert os.listdir(tmp_path) == []
+
+
+@needs_flock
+def test_waiter_rechecks_the_inode_after_the_holder_unlinks(tmp_path):
+    fcntl = single_flight.fcntl
+    flight = SingleFlight("test", lock_dir=str(tmp_path), wait_timeout=5)
+    path = flight._lock_path("konu")
+
+    old = os.open(path, os.O_RDWR | os.O_CREAT)
+    fcntl.flock(old, fcntl.LOCK_EX)
+    ran = threading.Event()
+    waiter = threading.Thread(target=flight.do, args=("konu", ran.set))
+    waiter.start()
+    time.sleep(0.15)
+
+    # Eski sahip dosyayı silip bırakırken başka bir süreç yeni dosyayı oluşturup kilitlemiş olsun
+    os.unlink(path)
+    new = os.open(path, os.O_RDWR | os.O_CREAT)
+    fcntl.flock(new, fcntl.LOCK_EX)
+    fcntl.flock(old, fcntl.LOCK_UN)
+    os.close(old)
+
+    # Bekleyen silinmiş dosyanın kilidini alsa da yoldaki yeni dosya kilitli olduğu için çalışmamalı
+    assert not ran.wait(0.3)
+
+    os.unlink(path)
+    fcntl.flock(new, fcntl.LOCK_UN)
+    os.close(new)
+    waiter.join(2)
+    assert ran.is_set()
+
+
+def _crash_holding_the_lock(lock_dir, holding):
+    def crash():
+        holding.set()
+        time.sleep(0.2)
+        os._exit(1)
+
+    SingleFlight("test", lock_dir=lock_dir).do("konu", crash)
+
+
+@needs_flock
+def test_leader_crash_releases_followers(tmp_path):
+    context = multiprocessing.get_context("fork")
+    holding = context.Event()
+    leader = context.Process(target=_crash_holding_the_lock, args=(str(tmp_path), holding))
+    leader.start()
+    assert holding.wait(5)
+
+    flight = SingleFlight("test", lock_dir=str(tmp_path), wait_timeout=5)
+    started = time.monotonic()
+    assert flight.do("konu", lambda: "takipçi") == "takipçi"
+    leader.join()
+
+    assert leader.exitcode == 1
+    assert time.monotonic() - started < 2  # WAIT_TIMEOUT'u beklemeden, çöken sürecin kilidi düşünce
+
+
+def test_waiters_receive_the_leaders_progress(tmp_path):
+    flight = SingleFlight("test", lock_dir=str(tmp_path))
+    planning = threading.Event()
+    joined = threading.Event()
+    seen = {"leader": [], "waiter": []}
+
+    def work(progress=None):
+        progress("search")
+        progress("plan")
+        planning.set()
+        joined.wait(2)
+        progress("save")
+        return "geometri"
+
+    leader = threading.Thread(target=flight.do, args=("konu", work), kwargs={"progress": seen["leader"].append})
+    leader.start()
+    planning.wait(2)
+    waiter = threading.Thread(target=flight.do, args=("konu", work), kwargs={"progress": seen["waiter"].append})
+    waiter.start()
+    while not flight._calls["konu"].listeners[1:]:
+        time.sleep(0.01)
+    joined.set()
+    leader.join()
+    waiter.join()
+
+    assert seen["leader"] == ["search", "plan", "save"]
+    # Sonradan katılan o anki aşamayı hemen, sonrakileri geldikçe alır
+    assert seen["waiter"] == ["plan", "save"]
+
+
+def test_progress_is_not_passed_unless_requested(tmp_path):
+    flight = SingleFlight("test", lock_dir=str(tmp_path))
+    assert flight.do("konu", lambda *args, **kwargs: kwargs) == {}
+    assert flight.do("konu", lambda **kwargs: kwargs["progress"] is not None, progress=None)
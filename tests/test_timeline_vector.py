@@ -0,0 +1,31 @@
+import pytest
+
+from utils import timeline_vector, ai_pdf_generator
+
+
+TURKISH_STEPS = ["Oran ve orantı", "Işık hızı ölçümü", "Üslü sayılarla çalışma"]
+MATH_STEPS = ["Köklü sayılar: √2 ve π", "Eşitsizlikler (x ≤ 4)"]
+
+
+def test_turkish_steps_use_vector_font():
+    assert timeline_vector.can_encode(TURKISH_STEPS)
+    data = timeline_vector.render_pdf(TURKISH_STEPS)
+    assert data.startswith(b"%PDF-") and b"Helvetica-Bold" in data
+
+
+def test_math_symbols_are_not_replaced_with_question_marks():
+    assert not timeline_vector.can_encode(MATH_STEPS)
+    with pytest.raises(UnicodeEncodeError):
+        timeline_vector.render_pdf(MATH_STEPS)
+
+
+def test_non_cp1254_steps_fall_back_to_matplotlib(tmp_path, monkeypatch):
+    pytest.importorskip("matplotlib")
+    monkeypatch.setattr(ai_pdf_generator, "TIMELINE_RENDERER", "vector")
+    path = tmp_path / "roadmap.pdf"
+
+    ai_pdf_generator.create_timeline_pdf(MATH_STEPS, str(path))
+
+    data = path.read_bytes()
+    assert data.startswith(b"%PDF-")
+    assert b"Helvetica-Bold" not in data  # matplotlib kendi TrueType fontunu gömer
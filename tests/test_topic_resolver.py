@@ -0,0 +1,36 @@
+import pytest
+
+from utils.topic_resolver import TopicResolver
+
+
+@pytest.fixture(scope="module")
+def resolver():
+    return TopicResolver()
+
+
+@pytest.mark.parametrize("topic, key, method", [
+    ("Oran-Orantı", "oran orantı", "exact"),
+    ("oranlar", "oran orantı", "synonym"),
+    ("denklem çözümü", "denklem çözme", "synonym"),
+    ("kare köklü sayılar", "kareköklü sayılar", "fuzzy"),
+    ("fonksiyonlr", "fonksiyonlar", "fuzzy"),
+])
+def test_resolves_math_topics(resolver, topic, key, method):
+    result = resolver.resolve(topic)
+    assert (result.key, result.method) == (key, method)
+    assert result.skills
+
+
+# Tek bir ortak kelime konuyu matematik haritasına çekmemeli; bunlar çeviriye (LLM) gider
+@pytest.mark.parametrize("topic", [
+    "veri tabanı",
+    "veri yapıları",
+    "python veri analizi",
+    "karmaşık sayılar",
+    "rasyonel sayılar",
+    "ayrık matematik",
+])
+def test_single_shared_word_is_not_a_match(resolver, topic):
+    result = resolver.resolve(topic)
+    assert result.skills is None
+    assert result.method is None
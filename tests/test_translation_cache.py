@@ -0,0 +1,65 @@
+import time
+
+import pytest
+
+from utils import translation_cache
+from utils.disk_cache import DiskCache
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    cache = DiskCache("translations", path=str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setattr(translation_cache, "_cache", cache)
+    return cache
+
+
+class Flaky:
+    """İlk `failures` çağrıda hata fırlatan çevirmen."""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.calls = []
+
+    def __call__(self, text):
+        self.calls.append(text)
+        if len(self.calls) <= self.failures:
+            raise ConnectionError("servis yok")
+        return text.split()[0]
+
+
+def test_negative_entry_expires_and_is_retried(monkeypatch):
+    monkeypatch.setattr(translation_cache, "NEGATIVE_TTL", 0.2)
+    translate = Flaky(failures=1)
+
+    assert translation_cache.cached_translation("Python Programlama", translate) == "Python Programlama"
+    # Negatif kayıt süresince servis tekrar çağrılmaz
+    assert translation_cache.cached_translation("python programlama", translate) == "python programlama"
+    assert len(translate.calls) == 1
+
+    time.sleep(0.3)
+    assert translation_cache.cached_translation("Python Programlama", translate) == "Python"
+    assert len(translate.calls) == 2
+    assert translation_cache.cached_translation("Python Programlama", translate) == "Python"
+    assert len(translate.calls) == 2
+
+
+def test_warm_up_counts_only_successes_and_keeps_stats(cache):
+    translate = Flaky(failures=1)
+
+    assert translation_cache.warm_up(["Graf Teorisi", "Dinamik Programlama", "Sayılar Teorisi"], translate) == 2
+    assert cache.stats() == {"hits": 0, "misses": 0, "entries": 3}
+
+    # Mevcut (negatif dahil) kayıtlar yeniden çevrilmez
+    assert translation_cache.warm_up(["graf teorisi", "Dinamik Programlama"], translate) == 0
+    assert len(translate.calls) == 3
+    assert cache.stats()["hits"] == 0 and cache.stats()["misses"] == 0
+
+
+def test_warm_up_retries_an_expired_negative_entry(monkeypatch):
+    monkeypatch.setattr(translation_cache, "NEGATIVE_TTL", 0.2)
+    translate = Flaky(failures=1)
+
+    assert translation_cache.warm_up(["Graf Teorisi"], translate) == 0
+    time.sleep(0.3)
+    assert translation_cache.warm_up(["Graf Teorisi"], translate) == 1
+    assert translation_cache.cached_translation("Graf Teorisi", translate) == "Graf"
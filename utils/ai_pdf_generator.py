@@ -1,41 +1,48 @@
+import io
 import os
 import re
+import html
 import json
-import wikipedia
+import time
+import threading
 import requests
-import matplotlib
-
-
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-import numpy as np
-import pandas as pd
-from openai import OpenAI
-from weasyprint import HTML
-from weasyprint.text.fonts import FontConfiguration
-from jinja2 import Template
-from datetime import datetime
+import importlib
 from .sanitize import sanitize_filename
+from . import (artifact_cache, resource_cache, render_pool, timeline_vector, difficulty, dataset_store, metrics,
+               llm_gateway)
 from dotenv import load_dotenv
 import textwrap
-from youtubesearchpython import VideosSearch
-from duckduckgo_search import DDGS
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 
 load_dotenv()
 
 
-client = OpenAI(
-    base_url="https://api.groq.com/openai/v1",
-    api_key=os.getenv("GROQ_API_KEY")
-)
+# Ağır kütüphaneler (openai, pandas, WeasyPrint, matplotlib, arama istemcileri) modül açılışında değil,
+# ilk kullanıldıkları fonksiyonda yüklenir; sunucu hızlı açılır. Önceden yüklemek için: warm_up()
+# LLM çağrıları utils/llm_gateway.py üzerinden yapılır (ortak istemci, eşzamanlılık sınırı, yeniden deneme)
+AI_MODEL = llm_gateway.AI_MODEL
+# Plan üretimi için son tarih (sn); sıra bekleme ve yeniden denemeler dahil
+LLM_PLAN_TIMEOUT = float(os.getenv("LLM_PLAN_TIMEOUT", llm_gateway.LLM_TIMEOUT))
+# PDF şablonu veya yol haritası çizimi değiştiğinde artırılır (önbellek anahtarına girer)
+TEMPLATE_VERSION = "2"
+# Yol haritası çizicisi: "vector" (varsayılan, matplotlib'siz) veya "matplotlib"
+TIMELINE_RENDERER = os.getenv("TIMELINE_RENDERER", "vector")
+# Mobil hızlı yol: kısa istem ve küçük yanıt; PDF'ler yalnızca indirilmek istenince çizilir
+MOBILE_MAX_TOKENS = int(os.getenv("MOBILE_MAX_TOKENS", 400))
+MOBILE_LLM_TIMEOUT = float(os.getenv("MOBILE_LLM_TIMEOUT", 2.5))
+MOBILE_TEMPLATE_VERSION = "mobile-1"
+# Açıkken /generate yalnızca planı kaydeder; her PDF ilk indirildiğinde çizilir (render_deferred)
+DEFER_RENDER = os.getenv("PDF_DEFER_RENDER", "1") == "1"
+# /generate'in sırayla bildirdiği aşamalar (asenkron işler, SSE); ertelenmiş çizimde PDF aşamaları yoktur
+GENERATION_STAGES = ("search", "plan", "save") if DEFER_RENDER else ("search", "plan", "resources_pdf", "roadmap_pdf")
 
-AI_MODEL = "llama-3.3-70b-versatile"
 
+STEPS_MARKER = "===STEPS==="
 
-def get_ai_learning_plan_and_steps(topic, problems=None, guidance=None, duration=None):
+
+def build_plan_prompt(topic, problems=None, guidance=None, duration=None):
     # KİŞİSELLEŞTİRME MESAJI OLUŞTURMA
     # Eğer veri setinden (routes.py'den) veri geldiyse burası dolar
     personalization_note = ""
@@ -74,112 +81,482 @@ def get_ai_learning_plan_and_steps(topic, problems=None, guidance=None, duration
     Cevabın en altına ===STEPS=== ekleyip yol haritası adımlarını listele.
     """
 
-    # ... (AI çağırma ve PDF oluşturma kısımları aynı, önceki cevaptaki zengin prompt yapısını kullanıyor) ...
-    # Buradaki kodun kalanı önceki cevaptaki "generate_two_pdfs_hybrid" ile aynıdır.
-    # ÖNEMLİ OLAN: personalization_note kısmını eklememizdi.
+    return full_prompt
 
-    # Kodu kısaltmak için tekrar yazmıyorum, önceki cevaptaki logic aynen geçerli.
-    # Sadece full_prompt içine personalization_note eklediğinden emin ol.
 
-    try:
-        response = client.chat.completions.create(
-            model=AI_MODEL,
-            messages=[{"role": "user", "content": full_prompt}],
-            temperature=0.5
-        )
-        content = response.choices[0].message.content
-        # ... Regex işlemleri aynı ...
-        plan_match = re.search(r"(.*?)===STEPS===", content, re.S)
-        steps_match = re.search(r"===STEPS===\s*(.*)", content, re.S)
+def parse_plan_content(content):
+    """Model çıktısını ===STEPS=== işaretinden plan HTML'i ve adım listesi olarak ayırır."""
+    plan_match = re.search(r"(.*?)===STEPS===", content, re.S)
+    steps_match = re.search(r"===STEPS===\s*(.*)", content, re.S)
 
-        plan_html = plan_match.group(1).strip() if plan_match else content.replace("===STEPS===", "")
-        steps = steps_match.group(1).strip().split("\n") if steps_match else []
+    plan_html = plan_match.group(1).strip() if plan_match else content.replace(STEPS_MARKER, "")
+    steps = steps_match.group(1).strip().split("\n") if steps_match else []
 
-        return plan_html, steps
-    except Exception as e:
-        return f"<p>Hata: {e}</p>", []
+    return plan_html, steps
 
 
+def get_ai_learning_plan_and_steps(topic, problems=None, guidance=None, duration=None, deadline=None):
+    """
+    Planı tek çağrıda üretir ve (plan_html, steps) döndürür.
+    LLM hatasında llm_gateway.LLMError / LLMUnavailable fırlatır; hata metni PDF'e yazılmaz.
+    """
+    full_prompt = build_plan_prompt(topic, problems, guidance, duration)
+    content, _ = llm_gateway.chat(
+        [{"role": "user", "content": full_prompt}],
+        kind="plan",
+        timeout=LLM_PLAN_TIMEOUT,
+        deadline=deadline,
+        temperature=0.5
+    )
+    return parse_plan_content(content)
 
-def export_resources_pdf(topic, ai_plan_html, filename, duration=None):
-    subtitle = f"Hedef Süre: {duration}" if duration else "Kapsamlı Öğrenme Rehberi"
-
-    html_template = """
-    <html>
-    <head>
-        <style>
-            @page { margin: 2cm; }
-            body { font-family: 'Helvetica', sans-serif; line-height: 1.6; color: #333; }
-            h1 { color: #2c3e50; border-bottom: 2px solid #3498db; padding-bottom: 10px; }
-            h3 { color: #e67e22; margin-top: 25px; border-left: 5px solid #e67e22; padding-left: 10px; }
-            table { width: 100%; border-collapse: collapse; margin-top: 15px; font-size: 0.9em; }
-            th, td { border: 1px solid #ddd; padding: 12px; text-align: left; }
-            th { background-color: #f2f2f2; color: #2c3e50; }
-            tr:nth-child(even) { background-color: #f9f9f9; }
-            a { color: #2980b9; text-decoration: none; font-weight: bold; }
-            ul { margin-top: 0; }
-            .meta { font-size: 0.8em; color: #777; margin-bottom: 30px; }
-        </style>
-    </head>
-    <body>
-        <h1>Öğrenme Planı: {{ topic }}</h1>
-        <div class="meta">
-            <strong>Tarih:</strong> {{ date }} <br>
-            <strong>Program Türü:</strong> {{ subtitle }}
-        </div>
-
-        {{ ai_plan | safe }}
-
-    </body>
-    </html>
-    """
-
-    template = Template(html_template)
-    rendered_html = template.render(
-        topic=topic,
-        subtitle=subtitle,
-        date=datetime.today().strftime("%d.%m.%Y"),
-        ai_plan=ai_plan_html
+
+def build_mobile_prompt(topic, problems=None, duration=None):
+    """Mobil için kısa istem: HTML yok, birkaç cümlelik özet ve kısa adım listesi."""
+    scenario = f"'{duration}' sürede bitirilecek." if duration else "Başlangıçtan ileri seviyeye."
+    weak = f" Öğrenci şu problemlerde zayıf: {', '.join(map(str, problems[:5]))}." if problems else ""
+    return (
+        f"Sen uzman bir eğitim koçusun. Konu: {topic}. {scenario}{weak}\n"
+        "Mobil ekran için KISA yanıt ver, HTML kullanma. Önce en fazla 3 cümlelik düz metin özet yaz, "
+        f"sonra {STEPS_MARKER} satırını ekleyip 5-7 adımı her satıra bir adım olacak şekilde listele."
+    )
+
+
+def get_mobile_plan(topic, problems=None, duration=None, deadline=None):
+    """Kısa planı üretir ve (özet, adımlar) döndürür; LLM hatasında LLMError / LLMUnavailable fırlatır."""
+    content, _ = llm_gateway.chat(
+        [{"role": "user", "content": build_mobile_prompt(topic, problems, duration)}],
+        kind="mobile_plan",
+        timeout=MOBILE_LLM_TIMEOUT,
+        deadline=deadline,
+        max_tokens=MOBILE_MAX_TOKENS,
+        temperature=0.4
     )
+    summary, steps = parse_plan_content(content)
+    # Madde işaretleri ve numaralar istemcide gösterilir
+    steps = [re.sub(r"^\s*(?:[-*•]|\d+[.)])\s*", "", step).strip() for step in steps]
+    return summary, [step for step in steps if step]
+
+
+def mobile_plan_html(topic, summary, steps, resources):
+    """Mobil planın (istenirse çizilen) kaynaklar PDF'i için HTML gövdesi."""
+    parts = [f"<h2>{html.escape(topic)}</h2>", f"<p>{html.escape(summary)}</p>", "<h3>Adımlar</h3>", "<ol>"]
+    parts += [f"<li>{html.escape(step)}</li>" for step in steps]
+    parts += ["</ol>", "<h3>Kaynak Önerileri</h3>", "<ul>"]
+    for category, items in resources.items():
+        for item in items:
+            parts.append(f'<li>{html.escape(category)}: <a href="{html.escape(item.get("url", ""))}">'
+                         f'{html.escape(item.get("title", ""))}</a></li>')
+    parts.append("</ul>")
+    return "\n".join(parts)
+
+
+class StepsSplitter:
+    """
+    Parça parça gelen model çıktısında ===STEPS=== sınırını bulur.
+    feed() yalnızca kesin olarak plana ait olan metni döndürür: işaretin parçası
+    olabilecek son birkaç karakter bir sonraki parçaya kadar bekletilir.
+    """
 
+    def __init__(self, marker=STEPS_MARKER):
+        self.marker = marker
+        self.in_steps = False
+        self._pending = ""
+
+    def feed(self, text):
+        if self.in_steps:
+            return ""
+        self._pending += text
+        index = self._pending.find(self.marker)
+        if index >= 0:
+            self.in_steps = True
+            plan, self._pending = self._pending[:index], ""
+            return plan
+
+        keep = len(self.marker) - 1
+        # Bekletilecek kuyruk: sonu işaretin bir önekiyle biten en uzun parça
+        for size in range(min(keep, len(self._pending)), 0, -1):
+            if self.marker.startswith(self._pending[-size:]):
+                plan, self._pending = self._pending[:-size], self._pending[-size:]
+                return plan
+        plan, self._pending = self._pending, ""
+        return plan
+
+    def finish(self):
+        plan, self._pending = ("" if self.in_steps else self._pending), ""
+        return plan
+
+
+def stream_ai_learning_plan(topic, problems=None, guidance=None, duration=None, deadline=None):
+    """
+    Planı akış (stream=True) olarak üretir.
+    ('plan', html_parcasi) olaylarını geldikçe, en sonda ('done', (plan_html, steps)) olayını verir.
+    Sonuç, get_ai_learning_plan_and_steps ile aynı ayrıştırmadan geçer.
+    Akış hiç başlamadan gelen LLM hatası fırlatılır; yarıda kesilirse o ana kadarki plan kullanılır.
+    """
+    full_prompt = build_plan_prompt(topic, problems, guidance, duration)
+    splitter = StepsSplitter()
+    content = []
+    start = time.perf_counter()
+    status = "ok"
+
+    try:
+        stream = llm_gateway.stream_chat(
+            [{"role": "user", "content": full_prompt}],
+            kind="stream",
+            timeout=LLM_PLAN_TIMEOUT,
+            deadline=deadline,
+            temperature=0.5
+        )
+        for delta in stream:
+            if not content:
+                metrics.LLM_FIRST_TOKEN.observe(time.perf_counter() - start, kind="plan")
+            content.append(delta)
+            plan_part = splitter.feed(delta)
+            if plan_part:
+                yield "plan", plan_part
+    except llm_gateway.LLMError as e:
+        status = "error"
+        if not content:
+            metrics.observe_stage("llm", time.perf_counter() - start, "stream", status)
+            raise
+        print(f"Plan akışı yarıda kesildi: {e}")
+
+    metrics.observe_stage("llm", time.perf_counter() - start, "stream", status)
+    rest = splitter.finish()
+    if rest:
+        yield "plan", rest
+    yield "done", parse_plan_content("".join(content))
+
+
+
+def export_resources_pdf(topic, ai_plan_html, filename, duration=None):
+    """Kaynak PDF'ini yazar; hata fırlatmaz, başarıyı döndürür (çizim metrikleri buna göre 'error' sayar)."""
     try:
-        font_config = FontConfiguration()
-        HTML(string=rendered_html).write_pdf(filename, font_config=font_config)
+        from . import pdf_renderer
+        pdf_renderer.get_renderer().write_resources_pdf(topic, ai_plan_html, filename, duration)
+        return True
     except Exception as e:
         print(f"PDF oluşturma hatası: {e}")
+        return False
 
 
-def generate_two_pdfs_hybrid(user_input, df_with_skills, output_dir="outputs", duration=None):
-    safe_topic = sanitize_filename(user_input)
-    if not os.path.exists(output_dir): os.makedirs(output_dir)
+def analyze_difficulty(rows, k=5):
+    """
+    Eşleşen satırlardan öğrencinin en çok zorlandığı (ortalama doğruluğu en düşük) k problemi bulur.
+    rows: satır sözlükleri üreten bir akış (generator) veya DataFrame; satırlar biriktirilmeden toplanır.
+    """
+    if rows is None:
+        return []
+    if hasattr(rows, "to_dict"):  # DataFrame (eski çağıranlar)
+        rows = rows.to_dict("records")
 
-    problems = []
     # VERİ ANALİZİ (Hibrit Kısım)
-    if not df_with_skills.empty:
+    aggregator = difficulty.DifficultyAggregator()
+    try:
+        aggregator.feed(rows)
+    except Exception as e:
+        # Akış yarıda kesilirse o ana kadar okunan satırlarla devam edilir
+        print(f"Veri analizi yarıda kesildi: {e}")
+
+    problems = aggregator.weakest(k)
+    if problems:
+        print(f" Veri Analizi Sonucu ({aggregator.rows} satır): Öğrenci {problems} konularında zayıf.")
+    return problems
+
+
+def find_weak_problems(rows, skills=None, k=5):
+    """
+    Konunun beceri kodları biliniyorsa (USER_TOPIC_MAP, utils/topic_resolver.py) zayıf problemler tüm veri setinden önceden
+    hesaplanmış zorluk tablolarından okunur; satır akışına hiç dokunulmaz.
+    Tablo yoksa veya beceri bulunamazsa eşleşen satırlar analyze_difficulty ile toplanır.
+    """
+    if skills:
+        store = dataset_store.get_store()
+        if store is not None:
+            try:
+                problems = store.weakest_problems(skills, k)
+                if problems:
+                    print(f" Zorluk Tablosu ({store.version}): Öğrenci {problems} konularında zayıf.")
+                    return problems
+            except Exception as e:
+                print(f"Zorluk tablosu okunamadı: {e}")
+    return analyze_difficulty(rows, k)
+
+
+def plan_cache_key(user_input, duration, problems):
+    return artifact_cache.cache_key(user_input, duration, problems, AI_MODEL, TEMPLATE_VERSION)
+
+
+def generate_mobile_plan(user_input, problems, output_dir="outputs", duration=None):
+    """
+    Mobil hızlı yol: kısa plan (özet + adımlar) ve kaynaklar paralel, kısa süre sınırlarıyla alınır.
+    PDF çizilmez; plan önbelleğe yazılır ve PDF'ler ilk indirmede render_deferred ile çizilir.
+    Dosya kökü ve yapılandırılmış sonucu içeren manifest'i döndürür.
+    """
+    if not os.path.exists(output_dir): os.makedirs(output_dir)
+    key = artifact_cache.cache_key(user_input, duration, problems, AI_MODEL, MOBILE_TEMPLATE_VERSION)
+
+    resources_future = metrics.submit(_mobile_pool, get_real_resources_with_status, user_input,
+                                      MOBILE_RESOURCE_DEADLINE)
+    cached = artifact_cache.lookup(output_dir, key)
+    if cached:
+        print(f" Önbellekten döndürüldü (mobil): {cached['stem']}")
+        summary, steps = cached["summary"], cached["steps"]
+    else:
         try:
-            # Correct sütununu sayıya çevir
-            df_with_skills["correct"] = pd.to_numeric(df_with_skills["correct"], errors='coerce')
-            # En çok yanlış yapılan problem ID'lerini bul
-            difficulty = df_with_skills.groupby("problem_id")["correct"].mean()
-            problems = difficulty.sort_values().head(5).index.tolist()
-            print(f" Veri Analizi Sonucu: Öğrenci {problems} konularında zayıf.")
-        except:
-            pass
+            summary, steps = get_mobile_plan(user_input, problems, duration)
+        except BaseException:
+            resources_future.cancel()
+            raise
+    resources, _ = resources_future.result()
+
+    if cached:
+        return dict(cached, resources=resources)
+
+    manifest = artifact_cache.store(output_dir, key, {
+        "stem": artifact_cache.artifact_stem(sanitize_filename(user_input), key),
+        "topic": user_input,
+        "duration": duration,
+        "problems": [str(p) for p in problems or []],
+        "summary": summary,
+        "plan_html": mobile_plan_html(user_input, summary, steps, resources),
+        "steps": steps,
+        "files": []
+    })
+    return dict(manifest, resources=resources)
+
+
+def deferred_task(output_dir, manifest, filename):
+    """
+    Kaydın istenen belgesi (<kök>_resources.pdf / <kök>_roadmap.pdf) için çizim havuzu görevi;
+    kayıt bu belgeyi üretemiyorsa (ör. adımsız planın yol haritası) None.
+    """
+    path = os.path.join(output_dir, filename)
+    if filename == f"{manifest['stem']}_resources.pdf":
+        return ("resources_pdf", "resources", path, (manifest["topic"], manifest["plan_html"], manifest.get("duration")))
+    if filename == f"{manifest['stem']}_roadmap.pdf" and manifest.get("steps"):
+        return ("roadmap_pdf", "timeline", path, (manifest["steps"],))
+    return None
+
+
+def render_deferred_many(output_dir, pending):
+    """
+    pending: [(manifest, dosya adı)]. Tüm belgeleri tek render_all çağrısıyla (havuzda paralel) çizer,
+    manifest'lere ekler ve başarıyla çizilen dosya adlarının kümesini döndürür.
+    """
+    tasks, owners = [], {}
+    for manifest, filename in pending:
+        task = deferred_task(output_dir, manifest, filename)
+        if task is not None:
+            tasks.append(task)
+            owners[task[2]] = manifest["key"]
+    if not tasks:
+        return set()
+
+    done = {}
+    for path, ok in render_pool.render_all(tasks).items():
+        if ok:
+            done.setdefault(owners[path], []).append(os.path.basename(path))
+    for key, filenames in done.items():
+        artifact_cache.add_files(output_dir, key, filenames)
+    return {filename for filenames in done.values() for filename in filenames}
+
+
+def render_deferred(output_dir, manifest, filename):
+    """
+    Yalnızca planı kaydedilmiş kaydın istenen belgesini çizer ve manifest'e ekler; başarılıysa True.
+    Eşzamanlı ilk indirmelere karşı kilitleme çağıranın işidir.
+    """
+    return filename in render_deferred_many(output_dir, [(manifest, filename)])
+
+
+def save_plan(user_input, ai_plan_html, steps, key, problems, output_dir="outputs", duration=None, progress=None):
+    """
+    Planı tamamlar ve dosya kökünü döndürür. DEFER_RENDER açıkken yalnızca plan HTML'i ve adımlar
+    kaydedilir (PDF'ler ilk indirmede çizilir), kapalıyken iki PDF hemen çizilir (render_plan_pdfs).
+    """
+    if not DEFER_RENDER:
+        return render_plan_pdfs(user_input, ai_plan_html, steps, key, problems, output_dir, duration, progress)
+
+    if progress:
+        progress("save")
+    stem = artifact_cache.artifact_stem(sanitize_filename(user_input), key)
+    artifact_cache.store(output_dir, key, {
+        "stem": stem,
+        "topic": user_input,
+        "duration": duration,
+        "problems": [str(p) for p in problems or []],
+        "plan_html": ai_plan_html,
+        "steps": steps,
+        "files": []
+    })
+    return stem
+
+
+def is_complete(manifest):
+    """Önbellek isabeti sayılır mı: adımsız (yol haritası çizilemeyen) planlar yeniden üretilir."""
+    return bool(manifest and manifest.get("steps"))
+
+
+def generate_two_pdfs_hybrid(user_input, rows, output_dir="outputs", duration=None, progress=None, skills=None,
+                             problems=None):
+    """
+    Planı üretir ve dosya kökünü (stem) döndürür; PDF'ler DEFER_RENDER açıkken ilk indirmede çizilir.
+    rows: eşleşen veri seti satırlarının akışı, skills: konunun beceri kodları (varsa);
+    zayıf problemler bunlardan find_weak_problems ile bulunur. problems verilirse (toplu üretimde
+    önceden hesaplanmış) analiz atlanır.
+    progress verilirse her aşamanın başında aşama adıyla çağrılır (GENERATION_STAGES: 'plan', ardından
+    ertelenmiş çizimde 'save', değilse 'resources_pdf', 'roadmap_pdf'); asenkron işler bunu durum bildirmek için kullanır.
+    """
+    report = progress or (lambda stage: None)
+    if not os.path.exists(output_dir): os.makedirs(output_dir)
+
+    if problems is None:
+        with metrics.span("difficulty"):
+            problems = find_weak_problems(rows, skills)
+
+    # Aynı konu/süre/zayıf problemler için daha önce üretilmiş çıktılar varsa tekrar üretme
+    key = plan_cache_key(user_input, duration, problems)
+    cached = artifact_cache.lookup(output_dir, key)
+    if is_complete(cached):
+        print(f" Önbellekten döndürüldü: {cached['stem']}")
+        return cached["stem"]
 
     # Analiz sonuçlarını (problems) AI'ya gönder
+    report("plan")
     ai_plan_html, steps = get_ai_learning_plan_and_steps(user_input, problems, None, duration)
 
-    export_resources_pdf(user_input, ai_plan_html, os.path.join(output_dir, f"{safe_topic}_resources.pdf"), duration)
+    return save_plan(user_input, ai_plan_html, steps, key, problems, output_dir, duration, progress)
+
+
+def render_plan_pdfs(user_input, ai_plan_html, steps, key, problems, output_dir="outputs", duration=None,
+                     progress=None):
+    """Hazır plandan iki PDF'i üretir, eksiksizse önbelleğe yazar ve dosya kökünü döndürür."""
+    report = progress or (lambda stage: None)
+    if not os.path.exists(output_dir): os.makedirs(output_dir)
+
+    stem = artifact_cache.artifact_stem(sanitize_filename(user_input), key)
+    resources_name = f"{stem}_resources.pdf"
+    roadmap_name = f"{stem}_roadmap.pdf"
+
+    # İki belge (WeasyPrint + zaman çizelgesi) çizim havuzunda paralel üretilir
+    tasks = [("resources_pdf", "resources", os.path.join(output_dir, resources_name), (user_input, ai_plan_html, duration))]
     if steps:
-        create_timeline_pdf(steps, os.path.join(output_dir, f"{safe_topic}_roadmap.pdf"))
+        tasks.append(("roadmap_pdf", "timeline", os.path.join(output_dir, roadmap_name), (steps,)))
+    rendered = render_pool.render_all(tasks, progress=report)
+    files = [os.path.basename(path) for path, ok in rendered.items() if ok]
+
+    # Sadece eksiksiz üretilen (plan adımları ve iki PDF'i olan) sonuçlar önbelleğe alınır
+    if steps and len(files) == 2:
+        artifact_cache.store(output_dir, key, {
+            "stem": stem,
+            "topic": user_input,
+            "duration": duration,
+            "problems": [str(p) for p in problems],
+            "plan_html": ai_plan_html,
+            "steps": steps,
+            "files": files
+        })
+    else:
+        artifact_cache.maybe_evict(output_dir)
+
+    return stem
+
 
-    return safe_topic
+def render_atomic(render, path):
+    """
+    Önce geçici bir dosyaya yazar, sonra os.replace ile yerine koyar;
+    aynı anda indirilen dosya hiçbir zaman yarım görünmez.
+    """
+    directory, name = os.path.split(path)
+    tmp = os.path.join(directory, f".{os.getpid()}-{threading.get_ident()}-{name}")
+    # render False dönerse (export_resources_pdf hatası) yarım kalmış geçici dosya yerine konmaz
+    if render(tmp) is False or not os.path.exists(tmp):
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        return False
+    os.replace(tmp, path)
+    return True
 
 
 
+def warm_up_renderers():
+    """Font ve yol haritası çizici önbelleklerini doldurmak için küçük birer belge çizer (çizim worker'ı açılışı)."""
+    try:
+        from . import pdf_renderer
+        pdf_renderer.get_renderer().warm_up()
+        if TIMELINE_RENDERER == "vector":
+            timeline_vector.render_pdf(["Öğrenme"])
+            return
+        plt = _pyplot()
+        fig, ax = plt.subplots(figsize=(1, 1))
+        ax.text(0, 0, "Öğrenme")
+        fig.savefig(io.BytesIO(), format="pdf")
+        plt.close(fig)
+    except Exception as e:
+        print(f"Çizim ısınma hatası: {e}")
+
+
+# Önceden yüklenebilen ağır modüller (warm_up)
+HEAVY_MODULES = ("openai", "pandas", "numpy", "utils.pdf_renderer", "youtubesearchpython", "duckduckgo_search")
+
+
+def warm_up():
+    """
+    Ağır modülleri şimdi yükler ve modül başına süreyi (sn) döndürür; yüklenemeyen modül None olur.
+    Thread/süreç başlatmaz, bu yüzden fork öncesi (gunicorn master) çağrılması güvenlidir.
+    """
+    modules = HEAVY_MODULES + (("matplotlib.pyplot",) if TIMELINE_RENDERER != "vector" else ())
+    timings = {}
+    for name in modules:
+        start = time.perf_counter()
+        try:
+            if name == "matplotlib.pyplot":
+                _pyplot()
+            else:
+                importlib.import_module(name)
+            timings[name] = round(time.perf_counter() - start, 3)
+        except Exception as e:
+            print(f"Isınma: {name} yüklenemedi: {e}")
+            timings[name] = None
+    return timings
+
+
 # --- Timeline PDF ---
 def create_timeline_pdf(steps, filename):
+    """
+    Yol haritası PDF'ini çizer. Varsayılan vektör çizici pyplot'un global durumunu kullanmaz,
+    bu yüzden aynı süreçte birden çok thread'den güvenle çağrılabilir.
+    Adımlarda vektör çizicinin fontuyla (cp1254) yazılamayan karakterler (√, π, ≤ ...) varsa veya
+    vektör çizimde hata olursa matplotlib sürümüne dönülür.
+    """
+    directory = os.path.dirname(filename)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    if TIMELINE_RENDERER == "vector" and timeline_vector.can_encode(steps):
+        try:
+            timeline_vector.write_pdf(steps, filename)
+            return
+        except Exception as e:
+            print(f"Vektör timeline hatası, matplotlib'e dönülüyor: {e}")
+
+    _create_timeline_pdf_matplotlib(steps, filename)
+
+
+def _pyplot():
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def _create_timeline_pdf_matplotlib(steps, filename):
     try:
+        import numpy as np
+        import matplotlib.patches as mpatches
+        plt = _pyplot()
         num_steps = len(steps)
 
 
@@ -238,19 +615,51 @@ def create_timeline_pdf(steps, filename):
 
 
 
-try:
-    wikipedia.set_lang("tr")
-except:
-    pass
+WIKIPEDIA_API_URL = os.getenv("WIKIPEDIA_API_URL", "https://tr.wikipedia.org/w/api.php")
+HTTP_HEADERS = {"User-Agent": "ogrenmeHaritasi/1.0 (egitim platformu)"}
 
+# Kaynak sağlayıcı süre sınırları (saniye)
+PROVIDER_TIMEOUTS = {
+    "Wikipedia": float(os.getenv("RESOURCE_TIMEOUT_WIKIPEDIA", 3)),
+    "Videos": float(os.getenv("RESOURCE_TIMEOUT_VIDEOS", 4)),
+    "Articles": float(os.getenv("RESOURCE_TIMEOUT_ARTICLES", 4))
+}
+RESOURCE_DEADLINE = float(os.getenv("RESOURCE_DEADLINE", 5))
+# Mobilde yanıta yetişmeyen sağlayıcılar atlanır (önbelleğe yine yazılır, sonraki istek kullanır)
+MOBILE_RESOURCE_DEADLINE = float(os.getenv("MOBILE_RESOURCE_DEADLINE", 1.5))
 
-def get_wikipedia_summary(topic):
-    try:
-        summary = wikipedia.summary(topic, sentences=2)
-        page = wikipedia.page(topic)
-        return {"title": page.title, "summary": summary, "url": page.url}
-    except:
+# Sağlayıcılar bu ortak havuzda paralel çalışır; süresi dolan çağrı yanıtı bekletmez
+_provider_pool = ThreadPoolExecutor(max_workers=int(os.getenv("RESOURCE_WORKERS", 8)),
+                                    thread_name_prefix="resource")
+# Mobilde kaynak araması plan üretimiyle paralel yürür (sağlayıcı havuzunu beklediği için ayrı havuz)
+_mobile_pool = ThreadPoolExecutor(max_workers=int(os.getenv("MOBILE_WORKERS", 4)), thread_name_prefix="mobile")
+
+
+def _fetch_wikipedia(topic, timeout=PROVIDER_TIMEOUTS["Wikipedia"]):
+    """
+    Arama + özet + sayfa adresini tek bir MediaWiki API isteğiyle alır
+    (generator=search ile en iyi eşleşen sayfanın girişi ve URL'si).
+    """
+    response = requests.get(WIKIPEDIA_API_URL, params={
+        "action": "query",
+        "format": "json",
+        "formatversion": 2,
+        "generator": "search",
+        "gsrsearch": topic,
+        "gsrlimit": 1,
+        "prop": "extracts|info",
+        "exintro": 1,
+        "explaintext": 1,
+        "exsentences": 2,
+        "inprop": "url",
+        "redirects": 1
+    }, headers=HTTP_HEADERS, timeout=timeout)
+    response.raise_for_status()
+    pages = response.json().get("query", {}).get("pages", [])
+    if not pages or not pages[0].get("extract"):
         return None
+    page = pages[0]
+    return {"title": page["title"], "summary": page["extract"], "url": page["fullurl"]}
 
 
 def is_safe_language(text):
@@ -270,7 +679,8 @@ def is_safe_language(text):
     return True
 
 
-def get_real_resources(topic):
+def get_real_resources_with_status(topic, deadline=RESOURCE_DEADLINE):
+    """Kaynakları ve sağlayıcı başına durum bayraklarını (ok/empty/timeout/error) döndürür."""
     results = {
         "Wikipedia": [],
         "Videos": [],
@@ -324,70 +734,168 @@ def get_real_resources(topic):
     })
 
     # ---------------------------------------------------------
-    # 2. DİNAMİK ARAMA (Filtreli)
+    # 2. DİNAMİK ARAMA (Filtreli, paralel)
     # ---------------------------------------------------------
+    dynamic, status = _run_providers(topic, deadline=deadline)
+    for category, items in dynamic.items():
+        results[category].extend(items)
 
-    # WIKIPEDIA
-    wiki_data = get_wikipedia_summary(topic)
-    if wiki_data: results["Wikipedia"].append(wiki_data)
+    return results, status
 
-    # YOUTUBE (Video Arama)
-    try:
-        # Aramayı özelleştir: "Konu + ders anlatımı türkçe"
-        search_query = f"{topic} ders anlatımı türkçe"
-        print(f"🎥 Youtube aranıyor: {search_query}")
-
-        videos_search = VideosSearch(search_query, limit=3)
-        videos_result = videos_search.result()
-
-        for video in videos_result['result']:
-            # Başlıkta Çince var mı kontrol et
-            if is_safe_language(video['title']):
-                results["Videos"].append({
-                    "title": video['title'],
-                    "url": video['link'],
-                    "desc": f"Kanal: {video['channel']['name']} | {video.get('duration', '')}",
-                    "thumbnail": video['thumbnails'][0]['url']
-                })
-    except Exception as e:
-        print(f"Youtube Hatası: {e}")
 
+def _search_wikipedia(topic):
+    wiki_data = _fetch_wikipedia(topic)
+    return [wiki_data] if wiki_data else []
+
+
+def _search_videos(topic):
+    # Aramayı özelleştir: "Konu + ders anlatımı türkçe"
+    from youtubesearchpython import VideosSearch
+
+    search_query = f"{topic} ders anlatımı türkçe"
+    print(f"🎥 Youtube aranıyor: {search_query}")
+
+    videos = []
+    # Varsayılan timeout=None ağ çağrısını süresiz bekletir; süre sınırı aşılınca httpx.TimeoutException
+    # yükselir ve havuz thread'i serbest kalır (durum: timeout)
+    videos_search = VideosSearch(search_query, limit=3, timeout=PROVIDER_TIMEOUTS["Videos"])
+    videos_result = videos_search.result()
+
+    for video in videos_result['result']:
+        # Başlıkta Çince var mı kontrol et
+        if is_safe_language(video['title']):
+            videos.append({
+                "title": video['title'],
+                "url": video['link'],
+                "desc": f"Kanal: {video['channel']['name']} | {video.get('duration', '')}",
+                "thumbnail": video['thumbnails'][0]['url']
+            })
+    return videos
+
+
+def _search_articles(topic):
     # WEB MAKALELERİ (DuckDuckGo - Sıkı Filtreli)
-    try:
-        # Aramayı eğitim odaklı yapıyoruz: "Konu + nedir + konu anlatımı"
-        web_query = f"{topic} konu anlatımı ders notları nedir"
-        print(f"🌍 Web aranıyor: {web_query}")
+    # Aramayı eğitim odaklı yapıyoruz: "Konu + nedir + konu anlatımı"
+    web_query = f"{topic} konu anlatımı ders notları nedir"
+    print(f"🌍 Web aranıyor: {web_query}")
 
-        with DDGS() as ddgs:
-            # Türkiye bölgesi, Güvenli Arama Açık
-            ddg_results = list(ddgs.text(web_query, region='tr-tr', safesearch='on', max_results=4))
+    articles = []
+    from duckduckgo_search import DDGS
+    with DDGS(timeout=PROVIDER_TIMEOUTS["Articles"]) as ddgs:
+        # Türkiye bölgesi, Güvenli Arama Açık
+        ddg_results = list(ddgs.text(web_query, region='tr-tr', safesearch='on', max_results=4))
 
-            for res in ddg_results:
-                title = res['title']
-                body = res['body']
+        for res in ddg_results:
+            title = res['title']
+            body = res['body']
 
-                # --- FİLTRELEME MOTORU ---
-                # 1. W3Schools zaten eklediysek atla
-                if "w3schools" in res['href']: continue
+            # --- FİLTRELEME MOTORU ---
+            # 1. W3Schools zaten eklediysek atla
+            if "w3schools" in res['href']: continue
 
-                # 2. Çince/Yabancı karakter kontrolü (O-RAN sorunu için)
-                if not is_safe_language(title) or not is_safe_language(body):
-                    print(f"🚫 Yabancı kaynak engellendi: {title}")
-                    continue
+            # 2. Çince/Yabancı karakter kontrolü (O-RAN sorunu için)
+            if not is_safe_language(title) or not is_safe_language(body):
+                print(f"🚫 Yabancı kaynak engellendi: {title}")
+                continue
 
-                results["Articles"].append({
-                    "title": title,
-                    "url": res['href'],
-                    "desc": body[:100] + "..."
-                })
+            articles.append({
+                "title": title,
+                "url": res['href'],
+                "desc": body[:100] + "..."
+            })
+    return articles
+
+
+PROVIDERS = {
+    "Wikipedia": _search_wikipedia,
+    "Videos": _search_videos,
+    "Articles": _search_articles
+}
+
+
+def _is_safe_item(item):
+    return all(is_safe_language(item[field]) for field in ("title", "desc", "summary") if item.get(field))
 
-    except Exception as e:
-        print(f"Web Arama Hatası: {e}")
 
-    return results
+def _is_timeout(error):
+    """Ağ istemcilerinin süre aşımı hataları (requests/httpx/duckduckgo_search ... ortak ad kalıbı)."""
+    return isinstance(error, TimeoutError) or "Timeout" in type(error).__name__
 
 
-# Wrapper
-def get_ai_resources(topic):
-    return get_real_resources(topic)
+def _fetch_and_cache(name, provider, topic):
+    """Sağlayıcıyı çağırır ve sonucu önbelleğe yazar (süre sınırını aşsa bile, bir sonraki istek için)."""
+    with metrics.span("resource_provider", target=name):
+        items = provider(topic)
+    resource_cache.store(name, topic, items)
+    return items
 
+
+def _refresh_in_background(name, provider, topic):
+    if not resource_cache.claim_refresh(name, topic):
+        return
+
+    def refresh():
+        try:
+            _fetch_and_cache(name, provider, topic)
+        except Exception as e:
+            print(f"{name} arka plan yenileme hatası: {e}")
+        finally:
+            resource_cache.release_refresh(name, topic)
+
+    metrics.submit(_provider_pool, refresh)
+
+
+def _run_providers(topic, providers=None, deadline=RESOURCE_DEADLINE):
+    """
+    Önce önbelleğe bakar: taze kayıt doğrudan, bayat kayıt da hemen kullanılır
+    (ve arka planda yenilenir). Kalan sağlayıcılar aynı anda başlatılır; her biri kendi
+    süre sınırına, hepsi ortak bir son tarihe (deadline) tabidir, süresi dolan beklenmez.
+    Sonuçlar ve sağlayıcı başına durum ('ok', 'empty', 'cached', 'stale', 'timeout', 'error') döner.
+    """
+    providers = providers or PROVIDERS
+    start = time.monotonic()
+    global_deadline = start + deadline
+
+    results = {name: [] for name in providers}
+    status = {}
+    futures = {}
+
+    for name, provider in providers.items():
+        cached, freshness = resource_cache.lookup(name, topic)
+        if cached is not None:
+            # Önbellekteki sonuçlar da aynı dil filtresinden geçer
+            results[name] = [item for item in cached if _is_safe_item(item)]
+            status[name] = "cached" if freshness == "fresh" else "stale"
+            if freshness == "stale":
+                _refresh_in_background(name, provider, topic)
+            continue
+
+        future = metrics.submit(_provider_pool, _fetch_and_cache, name, provider, topic)
+        futures[future] = (name, min(start + PROVIDER_TIMEOUTS.get(name, deadline), global_deadline))
+
+    pending = set(futures)
+
+    while pending:
+        now = time.monotonic()
+        for future in [f for f in pending if futures[f][1] <= now]:
+            name = futures[future][0]
+            print(f"⏱️ {name} süre sınırını aştı, atlanıyor.")
+            status[name] = "timeout"
+            pending.discard(future)
+        if not pending:
+            break
+
+        done, pending = wait(pending, timeout=min(futures[f][1] for f in pending) - now,
+                             return_when=FIRST_COMPLETED)
+        for future in done:
+            name = futures[future][0]
+            try:
+                results[name] = future.result()
+                status[name] = "ok" if results[name] else "empty"
+            except Exception as e:
+                print(f"{name} Hatası: {e}")
+                status[name] = "timeout" if _is_timeout(e) else "error"
+
+    for name, state in status.items():
+        metrics.RESOURCE_STATUS.inc(provider=name, status=state)
+    return results, status
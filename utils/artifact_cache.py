@@ -0,0 +1,353 @@
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: yalnızca süreç içi kilit
+    fcntl = None
+
+
+ARTIFACT_TTL = int(os.getenv("ARTIFACT_CACHE_TTL", 24 * 60 * 60))
+ARTIFACT_MAX_BYTES = int(float(os.getenv("ARTIFACT_CACHE_MAX_MB", 500)) * 1024 * 1024)
+# Hiçbir kayda ait olmayan PDF'ler (eksik kalan üretimler, eski dosyalar) bu süreden sonra silinir
+ORPHAN_TTL = int(os.getenv("ARTIFACT_ORPHAN_TTL", 6 * 60 * 60))
+# Süreç başına en fazla bu aralıkla tam tarama (her store'da değil)
+EVICT_INTERVAL = int(os.getenv("ARTIFACT_EVICT_INTERVAL", 60))
+# Bundan yeni dosyalar bütçe için silinmez (çizimi veya indirilmesi sürüyor olabilir)
+MIN_AGE = 5 * 60
+MANIFEST_DIRNAME = ".cache"
+
+# İçerik adresli dosya adı: <konu>_<anahtarın ilk 16 hanesi>_<resources|roadmap>.pdf
+ARTIFACT_NAME = re.compile(r"_([0-9a-f]{16})_(resources|roadmap)\.pdf$")
+
+_last_evict = {}
+_stats = {"entries": 0, "bytes": 0, "orphans": 0, "evicted": 0}
+_etags = {}
+_lock = threading.Lock()
+# fcntl olmayan sistemlerde manifest oku-değiştir-yaz sırası (süreç içi); diğerlerinde _key_lock (flock)
+_manifest_lock = threading.Lock()
+
+
+def normalize(text):
+    return " ".join(str(text).casefold().split()) if text else ""
+
+
+def cache_key(topic, duration, problems, model, template_version):
+    """Aynı girdiler (konu, süre, zayıf problemler, model, şablon sürümü) aynı anahtarı üretir."""
+    payload = json.dumps({
+        "topic": normalize(topic),
+        "duration": normalize(duration),
+        "problems": [str(p) for p in (problems or [])],
+        "model": model,
+        "template": template_version
+    }, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def artifact_stem(safe_topic, key):
+    """Dosya adları içerik adreslidir: aynı anahtar her zaman aynı dosyalara gider."""
+    return f"{safe_topic}_{key[:16]}"
+
+
+def artifact_id(filename):
+    """İçerik adresli dosya adındaki anahtar öneki (manifest adı), değilse None."""
+    match = ARTIFACT_NAME.search(filename)
+    return match.group(1) if match else None
+
+
+def _manifest_path(output_dir, key):
+    # Dosya adlarındaki önekle aynı: indirilen dosyadan manifest'e doğrudan ulaşılır
+    return os.path.join(output_dir, MANIFEST_DIRNAME, f"{key[:16]}.json")
+
+
+def _read_manifest(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def lookup(output_dir, key, ttl=ARTIFACT_TTL):
+    """
+    Geçerli bir kayıt varsa manifest'i döndürür (plan_html, steps, stem, files).
+    Süresi dolmuş veya dosyaları silinmiş kayıtlar yok sayılır.
+    Okunan kaydın mtime'ı güncellenir; LRU sıralaması buna göre yapılır.
+    """
+    path = _manifest_path(output_dir, key)
+    manifest = _read_manifest(path)
+    if manifest is None or manifest.get("key") != key:
+        return None
+    if time.time() - manifest.get("created", 0) > ttl:
+        return None
+    if not all(os.path.exists(os.path.join(output_dir, name)) for name in manifest.get("files", [])):
+        return None
+
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return manifest
+
+
+def manifest_for(output_dir, filename, ttl=ARTIFACT_TTL):
+    """İçerik adresli dosya adının ait olduğu (süresi dolmamış) kaydın manifest'i, yoksa None."""
+    key = artifact_id(filename)
+    if key is None:
+        return None
+    manifest = _read_manifest(_manifest_path(output_dir, key))
+    if manifest is None or time.time() - manifest.get("created", 0) > ttl:
+        return None
+    if not ARTIFACT_NAME.sub("", filename) + f"_{key}" == manifest.get("stem"):
+        return None
+    return manifest
+
+
+def remaining_ttl(output_dir, filename, ttl=ARTIFACT_TTL):
+    """
+    Dosyanın kaydı süresi dolup silinene kadar kalan saniye (kayıt yoksa None). Aynı ad süre dolunca farklı
+    LLM çıktısıyla yeniden üretilebileceği için istemci önbelleği bundan uzun tutulmamalıdır.
+    """
+    manifest = manifest_for(output_dir, filename, ttl)
+    if manifest is None:
+        return None
+    return max(0, int(manifest.get("created", 0) + ttl - time.time()))
+
+
+def _sizes(output_dir, names):
+    sizes = {}
+    for name in names:
+        try:
+            sizes[name] = os.path.getsize(os.path.join(output_dir, name))
+        except OSError:
+            pass
+    return sizes
+
+
+def _write_manifest(output_dir, key, manifest):
+    os.makedirs(os.path.join(output_dir, MANIFEST_DIRNAME), exist_ok=True)
+    path = _manifest_path(output_dir, key)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+@contextmanager
+def _key_lock(output_dir, key):
+    """
+    Anahtarın manifest'i için süreçler (ve thread'ler) arası kilit: .cache/<anahtar>.lock üzerinde fcntl.flock.
+    Sahibi dosyayı bırakmadan önce siler; bekleyen, kilidi aldığı dosya yoldakiyle aynı değilse yenisini açar.
+    """
+    if fcntl is None:
+        with _manifest_lock:
+            yield
+        return
+    os.makedirs(os.path.join(output_dir, MANIFEST_DIRNAME), exist_ok=True)
+    path = os.path.join(output_dir, MANIFEST_DIRNAME, f"{key[:16]}.lock")
+    while True:
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(fd).st_ino == os.stat(path).st_ino:
+                break
+        except OSError:
+            pass
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+    try:
+        yield
+    finally:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+
+def store(output_dir, key, manifest):
+    """
+    Kaydı yazar. files boş olabilir: yalnızca planı kaydedilen sonuçların PDF'leri ilk indirmede çizilir
+    ve add_files ile eklenir.
+    """
+    manifest = dict(manifest, key=key, created=time.time(), sizes=_sizes(output_dir, manifest.get("files", [])))
+    with _key_lock(output_dir, key):
+        _write_manifest(output_dir, key, manifest)
+
+    maybe_evict(output_dir)
+    return manifest
+
+
+def add_files(output_dir, key, names):
+    """
+    Sonradan çizilen dosyaları kayda ekler (manifest yeniden okunur; oluşturulma zamanı değişmez).
+    Aynı kaydın iki PDF'i farklı worker'larda aynı anda çizilebilir; oku-birleştir-yaz anahtar kilidi altında yapılır,
+    yoksa son yazan diğerinin dosyasını düşürür ve sahipsiz kalan PDF temizlikte silinir.
+    """
+    with _key_lock(output_dir, key):
+        manifest = _read_manifest(_manifest_path(output_dir, key))
+        if manifest is None or manifest.get("key") != key:
+            return None
+        files = sorted(set(manifest.get("files", [])) | set(names))
+        manifest = dict(manifest, files=files, sizes=dict(manifest.get("sizes", {}), **_sizes(output_dir, names)))
+        _write_manifest(output_dir, key, manifest)
+    return manifest
+
+
+def touch(output_dir, filename):
+    """İndirmeyi erişim olarak kaydeder (manifest mtime'ı = son erişim, LRU buna göre)."""
+    key = artifact_id(filename)
+    if key is None:
+        return False
+    try:
+        os.utime(_manifest_path(output_dir, key))
+        return True
+    except OSError:
+        return False
+
+
+def etag(path):
+    """
+    Dosya içeriğinin sha256 özeti (güçlü ETag). Dosya (mtime, boyut) değişmedikçe
+    süreç içinde bir kez hesaplanır.
+    """
+    stat = os.stat(path)
+    version = (stat.st_mtime_ns, stat.st_size)
+    with _lock:
+        cached = _etags.get(path)
+    if cached and cached[0] == version:
+        return cached[1]
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    value = digest.hexdigest()[:32]
+    with _lock:
+        if len(_etags) > 4096:
+            _etags.clear()
+        _etags[path] = (version, value)
+    return value
+
+
+def stats():
+    with _lock:
+        return dict(_stats)
+
+
+def _remove(output_dir, manifest_path, manifest):
+    for name in (manifest or {}).get("files", []):
+        try:
+            os.remove(os.path.join(output_dir, name))
+        except OSError:
+            pass
+    if manifest_path is None:
+        return
+    try:
+        os.remove(manifest_path)
+    except OSError:
+        pass
+
+
+def maybe_evict(output_dir, interval=EVICT_INTERVAL):
+    """evict'i süreç başına en fazla `interval` saniyede bir çalıştırır."""
+    now = time.monotonic()
+    with _lock:
+        if now - _last_evict.get(output_dir, -interval) < interval:
+            return 0
+        _last_evict[output_dir] = now
+    return evict(output_dir)
+
+
+def evict(output_dir, ttl=ARTIFACT_TTL, max_bytes=ARTIFACT_MAX_BYTES, orphan_ttl=ORPHAN_TTL):
+    """
+    Süresi dolan kayıtları ve ORPHAN_TTL'den eski sahipsiz PDF'leri siler, ardından toplam boyut
+    bütçeyi aşıyorsa en uzun süredir erişilmeyenleri (LRU: manifest mtime'ı) siler.
+    """
+    directory = os.path.join(output_dir, MANIFEST_DIRNAME)
+    if not os.path.isdir(output_dir):
+        return 0
+
+    now = time.time()
+    entries = []
+    referenced = set()
+    removed = 0
+    for name in (os.listdir(directory) if os.path.isdir(directory) else []):
+        if not name.endswith(".json"):
+            continue
+        path = os.path.join(directory, name)
+        manifest = _read_manifest(path)
+        if manifest is None or now - manifest.get("created", 0) > ttl:
+            _remove(output_dir, path, manifest)
+            removed += 1
+            continue
+
+        try:
+            size, mtime = os.path.getsize(path), os.path.getmtime(path)
+        except OSError:
+            continue  # başka bir süreç aynı anda sildi
+        sizes = manifest.get("sizes", {})
+        for artifact in manifest.get("files", []):
+            referenced.add(artifact)
+            if artifact in sizes:
+                size += sizes[artifact]
+                continue
+            try:
+                size += os.path.getsize(os.path.join(output_dir, artifact))
+            except OSError:
+                pass
+        entries.append((mtime, size, path, manifest))
+
+    # Sahipsiz PDF'ler (ve yarım kalmış geçici çizim dosyaları)
+    orphans = 0
+    for name in os.listdir(output_dir):
+        if not name.endswith(".pdf") or name in referenced:
+            continue
+        path = os.path.join(output_dir, name)
+        try:
+            size, mtime = os.path.getsize(path), os.path.getmtime(path)
+        except OSError:
+            continue
+        if now - mtime > orphan_ttl:
+            _remove(output_dir, None, {"files": [name]})
+            removed += 1
+            continue
+        orphans += 1
+        entries.append((mtime, size, None, {"files": [name]}))
+
+    total = sum(e[1] for e in entries)
+    kept = len(entries) - orphans
+    for mtime, size, path, manifest in sorted(entries, key=lambda e: e[0]):
+        if total <= max_bytes:
+            break
+        if now - mtime < MIN_AGE:
+            continue
+        _remove(output_dir, path, manifest)
+        total -= size
+        removed += 1
+        if path is None:
+            orphans -= 1
+        else:
+            kept -= 1
+
+    with _lock:
+        _stats.update(entries=kept, bytes=total, orphans=orphans)
+        _stats["evicted"] += removed
+    if removed:
+        print(f"Önbellekten {removed} çıktı silindi (toplam {total / 1024 / 1024:.1f} MB).")
+    return removed
+
+
+if __name__ == "__main__":
+    import sys
+
+    # Kullanım: python -m utils.artifact_cache [outputs]
+    target = sys.argv[1] if len(sys.argv) > 1 else "outputs"
+    evict(target)
+    print(stats())
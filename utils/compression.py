@@ -0,0 +1,58 @@
+"""
+JSON/HTML yanıtlarının sıkıştırılması (Accept-Encoding: br > gzip).
+Akış yanıtları (SSE, NDJSON) ve dosya gönderimleri (PDF, zip) olduğu gibi bırakılır.
+Brotli paketi yoksa yalnızca gzip kullanılır.
+"""
+import os
+import gzip
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# Bundan küçük gövdeler sıkıştırılmaz (başlık yükü kazançtan büyük)
+MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", 512))
+MIMETYPES = {m.strip() for m in os.getenv("COMPRESS_MIMETYPES", "application/json,text/html").split(",") if m.strip()}
+GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", 6))
+# Brotli 4-5: gzip 6'dan küçük çıktı, benzer hız
+BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", 5))
+
+
+def encodings():
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def compress(data, encoding):
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL)
+
+
+def compress_response(response, accept_encodings):
+    if (response.direct_passthrough or response.is_streamed or response.mimetype not in MIMETYPES
+            or not 200 <= response.status_code < 300 or "Content-Encoding" in response.headers):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    encoding = accept_encodings.best_match(encodings())
+    data = response.get_data()
+    if encoding is None or len(data) < MIN_SIZE:
+        return response
+
+    response.set_data(compress(data, encoding))
+    response.headers["Content-Encoding"] = encoding
+    # Sıkıştırılmış gövdenin ETag'i sıkıştırılmamışınkiyle aynı olamaz
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(f"{etag}-{encoding}")
+    return response
+
+
+def init_app(app):
+    from flask import request
+
+    @app.after_request
+    def _compress(response):
+        return compress_response(response, request.accept_encodings)
@@ -0,0 +1,462 @@
+import os
+import io
+import re
+import csv
+import json
+import time
+import shutil
+import hashlib
+import threading
+from array import array
+
+import requests
+
+from .difficulty import is_missing_id
+
+try:
+    import fcntl
+except ImportError:  # Windows: dosya kilidi yok, tek süreç varsayılır
+    fcntl = None
+
+
+# --- Veri Seti Ayarları ---
+FILE_ID = os.getenv("DATASET_FILE_ID", "1EU6wifU-cdpeSHjKdl2jvxzLD26Lq-bs")
+DRIVE_URL = os.getenv("DATASET_URL", "https://drive.google.com/uc?export=download")
+DRIVE_CONFIRM_URL = "https://drive.usercontent.google.com/download"
+
+DATA_DIR = os.getenv("DATASET_DIR", os.path.join("data", "skills"))
+REFRESH_INTERVAL = int(os.getenv("DATASET_REFRESH_SECONDS", 6 * 60 * 60))
+VERSION_CHECK_INTERVAL = 5  # saniye: diğer worker'ların yaptığı hot-swap'i fark etme sıklığı
+KEEP_VERSIONS = 2
+
+STRING_COLUMNS = ("skills", "problem_id")
+
+
+def open_drive_stream(session, headers=None):
+    """
+    Google Drive indirme akışını açar.
+    Büyük dosyalarda Drive önce bir onay (virüs taraması) sayfası döndürür;
+    bu durumda formdaki confirm/uuid değerleriyle asıl dosyaya gidilir.
+    """
+    response = session.get(DRIVE_URL, params={'id': FILE_ID}, headers=headers, stream=True)
+
+    if "text/html" in response.headers.get('Content-Type', ''):
+        html = ""
+        for chunk in response.iter_content(chunk_size=1024):
+            if chunk: html += chunk.decode('utf-8', errors='ignore')
+            if len(html) > 10000: break
+
+        confirm_match = re.search(r'name="confirm" value="([^"]+)"', html)
+        confirm = confirm_match.group(1) if confirm_match else "t"
+
+        uuid_match = re.search(r'name="uuid" value="([^"]+)"', html)
+        params = {'id': FILE_ID, 'confirm': confirm}
+        if uuid_match:
+            params['uuid'] = uuid_match.group(1)
+
+        response = session.get(DRIVE_CONFIRM_URL, params=params, headers=headers, stream=True)
+
+    response.raw.decode_content = True
+    return response
+
+
+class _HashingReader(io.RawIOBase):
+    """Ham HTTP akışını okurken içeriğin sha256 özetini çıkarır."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.digest = hashlib.sha256()
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.raw.read(len(buffer))
+        if not data:
+            return 0
+        self.digest.update(data)
+        buffer[:len(data)] = data
+        return len(data)
+
+
+class DatasetStore:
+    """
+    Bir veri seti versiyonunun salt-okunur görünümü.
+    skills / problem_id sözlük kodlu int32 dizileri, correct float32 dizisidir;
+    hepsi np.load(mmap_mode='r') ile açılır, yani worker'lar sayfaları paylaşır.
+    """
+
+    def __init__(self, path):
+        import numpy as np  # veri seti ilk açıldığında yüklenir (sunucu açılışını yavaşlatmaz)
+
+        self.path = path
+        self.version = os.path.basename(path)
+
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        with open(os.path.join(path, "strings.json"), encoding="utf-8") as f:
+            self.strings = json.load(f)
+
+        self.skills = np.load(os.path.join(path, "skills.npy"), mmap_mode='r')
+        self.problem_id = np.load(os.path.join(path, "problem_id.npy"), mmap_mode='r')
+        self.correct = np.load(os.path.join(path, "correct.npy"), mmap_mode='r')
+
+        self._lower = {col: [s.lower() for s in self.strings[col]] for col in STRING_COLUMNS}
+        self._index = None
+        self._difficulty = None
+        self._skill_codes = None
+
+    def __len__(self):
+        return len(self.correct)
+
+    def row(self, i):
+        correct = float(self.correct[i])
+        return {
+            "skills": self.strings["skills"][self.skills[i]],
+            "problem_id": self.strings["problem_id"][self.problem_id[i]],
+            "correct": None if correct != correct else correct
+        }
+
+    @property
+    def index(self):
+        """Ters indeks ilk aramada yüklenir; eski versiyonlarda yoksa burada oluşturulur."""
+        if self._index is None:
+            from .skill_index import SkillIndex, INDEX_DIRNAME
+            path = os.path.join(self.path, INDEX_DIRNAME)
+            if not os.path.isdir(path):
+                self.build_index()
+            self._index = SkillIndex(path, self._lower)
+        return self._index
+
+    def build_index(self):
+        from .skill_index import SkillIndex
+        columns = {col: getattr(self, col) for col in STRING_COLUMNS}
+        return SkillIndex.build(self.path, columns, self._lower)
+
+    @property
+    def difficulty(self):
+        """Zorluk tabloları ilk sorguda yüklenir; eski versiyonlarda yoksa burada oluşturulur."""
+        if self._difficulty is None:
+            from .difficulty_tables import DifficultyTables, TABLES_DIRNAME
+            path = os.path.join(self.path, TABLES_DIRNAME)
+            if not os.path.isdir(path):
+                self.build_difficulty()
+            self._difficulty = DifficultyTables(path)
+        return self._difficulty
+
+    def build_difficulty(self, force=False):
+        from .difficulty_tables import DifficultyTables
+        return DifficultyTables.build(
+            self.path, self.skills, self.problem_id, self.correct,
+            len(self.strings["skills"]), len(self.strings["problem_id"]), force=force
+        )
+
+    def skill_codes(self, skills):
+        """Beceri adlarını sözlük kodlarına çevirir: önce tam eşleşme, yoksa alt dizgi (indeks) eşleşmesi."""
+        if self._skill_codes is None:
+            self._skill_codes = {value: code for code, value in enumerate(self._lower["skills"])}
+        codes = []
+        for skill in skills:
+            code = self._skill_codes.get(skill.lower())
+            if code is not None:
+                codes.append(code)
+            else:
+                codes.extend(int(e) for e in self.index.match_entries("skills", skill.lower()))
+        return codes
+
+    def weakest_problems(self, skills, k=5):
+        """Becerilerin en zor k problemini (problem_id) önceden hesaplanmış tablolardan döndürür."""
+        codes = self.skill_codes(skills)
+        if not codes:
+            return []
+        # Boş problem_id ("") sözlükte tek bir koddur; listede çıkarsa atlanır, yerine bir sonraki gelir
+        problems = [self.strings["problem_id"][p] for p in self.difficulty.hardest_for_skills(codes, k + 1)]
+        return [p for p in problems if not is_missing_id(p)][:k]
+
+    def skill_mastery(self, skill):
+        codes = self.skill_codes([skill])
+        return self.difficulty.mastery(codes[0]) if codes else None
+
+    def search(self, terms, limit=50):
+        """
+        Terimlerden herhangi birini skills veya problem_id içinde geçiren ilk `limit` satırı döndürür.
+        Eşleşme trigram ters indeksinin posting listeleri kesiştirilerek bulunur.
+        """
+        return list(self.iter_search(terms, limit))
+
+    def iter_search(self, terms, limit=50):
+        """search ile aynı satırları liste kurmadan tek tek üretir (akış halinde toplama için)."""
+        terms = [t.lower() for t in terms if t]
+        if not terms:
+            return
+        for i in self.index.search(terms, limit=limit):
+            yield self.row(i)
+
+    def search_many(self, term_lists, limit=50):
+        """
+        Birden çok konunun terim listesi için satır numaraları (her biri index.search(terms, limit) ile aynı).
+        Konular arasında ortak terimler indekste bir kez aranır (toplu üretim).
+        """
+        import numpy as np
+
+        index = self.index
+        chunks = {}
+        for term in {t.lower() for terms in term_lists for t in terms if t}:
+            found = []
+            for col in self._lower:
+                entries = index.match_entries(col, term)
+                if len(entries):
+                    found.extend(index.rows_for_entries(col, entries, limit))
+            chunks[term] = found
+
+        results = []
+        for terms in term_lists:
+            parts = [chunk for term in {t.lower() for t in terms if t} for chunk in chunks[term]]
+            if not parts:
+                results.append(np.empty(0, dtype=np.int32))
+                continue
+            found = np.unique(np.concatenate(parts))
+            results.append(found if limit is None else found[:limit])
+        return results
+
+
+# --- Versiyon Yönetimi ---
+
+def _current_file():
+    return os.path.join(DATA_DIR, "CURRENT")
+
+
+def read_current_version():
+    try:
+        with open(_current_file(), encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def _write_json_atomic(path, data):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def _read_meta(version):
+    try:
+        with open(os.path.join(DATA_DIR, version, "meta.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _activate(version):
+    """CURRENT işaretçisini atomik olarak yeni versiyona çevirir (hot-swap)."""
+    tmp = f"{_current_file()}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(tmp, _current_file())
+
+
+def _cleanup_old_versions(keep=KEEP_VERSIONS):
+    versions = sorted(d for d in os.listdir(DATA_DIR) if d.startswith("v") and os.path.isdir(os.path.join(DATA_DIR, d)))
+    current = read_current_version()
+    for old in versions[:-keep]:
+        if old != current:
+            # Açık mmap'ler silinen dosyada çalışmaya devam eder (POSIX)
+            shutil.rmtree(os.path.join(DATA_DIR, old), ignore_errors=True)
+
+
+class _IngestLock:
+    """Aynı anda yalnızca bir sürecin indirme/dönüştürme yapmasını sağlar."""
+
+    def __init__(self):
+        self.handle = None
+
+    def __enter__(self):
+        if fcntl is None:
+            return True
+        self.handle = open(os.path.join(DATA_DIR, ".ingest.lock"), "w")
+        try:
+            fcntl.flock(self.handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            return False
+
+    def __exit__(self, *exc):
+        if self.handle:
+            self.handle.close()
+
+
+def _convert_csv(text_stream, target_dir):
+    """CSV akışını sütunlu formata çevirip target_dir içine yazar, satır sayısını döndürür."""
+    import numpy as np
+
+    dictionaries = {col: {} for col in STRING_COLUMNS}
+    codes = {col: array('i') for col in STRING_COLUMNS}
+    correct = array('f')
+
+    reader = csv.DictReader(text_stream)
+    for row in reader:
+        for col in STRING_COLUMNS:
+            value = row.get(col) or ""
+            lookup = dictionaries[col]
+            code = lookup.get(value)
+            if code is None:
+                code = lookup[value] = len(lookup)
+            codes[col].append(code)
+        try:
+            correct.append(float(row.get('correct')))
+        except (TypeError, ValueError):
+            correct.append(float("nan"))
+
+    for col in STRING_COLUMNS:
+        np.save(os.path.join(target_dir, f"{col}.npy"), np.frombuffer(codes[col], dtype=np.int32))
+    np.save(os.path.join(target_dir, "correct.npy"), np.frombuffer(correct, dtype=np.float32))
+
+    # dict ekleme sırasını korur -> liste indeksi = kod
+    _write_json_atomic(os.path.join(target_dir, "strings.json"),
+                       {col: list(dictionaries[col]) for col in STRING_COLUMNS})
+    return len(correct)
+
+
+def ingest(force=False):
+    """
+    Veri setini indirir ve yeni bir versiyon olarak etkinleştirir.
+    Mevcut versiyonun ETag/Last-Modified bilgisiyle koşullu istek atılır;
+    dosya değişmediyse (304 veya aynı içerik özeti) hiçbir şey yapılmaz.
+    Yeni versiyon adını, değişiklik yoksa None döndürür.
+    """
+    os.makedirs(DATA_DIR, exist_ok=True)
+
+    with _IngestLock() as acquired:
+        if not acquired:
+            print("Veri seti başka bir süreç tarafından güncelleniyor, atlanıyor.")
+            return None
+
+        current = read_current_version()
+        meta = _read_meta(current) if current else None
+
+        headers = {}
+        if meta and not force:
+            if meta.get("etag"): headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"): headers["If-Modified-Since"] = meta["last_modified"]
+
+        start_time = time.time()
+        session = requests.Session()
+        response = open_drive_stream(session, headers=headers)
+
+        if response.status_code == 304 and meta:
+            meta["checked_at"] = time.time()
+            _write_json_atomic(os.path.join(DATA_DIR, current, "meta.json"), meta)
+            print("Veri seti güncel (304).")
+            return None
+        response.raise_for_status()
+
+        version = f"v{int(time.time() * 1000)}"
+        tmp_dir = os.path.join(DATA_DIR, f".tmp-{version}-{os.getpid()}")
+        os.makedirs(tmp_dir)
+        try:
+            hashing = _HashingReader(response.raw)
+            text_stream = io.TextIOWrapper(io.BufferedReader(hashing), encoding='utf-8')
+            rows = _convert_csv(text_stream, tmp_dir)
+            sha256 = hashing.digest.hexdigest()
+
+            new_meta = {
+                "source": FILE_ID,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "sha256": sha256,
+                "rows": rows,
+                "created_at": time.time(),
+                "checked_at": time.time()
+            }
+
+            if meta and meta.get("sha256") == sha256 and not force:
+                # İçerik aynı: sadece doğrulama bilgilerini güncelle
+                meta.update({k: new_meta[k] for k in ("etag", "last_modified", "checked_at")})
+                _write_json_atomic(os.path.join(DATA_DIR, current, "meta.json"), meta)
+                print("Veri seti değişmemiş (aynı içerik özeti).")
+                return None
+
+            _write_json_atomic(os.path.join(tmp_dir, "meta.json"), new_meta)
+            staged = DatasetStore(tmp_dir)
+            staged.build_index()
+            staged.build_difficulty()
+            os.rename(tmp_dir, os.path.join(DATA_DIR, version))
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        _activate(version)
+        _cleanup_old_versions()
+        print(f"Veri seti yüklendi: {version} ({rows} satır, {time.time() - start_time:.1f} sn)")
+        return version
+
+
+# --- Worker Tarafı ---
+
+_store = None
+_store_lock = threading.Lock()
+_last_version_check = 0.0
+
+
+def get_store():
+    """
+    Etkin versiyonun DatasetStore nesnesini döndürür, henüz yüklenmemişse None.
+    CURRENT değiştiyse (başka bir süreç yeni versiyon yüklediyse) yeni versiyona geçilir;
+    eski nesneyi kullanan istekler kendi mmap'leriyle çalışmaya devam eder.
+    """
+    global _store, _last_version_check
+
+    now = time.monotonic()
+    if _store is not None and now - _last_version_check < VERSION_CHECK_INTERVAL:
+        return _store
+
+    with _store_lock:
+        _last_version_check = now
+        version = read_current_version()
+        if version and (_store is None or _store.version != version):
+            try:
+                _store = DatasetStore(os.path.join(DATA_DIR, version))
+            except Exception as e:
+                print(f"Veri seti açılamadı ({version}): {e}")
+    return _store
+
+
+_refresher = None
+
+
+def _needs_refresh(interval):
+    current = read_current_version()
+    meta = _read_meta(current) if current else None
+    return not meta or time.time() - meta.get("checked_at", 0) >= interval
+
+
+def _refresh_loop(interval):
+    while True:
+        try:
+            if _needs_refresh(interval):
+                ingest()
+                get_store()
+        except Exception as e:
+            print(f"Veri seti yenileme hatası: {e}")
+        time.sleep(min(interval, 60))
+
+
+def start_refresher(interval=REFRESH_INTERVAL):
+    """
+    Arka planda veri setini periyodik olarak doğrulayan thread'i başlatır.
+    Yerel kopya yoksa ilk tur hemen indirir. interval <= 0 ise devre dışıdır.
+    """
+    global _refresher
+    if _refresher is not None or interval <= 0:
+        return
+    _refresher = threading.Thread(target=_refresh_loop, args=(interval,), daemon=True, name="dataset-refresher")
+    _refresher.start()
+
+
+if __name__ == "__main__":
+    import sys
+
+    # Kullanım: python -m utils.dataset_store [--force]
+    version = ingest(force="--force" in sys.argv)
+    print(version or read_current_version())
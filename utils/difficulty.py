@@ -0,0 +1,74 @@
+import heapq
+
+
+def _to_float(value):
+    """pd.to_numeric(errors='coerce') karşılığı: sayıya çevrilemeyen değer None olur (NaN da)."""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if number != number else number
+
+
+# pandas'ın okurken boş saydığı yazımlar; sütunlu depo boş hücreyi "" olarak saklar
+_MISSING_IDS = {"", "nan", "none", "null"}
+
+
+def is_missing_id(value):
+    """problem_id boş mu (None, NaN veya boş/NaN yazımlı metin); böyle satırlar bir problem sayılmaz."""
+    if value is None:
+        return True
+    if isinstance(value, float):
+        return value != value
+    return isinstance(value, str) and value.strip().lower() in _MISSING_IDS
+
+
+class DifficultyAggregator:
+    """
+    Veri seti satırlarını akış halinde tüketip problem başına (toplam, adet) tutar.
+    Satırlar hiç bellekte biriktirilmez; en zayıf k problem yığın (heap) ile seçilir.
+    Sonuç, groupby("problem_id")["correct"].mean().sort_values().head(k) ile aynıdır.
+    """
+
+    def __init__(self):
+        self._totals = {}  # problem_id -> [toplam, adet]
+        self.rows = 0
+
+    def add(self, problem_id, correct):
+        self.rows += 1
+        # groupby("problem_id") de boş anahtarları atar
+        if is_missing_id(problem_id):
+            return
+        entry = self._totals.get(problem_id)
+        if entry is None:
+            entry = self._totals[problem_id] = [0.0, 0]
+        number = _to_float(correct)
+        if number is not None:
+            entry[0] += number
+            entry[1] += 1
+
+    def feed(self, rows):
+        """rows: {'problem_id', 'correct', ...} sözlükleri üreten herhangi bir iterable."""
+        for row in rows:
+            self.add(row.get("problem_id"), row.get("correct"))
+        return self
+
+    def mean(self, problem_id):
+        total, count = self._totals[problem_id]
+        return total / count if count else None
+
+    def weakest(self, k=5):
+        # Ortalaması olmayan (hiç sayısal değeri olmayan) problemler pandas'taki NaN gibi en sona gider
+        def rank(item):
+            problem_id, (total, count) = item
+            return (0, total / count, str(problem_id)) if count else (1, 0.0, str(problem_id))
+
+        return [problem_id for problem_id, _ in heapq.nsmallest(k, self._totals.items(), key=rank)]
+
+    def __len__(self):
+        return len(self._totals)
+
+
+def weakest_problems(rows, k=5):
+    """Satır akışından en düşük ortalama doğruluklu k problemi döndürür."""
+    return DifficultyAggregator().feed(rows).weakest(k)
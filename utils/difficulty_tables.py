@@ -0,0 +1,139 @@
+import os
+import json
+import shutil
+
+import numpy as np
+
+
+TABLES_DIRNAME = "difficulty"
+HARDEST_K = int(os.getenv("DIFFICULTY_HARDEST_K", 10))
+# Bu kadar denemesi olmayan problemler "en zor" listelerinde güvenilir olanların arkasına düşer
+MIN_ATTEMPTS = int(os.getenv("DIFFICULTY_MIN_ATTEMPTS", 5))
+
+
+def _means(codes, correct, valid, size):
+    """Kod başına (ortalama doğruluk, sayısal deneme sayısı); denemesi olmayanın ortalaması NaN."""
+    attempts = np.bincount(codes[valid], minlength=size)
+    totals = np.bincount(codes[valid], weights=correct[valid], minlength=size)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = totals / attempts
+    return means.astype(np.float32), attempts.astype(np.int32)
+
+
+class DifficultyTables:
+    """
+    Tüm veri seti üzerinden önceden hesaplanmış zorluk tabloları (versiyon klasöründe difficulty/):
+      problem_error    problem kodu -> hata oranı (1 - ortalama doğruluk)
+      skill_mastery    beceri kodu  -> ortalama doğruluk
+      skill_hardest    beceri kodu  -> o becerideki en zor HARDEST_K problem kodu (-1 = boş)
+    Kodlar DatasetStore'un strings.json sözlüğündeki sıralardır; sorgular dizi indekslemesidir.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+        def load(name):
+            return np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r')
+
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.problem_error = load("problem_error")
+        self.problem_attempts = load("problem_attempts")
+        self.skill_mastery = load("skill_mastery")
+        self.skill_attempts = load("skill_attempts")
+        self.skill_hardest = load("skill_hardest")
+        self.skill_hardest_error = load("skill_hardest_error")
+
+    # --- Kalıcılık ---
+
+    @staticmethod
+    def build(store_path, skills, problem_id, correct, n_skills, n_problems, k=HARDEST_K,
+              min_attempts=MIN_ATTEMPTS, force=False):
+        """Versiyon klasörünün yanına difficulty/ klasörünü tek geçişte, vektörel olarak oluşturur."""
+        target = os.path.join(store_path, TABLES_DIRNAME)
+        if os.path.isdir(target):
+            if not force:
+                return target
+            shutil.rmtree(target, ignore_errors=True)
+
+        skills = np.asarray(skills, dtype=np.int64)
+        problem_id = np.asarray(problem_id, dtype=np.int64)
+        correct = np.asarray(correct, dtype=np.float64)
+        valid = ~np.isnan(correct)
+
+        problem_mean, problem_attempts = _means(problem_id, correct, valid, n_problems)
+        skill_mean, skill_attempts = _means(skills, correct, valid, n_skills)
+
+        # (beceri, problem) çiftleri: beceri içindeki problem zorluğu
+        pairs, inverse = np.unique(skills[valid] * n_problems + problem_id[valid], return_inverse=True)
+        pair_mean, pair_attempts = _means(inverse, correct[valid], np.ones(len(inverse), dtype=bool), len(pairs))
+        pair_skill, pair_problem = pairs // n_problems, pairs % n_problems
+        pair_error = 1.0 - pair_mean
+
+        # Beceri içinde: yeterli denemesi olanlar önce, sonra hata oranı azalan, eşitlikte problem kodu
+        order = np.lexsort((pair_problem, -pair_error, pair_attempts < min_attempts, pair_skill))
+        sorted_skill = pair_skill[order]
+        group_start = np.searchsorted(sorted_skill, sorted_skill, side="left")
+        rank = np.arange(len(order)) - group_start
+        keep = rank < k
+
+        hardest = np.full((n_skills, k), -1, dtype=np.int32)
+        hardest_error = np.full((n_skills, k), np.nan, dtype=np.float32)
+        hardest[sorted_skill[keep], rank[keep]] = pair_problem[order][keep]
+        hardest_error[sorted_skill[keep], rank[keep]] = pair_error[order][keep]
+
+        tmp = f"{target}.{os.getpid()}.tmp"
+        os.makedirs(tmp, exist_ok=True)
+        try:
+            with np.errstate(invalid="ignore"):
+                np.save(os.path.join(tmp, "problem_error.npy"), (1.0 - problem_mean).astype(np.float32))
+            np.save(os.path.join(tmp, "problem_attempts.npy"), problem_attempts)
+            np.save(os.path.join(tmp, "skill_mastery.npy"), skill_mean)
+            np.save(os.path.join(tmp, "skill_attempts.npy"), skill_attempts)
+            np.save(os.path.join(tmp, "skill_hardest.npy"), hardest)
+            np.save(os.path.join(tmp, "skill_hardest_error.npy"), hardest_error)
+            with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+                json.dump({"k": k, "min_attempts": min_attempts, "rows": int(len(correct)),
+                           "rated_rows": int(valid.sum())}, f)
+            try:
+                os.rename(tmp, target)
+            except OSError:
+                pass  # başka bir süreç aynı anda oluşturdu
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        return target
+
+    # --- Sorgu ---
+
+    def hardest_for_skills(self, skill_codes, k=5):
+        """
+        Becerilerin önceden hesaplanmış en zor listelerini birleştirip en zor k problem kodunu döndürür.
+        Aynı problem birden çok beceride geçiyorsa en yüksek hata oranı kullanılır.
+        """
+        best = {}
+        for skill in skill_codes:
+            for problem, error in zip(self.skill_hardest[skill], self.skill_hardest_error[skill]):
+                if problem < 0:
+                    break
+                if error > best.get(int(problem), -1.0):
+                    best[int(problem)] = float(error)
+        return [problem for problem, _ in sorted(best.items(), key=lambda item: (-item[1], item[0]))[:k]]
+
+    def mastery(self, skill_code):
+        value = float(self.skill_mastery[skill_code])
+        return None if value != value else value
+
+
+if __name__ == "__main__":
+    import sys
+    from .dataset_store import get_store
+
+    # Kullanım: python -m utils.difficulty_tables [--force] [BECERİ_KODU ...]
+    store = get_store()
+    if store is None:
+        sys.exit("Yerel veri seti yok; önce: python -m utils.dataset_store")
+
+    args = [a for a in sys.argv[1:] if a != "--force"]
+    print(store.build_difficulty(force="--force" in sys.argv))
+    for code in args:
+        print(code, store.weakest_problems([code]), store.skill_mastery(code))
@@ -0,0 +1,109 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from collections import namedtuple
+
+
+CACHE_DB = os.getenv("CACHE_DB", os.path.join("data", "cache.sqlite3"))
+
+Entry = namedtuple("Entry", ["value", "ok", "created", "expires"])
+
+
+class DiskCache:
+    """
+    SQLite üzerinde, süreçler arası paylaşılan anahtar-değer önbelleği.
+    - Her kaydın kendi TTL'i vardır (expires).
+    - max_entries aşılınca en uzun süredir okunmayan kayıtlar silinir (LRU).
+    - ok=False kayıtlar başarısız sonuçların kısa süreli (negatif) önbelleğidir.
+    Değerler JSON olarak saklanır.
+    """
+
+    EVICT_EVERY = 100  # kaç yazmada bir temizlik yapılacağı
+
+    def __init__(self, table, path=CACHE_DB, max_entries=10000, stale_grace=0):
+        self.table = table
+        self.path = path
+        self.max_entries = max_entries
+        self.stale_grace = stale_grace
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, value TEXT, ok INTEGER, "
+                "created REAL, expires REAL, accessed REAL)"
+            )
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_accessed ON {self.table}(accessed)")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key, allow_stale=False):
+        """
+        Kaydı döndürür; yoksa veya süresi dolmuşsa None.
+        allow_stale=True ise süresi dolmuş (ama stale_grace içindeki) kayıt da döner,
+        tazeliği çağıran Entry.expires ile kontrol eder.
+        """
+        now = time.time()
+        conn = self._conn()
+        row = conn.execute(
+            f"SELECT value, ok, created, expires FROM {self.table} WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row is None or (row[3] < now and not (allow_stale and row[3] + self.stale_grace >= now)):
+            self.misses += 1
+            return None
+
+        conn.execute(f"UPDATE {self.table} SET accessed = ? WHERE key = ?", (now, key))
+        self.hits += 1
+        return Entry(json.loads(row[0]), bool(row[1]), row[2], row[3])
+
+    def contains(self, key):
+        """Süresi dolmamış kayıt var mı; isabet/ıska sayaçlarına ve LRU sırasına dokunmaz."""
+        row = self._conn().execute(
+            f"SELECT 1 FROM {self.table} WHERE key = ? AND expires >= ?", (key, time.time())
+        ).fetchone()
+        return row is not None
+
+    def set(self, key, value, ttl, ok=True):
+        now = time.time()
+        self._conn().execute(
+            f"INSERT OR REPLACE INTO {self.table} (key, value, ok, created, expires, accessed) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, json.dumps(value, ensure_ascii=False), int(ok), now, now + ttl, now)
+        )
+        self._writes += 1
+        if self._writes % self.EVICT_EVERY == 0:
+            self.evict()
+
+    def delete(self, key):
+        self._conn().execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def evict(self):
+        """Süresi (ve tolerans payı) dolmuş kayıtları, ardından LRU fazlasını siler."""
+        conn = self._conn()
+        conn.execute(f"DELETE FROM {self.table} WHERE expires + ? < ?", (self.stale_grace, time.time()))
+        conn.execute(
+            f"DELETE FROM {self.table} WHERE key IN ("
+            f"SELECT key FROM {self.table} ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+    def clear(self):
+        self._conn().execute(f"DELETE FROM {self.table}")
+
+    def stats(self):
+        size = self._conn().execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": size}
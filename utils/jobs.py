@@ -0,0 +1,201 @@
+import os
+import re
+import json
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .sse import format_event
+from . import metrics
+
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 2))
+JOB_QUEUE_LIMIT = int(os.getenv("JOB_QUEUE_LIMIT", 32))
+JOB_TTL = int(os.getenv("JOB_TTL", 60 * 60))
+
+FINAL_STATUSES = ("done", "failed")
+
+_JOB_ID = re.compile(r"[0-9a-f]{32}")
+
+
+class QueueFull(Exception):
+    pass
+
+
+class JobManager:
+    """
+    /generate için arka plan iş kuyruğu.
+    İşler sınırlı bir thread havuzunda çalışır; durumları <directory>/<id>.json dosyasına yazılır,
+    böylece durum sorgusu (polling / SSE) hangi worker sürecine düşerse düşsün cevaplanabilir.
+    stages: işin bildireceği aşamalar sırasıyla (çizim kipine göre değişir, ai_pdf_generator.GENERATION_STAGES);
+    durumda "expected_stages" olarak yer alır.
+    """
+
+    CLEANUP_EVERY = 50
+
+    def __init__(self, directory, stages=(), workers=JOB_WORKERS, max_queue=JOB_QUEUE_LIMIT):
+        self.directory = directory
+        self.stages = tuple(stages)
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._submitted = 0
+        self._stage_stats = {stage: {"count": 0, "total": 0.0, "max": 0.0} for stage in self.stages}
+        os.makedirs(directory, exist_ok=True)
+
+    # --- Durum Dosyaları ---
+
+    def _path(self, job_id):
+        return os.path.join(self.directory, f"{job_id}.json")
+
+    def _write(self, state):
+        state["updated"] = time.time()
+        path = self._path(state["id"])
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def get(self, job_id):
+        if not _JOB_ID.fullmatch(job_id or ""):
+            return None
+        try:
+            with open(self._path(job_id), encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _cleanup(self):
+        now = time.time()
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if now - os.path.getmtime(path) > JOB_TTL:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    # --- Kuyruk ---
+
+    def submit(self, fn, *args):
+        """
+        fn(*args, progress=callback) çağrısını kuyruğa alır ve iş kimliğini döndürür.
+        fn'in döndürdüğü sözlük işin sonucu (result) olur.
+        """
+        with self._lock:
+            if self._queued + self._running >= self.max_queue:
+                raise QueueFull()
+            self._queued += 1
+            self._submitted += 1
+            cleanup = self._submitted % self.CLEANUP_EVERY == 0
+
+        if cleanup:
+            self._cleanup()
+
+        state = {
+            "id": uuid.uuid4().hex,
+            "status": "queued",
+            "stage": None,
+            "expected_stages": list(self.stages),
+            "stages": {},
+            "created": time.time(),
+            "result": None,
+            "error": None
+        }
+        self._write(state)
+        metrics.submit(self._executor, self._run, state, fn, args)
+        return state["id"]
+
+    def _finish_stage(self, state, now):
+        stage = state["stage"]
+        if stage and stage in state["stages"] and "duration" not in state["stages"][stage]:
+            duration = now - state["stages"][stage]["started"]
+            state["stages"][stage]["duration"] = round(duration, 3)
+            with self._lock:
+                stats = self._stage_stats.setdefault(stage, {"count": 0, "total": 0.0, "max": 0.0})
+                stats["count"] += 1
+                stats["total"] += duration
+                stats["max"] = max(stats["max"], duration)
+
+    def _run(self, state, fn, args):
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+
+        state["status"] = "running"
+        state["started"] = time.time()
+        self._write(state)
+
+        def progress(stage):
+            now = time.time()
+            self._finish_stage(state, now)
+            state["stage"] = stage
+            state["stages"][stage] = {"started": now}
+            self._write(state)
+
+        try:
+            state["result"] = fn(*args, progress=progress)
+            state["status"] = "done"
+        except Exception as e:
+            print(f"İş hatası ({state['id']}): {e}")
+            state["status"] = "failed"
+            state["error"] = str(e)
+        finally:
+            now = time.time()
+            self._finish_stage(state, now)
+            state["finished"] = now
+            self._write(state)
+            with self._lock:
+                self._running -= 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_depth": self._queued,
+                "running": self._running,
+                "max_queue": self.max_queue,
+                "stages": {
+                    stage: {
+                        "count": s["count"],
+                        "avg_seconds": round(s["total"] / s["count"], 3) if s["count"] else None,
+                        "max_seconds": round(s["max"], 3)
+                    }
+                    for stage, s in self._stage_stats.items()
+                }
+            }
+
+    def events(self, job_id, poll_interval=0.5, timeout=600, heartbeat=15):
+        """
+        İşin durum değişikliklerini server-sent events formatında üretir.
+        İş bittiğinde (done/failed) son olayı gönderip kapanır.
+        """
+        deadline = time.time() + timeout
+        last_sent = None
+        last_beat = time.time()
+
+        while time.time() < deadline:
+            state = self.get(job_id)
+            if state is None:
+                yield format_event("error", {"error": "İş bulunamadı."})
+                return
+
+            marker = (state["status"], state["stage"])
+            if marker != last_sent:
+                last_sent = marker
+                last_beat = time.time()
+                event = state["status"] if state["status"] in FINAL_STATUSES else "stage"
+                yield format_event(event, state)
+                if state["status"] in FINAL_STATUSES:
+                    return
+            elif time.time() - last_beat > heartbeat:
+                last_beat = time.time()
+                yield ": keep-alive\n\n"
+
+            time.sleep(poll_interval)
+
+        yield format_event("error", {"error": "Zaman aşımı."})
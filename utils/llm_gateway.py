@@ -0,0 +1,333 @@
+"""
+Tüm LLM (Groq, OpenAI uyumlu) çağrılarının geçtiği tek kapı:
+  - süreç başına tek istemci, ayarlı keep-alive bağlantı havuzu (httpx)
+  - eşzamanlı çağrı sınırı (semafor); dolu havuzda son tarihe kadar beklenir
+  - 429 / 5xx / bağlantı hatalarında jitter'lı üstel geri çekilme ile yeniden deneme (Retry-After dikkate alınır)
+  - devre kesici: art arda hatalardan sonra servis bir süre hiç çağrılmaz, istekler hemen LLMUnavailable alır
+  - çağrı başına son tarih (deadline): bekleme, geri çekilme ve HTTP zaman aşımı kalan süreye göre kısalır
+
+    content, usage = llm_gateway.chat(messages, kind="plan", timeout=60, temperature=0.5)
+    for delta in llm_gateway.stream_chat(messages, kind="stream", timeout=60):
+        ...
+"""
+import os
+import time
+import random
+import threading
+
+from . import metrics
+
+
+# OpenAI uyumlu uç nokta (ölçümlerde yerel sahte sunucuya yönlendirilebilir)
+LLM_BASE_URL = os.getenv("GROQ_BASE_URL", "https://api.groq.com/openai/v1")
+AI_MODEL = "llama-3.3-70b-versatile"
+
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", 8))
+LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", 16))
+LLM_KEEPALIVE_SECONDS = float(os.getenv("LLM_KEEPALIVE_SECONDS", 30))
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", 5))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", 60))  # son tarih verilmeyen çağrılar için
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", 3))
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", 0.5))
+LLM_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", 8))
+LLM_BREAKER_THRESHOLD = int(os.getenv("LLM_BREAKER_THRESHOLD", 5))
+LLM_BREAKER_COOLDOWN = float(os.getenv("LLM_BREAKER_COOLDOWN", 30))
+# Denemeye bundan kısa süre kalmışken gelen zaman aşımı çağıranın kendi son tarihidir (ör. mobil 2.5 sn);
+# servisin sağlığı hakkında bilgi taşımaz, devre kesiciye hata olarak yazılmaz
+LLM_BREAKER_MIN_TIMEOUT = float(os.getenv("LLM_BREAKER_MIN_TIMEOUT", 10))
+
+RETRYABLE_STATUS = (408, 409, 429)
+
+LLM_CALLS = metrics.counter("llm_calls_total", "LLM çağrı sonuçları", ("kind", "status"))
+LLM_RETRIES = metrics.counter("llm_retries_total", "LLM yeniden denemeleri", ("kind", "reason"))
+
+
+class LLMError(Exception):
+    """LLM çağrısı başarısız oldu (yeniden denenmeyen hata veya denemeler tükendi)."""
+
+
+class LLMUnavailable(LLMError):
+    """Servis şu an kullanılamıyor (devre açık, sıra bekleme süresi doldu); retry_after saniye sonra denenebilir."""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    closed: çağrılar serbest; art arda `threshold` hata -> open.
+    open: `cooldown` saniye boyunca çağrı yapılmaz; süre dolunca tek bir deneme çağrısına izin verilir (half_open).
+    half_open: deneme başarılıysa closed, başarısızsa tekrar open.
+    """
+
+    def __init__(self, threshold=LLM_BREAKER_THRESHOLD, cooldown=LLM_BREAKER_COOLDOWN, clock=time.monotonic):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+        self.trips = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state()
+
+    def _state(self):
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at >= self.cooldown:
+            return "half_open"
+        return "open"
+
+    def retry_after(self):
+        with self._lock:
+            if self._opened_at is None:
+                return 0
+            return max(0.0, self.cooldown - (self._clock() - self._opened_at))
+
+    def allow(self):
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.threshold:
+                if self._opened_at is None or self._probing:
+                    self.trips += 1
+                self._opened_at = self._clock()
+            self._probing = False
+
+    def release(self):
+        """Sonucu sağlık bilgisi taşımayan (ör. 400) bir deneme çağrısından sonra sıradakine izin verir."""
+        with self._lock:
+            self._probing = False
+
+
+breaker = CircuitBreaker()
+_slots = threading.BoundedSemaphore(LLM_MAX_CONCURRENCY)
+_in_flight = 0
+_in_flight_lock = threading.Lock()
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Süreç başına tek OpenAI istemcisi; SDK ve httpx ilk çağrıda yüklenir. SDK'nın kendi yeniden denemesi kapalıdır."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                import httpx
+                from openai import OpenAI
+                http_client = httpx.Client(
+                    limits=httpx.Limits(max_connections=LLM_POOL_SIZE,
+                                        max_keepalive_connections=LLM_POOL_SIZE,
+                                        keepalive_expiry=LLM_KEEPALIVE_SECONDS),
+                    timeout=httpx.Timeout(LLM_TIMEOUT, connect=LLM_CONNECT_TIMEOUT)
+                )
+                _client = OpenAI(
+                    base_url=LLM_BASE_URL,
+                    api_key=os.getenv("GROQ_API_KEY"),
+                    http_client=http_client,
+                    max_retries=0
+                )
+    return _client
+
+
+def deadline_after(seconds):
+    return time.monotonic() + (LLM_TIMEOUT if seconds is None else seconds)
+
+
+def _remaining(deadline):
+    return deadline - time.monotonic()
+
+
+def _classify(error):
+    """Hata -> (yeniden_denenir_mi, neden, Retry-After saniyesi)."""
+    status = getattr(error, "status_code", None)
+    if status is not None:
+        retry_after = None
+        response = getattr(error, "response", None)
+        if response is not None:
+            try:
+                retry_after = float(response.headers.get("retry-after"))
+            except (TypeError, ValueError):
+                pass
+        return status in RETRYABLE_STATUS or status >= 500, str(status), retry_after
+    name = type(error).__name__
+    if name in ("APIConnectionError", "APITimeoutError") or isinstance(error, (TimeoutError, ConnectionError)):
+        return True, "timeout" if "Timeout" in name else "connection", None
+    return False, name, None
+
+
+def _backoff(attempt, retry_after=None):
+    """Tam jitter'lı üstel geri çekilme; sunucu Retry-After verdiyse en az o kadar."""
+    delay = random.uniform(0, min(LLM_BACKOFF_MAX, LLM_BACKOFF_BASE * (2 ** attempt)))
+    return max(delay, retry_after or 0)
+
+
+def _acquire(kind, deadline):
+    global _in_flight
+    if not breaker.allow():
+        LLM_CALLS.inc(kind=kind, status="rejected")
+        raise LLMUnavailable("LLM servisi geçici olarak devre dışı (devre açık).", breaker.retry_after() or 1)
+    if not _slots.acquire(timeout=max(0, _remaining(deadline))):
+        breaker.release()
+        LLM_CALLS.inc(kind=kind, status="queue_timeout")
+        raise LLMUnavailable("LLM çağrı sırası dolu, süre aşıldı.", 1)
+    with _in_flight_lock:
+        _in_flight += 1
+
+
+def _release():
+    global _in_flight
+    with _in_flight_lock:
+        _in_flight -= 1
+    _slots.release()
+
+
+def _call(kind, deadline, request, hold=False):
+    """
+    request(timeout) -> sonuç. Yeniden denenebilir hatalarda son tarih içinde tekrar dener.
+    Her deneme ayrı bir eşzamanlılık yuvası ve devre kesici izni alır; hold=True ise başarılı
+    denemenin yuvası bırakılmaz (akış bitince çağıran _release ile bırakır).
+    """
+    attempt = 0
+    while True:
+        if _remaining(deadline) <= 0:
+            LLM_CALLS.inc(kind=kind, status="deadline")
+            raise LLMUnavailable("LLM çağrısı için ayrılan süre doldu.", 1)
+
+        _acquire(kind, deadline)
+        result = None
+        seconds = max(0.1, _remaining(deadline))
+        try:
+            result = request(seconds)
+        except Exception as e:
+            retryable, reason, retry_after = _classify(e)
+            if not retryable:
+                breaker.release()
+                LLM_CALLS.inc(kind=kind, status="error")
+                raise LLMError(f"LLM hatası: {e}") from e
+            if reason == "timeout" and seconds < LLM_BREAKER_MIN_TIMEOUT:
+                breaker.release()
+            else:
+                breaker.record_failure()
+
+            delay = _backoff(attempt, retry_after)
+            attempt += 1
+            if attempt > LLM_MAX_RETRIES or delay >= _remaining(deadline) or breaker.state == "open":
+                LLM_CALLS.inc(kind=kind, status="unavailable")
+                raise LLMUnavailable(f"LLM servisine ulaşılamadı ({reason}): {e}",
+                                     retry_after or breaker.retry_after() or 1) from e
+            LLM_RETRIES.inc(kind=kind, reason=reason)
+            print(f"LLM yeniden deneniyor ({kind}, {reason}, {attempt}/{LLM_MAX_RETRIES}): {delay:.2f} sn sonra")
+        else:
+            breaker.record_success()
+            LLM_CALLS.inc(kind=kind, status="ok")
+            return result
+        finally:
+            if result is None or not hold:
+                _release()
+        time.sleep(delay)
+
+
+def chat(messages, kind="chat", timeout=None, deadline=None, model=AI_MODEL, **params):
+    """
+    Tek seferlik tamamlama; (içerik, usage) döndürür. deadline (time.monotonic) verilirse timeout yok sayılır.
+    Hata durumunda LLMError / LLMUnavailable fırlatır.
+    """
+    deadline = deadline or deadline_after(timeout)
+
+    def request(seconds):
+        return get_client().chat.completions.create(model=model, messages=messages, timeout=seconds, **params)
+
+    with metrics.span("llm", target=kind):
+        response = _call(kind, deadline, request)
+    usage = getattr(response, "usage", None)
+    metrics.record_usage(kind, usage)
+    return response.choices[0].message.content, usage
+
+
+def stream_chat(messages, kind="stream", timeout=None, deadline=None, model=AI_MODEL, **params):
+    """
+    Akışlı tamamlama; içerik parçalarını (str) üretir. Yeniden deneme yalnızca akış başlamadan önce yapılır;
+    akış başladıktan sonraki hata (veya son tarihin dolması) LLMError olarak çağırana iletilir.
+    Eşzamanlılık yuvası akış boyunca tutulur.
+    """
+    deadline = deadline or deadline_after(timeout)
+
+    def request(seconds):
+        stream = get_client().chat.completions.create(model=model, messages=messages, timeout=seconds,
+                                                      stream=True, **params)
+        iterator = iter(stream)
+        # İlk parça gelene kadar başarısızlık bağlantı hatasıdır, yeniden denenebilir
+        try:
+            first = next(iterator)
+        except StopIteration:
+            first = None
+        except BaseException:
+            stream.close()
+            raise
+        return stream, iterator, first
+
+    stream, iterator, first = _call(kind, deadline, request, hold=True)
+    try:
+        chunk = first
+        while chunk is not None:
+            metrics.record_usage(kind, getattr(chunk, "usage", None))
+            if chunk.choices:
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+            if _remaining(deadline) <= 0:
+                LLM_CALLS.inc(kind=kind, status="deadline")
+                raise LLMError("LLM akışı için ayrılan süre doldu.")
+            chunk = next(iterator, None)
+    except LLMError:
+        raise
+    except Exception as e:
+        breaker.record_failure()
+        LLM_CALLS.inc(kind=kind, status="interrupted")
+        raise LLMError(f"LLM akışı kesildi: {e}") from e
+    finally:
+        stream.close()
+        _release()
+
+
+def stats():
+    return {
+        "breaker": breaker.state,
+        "breaker_trips": breaker.trips,
+        "in_flight": _in_flight,
+        "max_concurrency": LLM_MAX_CONCURRENCY
+    }
+
+
+@metrics.register_collector
+def _gateway_stats():
+    current = stats()
+    return [
+        ("llm_in_flight", "gauge", "Süren LLM çağrıları", current["in_flight"]),
+        ("llm_breaker_open", "gauge", "Devre kesici açık mı (1 = çağrılar reddediliyor)",
+         0 if current["breaker"] == "closed" else 1),
+        ("llm_breaker_trips_total", "counter", "Devre kesicinin açılma sayısı", current["breaker_trips"])
+    ]
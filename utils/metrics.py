@@ -0,0 +1,428 @@
+"""
+Süreç içi metrikler (sayaç + histogram) ve Prometheus metin formatında dışa aktarım (/metrics).
+
+    with metrics.span("llm", target="plan"):      # süre -> ogrenme_stage_seconds{stage, target, status}
+        ...
+    metrics.LLM_TOKENS.inc(120, kind="plan", type="prompt")
+
+İstek kimliği (X-Request-ID) bir contextvar'da tutulur; init_app ile her isteğe atanır,
+iş/sağlayıcı thread'lerine submit() ile taşınır ve print çıktılarının başına eklenir.
+
+Sayaç ve histogramlar süreç içidir. Birden çok worker'da (gunicorn) METRICS_DIR verilirse her süreç
+değerlerini bu klasöre METRICS_FLUSH_SECONDS aralıkla yazar ve /metrics tüm süreçlerin toplamını döner
+(kapanan worker'ların dosyaları kalır, sayaçlar geri düşmez). register_collector değerleri (kuyruk
+derinliği, önbellek istatistikleri) her durumda yalnızca cevap veren sürece aittir.
+"""
+import os
+import re
+import sys
+import json
+import time
+import uuid
+import atexit
+import bisect
+import threading
+import contextvars
+from contextlib import contextmanager
+
+
+PREFIX = "ogrenme_"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+# Aşama başına bir log satırı yazar; yoğun trafikte log hacmini katladığı için isteğe bağlıdır
+SPAN_LOG = os.getenv("SPAN_LOG", "0") == "1"
+METRICS_DIR = os.getenv("METRICS_DIR")
+METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", 5))
+
+request_id = contextvars.ContextVar("request_id", default=None)
+_REQUEST_ID = re.compile(r"[A-Za-z0-9._-]{1,64}")
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class _Metric:
+    type = None
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = PREFIX + name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def snapshot(self):
+        """Değerlerin JSON'a yazılabilir kopyası: [[etiket değerleri, değer], ...]"""
+        with self._lock:
+            return [[list(key), json.loads(json.dumps(value))] for key, value in self._values.items()]
+
+    def reset(self):
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def samples(self, values=None):
+        if values is None:
+            with self._lock:
+                values = dict(self._values)
+        return self._samples(values)
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    @staticmethod
+    def merge(total, value):
+        return value if total is None else total + value
+
+    def _samples(self, values):
+        for key, value in values.items():
+            yield self.name, _format_labels(self.labelnames, key), value
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    @staticmethod
+    def merge(total, value):
+        if total is None:
+            return [list(value[0]), value[1], value[2]]
+        return [[a + b for a, b in zip(total[0], value[0])], total[1] + value[1], total[2] + value[2]]
+
+    def _samples(self, values):
+        items = [(key, (list(counts), total, count)) for key, (counts, total, count) in values.items()]
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                yield self.name + "_bucket", _format_labels(self.labelnames, key, [("le", le)]), cumulative
+            yield self.name + "_sum", _format_labels(self.labelnames, key), round(total, 6)
+            yield self.name + "_count", _format_labels(self.labelnames, key), count
+
+
+_registry = []
+_collectors = []
+
+
+def counter(name, help_text, labelnames=()):
+    metric = Counter(name, help_text, labelnames)
+    _registry.append(metric)
+    return metric
+
+
+def histogram(name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+    metric = Histogram(name, help_text, labelnames, buckets)
+    _registry.append(metric)
+    return metric
+
+
+def register_collector(fn):
+    """
+    fn() -> [(ad, tür, açıklama, değer), ...]; /metrics her okunduğunda çağrılır
+    (kuyruk derinliği, önbellek isabetleri gibi başka modüllerde tutulan değerler için).
+    """
+    _collectors.append(fn)
+    return fn
+
+
+# --- Hattın Metrikleri ---
+
+STAGE_SECONDS = histogram("stage_seconds", "Hat aşamalarının süresi (saniye)", ("stage", "target", "status"))
+HTTP_SECONDS = histogram("http_request_seconds", "HTTP isteği süresi (saniye)", ("endpoint", "method", "status"))
+DATASET_ROWS = counter("dataset_rows_total", "Taranan / eşleşen veri seti satırları", ("source", "kind"))
+LLM_TOKENS = counter("llm_tokens_total", "LLM token kullanımı", ("kind", "type"))
+LLM_FIRST_TOKEN = histogram("llm_first_token_seconds", "Akışta ilk parçanın gelme süresi (saniye)", ("kind",))
+RESOURCE_STATUS = counter("resource_provider_total", "Kaynak sağlayıcı sonuçları", ("provider", "status"))
+
+
+def observe_stage(stage, seconds, target="", status="ok"):
+    STAGE_SECONDS.observe(seconds, stage=stage, target=target, status=status)
+    if SPAN_LOG:
+        print(f"[span] stage={stage}{f' target={target}' if target else ''} status={status} ms={seconds * 1000:.1f}")
+
+
+@contextmanager
+def span(stage, target=""):
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        yield
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        observe_stage(stage, time.perf_counter() - start, target, status)
+
+
+def timed_iter(stage, iterable, target=""):
+    """
+    Bir akışı (generator) sararak yalnızca öğe üretirken geçen süreyi ölçer ve
+    üretilen öğeleri dataset_rows_total{kind="matched"} olarak sayar.
+    """
+    elapsed, count, status = 0.0, 0, "ok"
+    iterator = iter(iterable)
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                break
+            finally:
+                elapsed += time.perf_counter() - start
+            count += 1
+            yield item
+    except GeneratorExit:
+        raise
+    except Exception:
+        status = "error"
+        raise
+    finally:
+        DATASET_ROWS.inc(count, source=target, kind="matched")
+        observe_stage(stage, elapsed, target, status)
+
+
+def record_usage(kind, usage):
+    """OpenAI yanıtındaki usage alanını token sayaçlarına ekler (yoksa sessizce geçer)."""
+    if usage is None:
+        return
+    for token_type in ("prompt_tokens", "completion_tokens"):
+        value = getattr(usage, token_type, None)
+        if value:
+            LLM_TOKENS.inc(value, kind=kind, type=token_type.split("_")[0])
+
+
+# --- Süreçler Arası Toplama (METRICS_DIR) ---
+
+_own_file = {"pid": None, "path": None}
+_flusher = None
+
+
+def _own_path():
+    # Aynı pid yeniden kullanılsa da kapanmış worker'ın dosyası ezilmesin
+    pid = os.getpid()
+    if _own_file["pid"] != pid:
+        _own_file.update(pid=pid, path=os.path.join(METRICS_DIR, f"{pid}-{uuid.uuid4().hex[:8]}.json"))
+    return _own_file["path"]
+
+
+def flush():
+    """Bu sürecin sayaç/histogram değerlerini METRICS_DIR'e yazar."""
+    if not METRICS_DIR:
+        return
+    path = _own_path()
+    try:
+        os.makedirs(METRICS_DIR, exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({metric.name: metric.snapshot() for metric in _registry}, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"Metrikler yazılamadı: {e}")
+
+
+def _flush_loop():
+    while True:
+        time.sleep(METRICS_FLUSH_SECONDS)
+        flush()
+
+
+def start_flusher():
+    global _flusher
+    if not METRICS_DIR or (_flusher is not None and _flusher.is_alive()):
+        return
+    _flusher = threading.Thread(target=_flush_loop, name="metrics-flush", daemon=True)
+    _flusher.start()
+    atexit.register(flush)
+
+
+def _reset_after_fork():
+    # fork edilen süreç üst sürecin değerlerini kopyalar; kendi dosyasına yalnızca kendi değerlerini yazmalı
+    for metric in _registry:
+        metric.reset()
+
+
+def clear_dir():
+    """Önceki çalıştırmanın süreç dosyalarını siler (gunicorn master açılışta çağırır)."""
+    if not METRICS_DIR or not os.path.isdir(METRICS_DIR):
+        return
+    for name in os.listdir(METRICS_DIR):
+        if name.endswith(".json") or name.endswith(".tmp"):
+            try:
+                os.remove(os.path.join(METRICS_DIR, name))
+            except OSError:
+                pass
+
+
+def _merged_values():
+    """Tüm süreç dosyalarının toplamı: {metrik adı: {etiket anahtarı: değer}}"""
+    flush()
+    merged = {metric.name: {} for metric in _registry}
+    kinds = {metric.name: metric for metric in _registry}
+    try:
+        names = os.listdir(METRICS_DIR)
+    except OSError:
+        names = []
+    for name in names:
+        if not name.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(METRICS_DIR, name), encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        for metric_name, items in data.items():
+            metric = kinds.get(metric_name)
+            if metric is None:
+                continue
+            values = merged[metric_name]
+            for key, value in items:
+                key = tuple(key)
+                values[key] = metric.merge(values.get(key), value)
+    return merged
+
+
+if METRICS_DIR and hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def render():
+    lines = []
+    merged = _merged_values() if METRICS_DIR else {}
+    for metric in _registry:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        lines.extend(f"{name}{labels} {value}" for name, labels, value in metric.samples(merged.get(metric.name)))
+
+    for collector in _collectors:
+        try:
+            samples = collector()
+        except Exception as e:
+            print(f"Metrik toplayıcı hatası: {e}")
+            continue
+        for name, metric_type, help_text, value in samples:
+            if value is None:
+                continue
+            lines.append(f"# HELP {PREFIX}{name} {help_text}")
+            lines.append(f"# TYPE {PREFIX}{name} {metric_type}")
+            lines.append(f"{PREFIX}{name} {value}")
+    return "\n".join(lines) + "\n"
+
+
+# --- İstek Kimliği ---
+
+def submit(executor, fn, *args, **kwargs):
+    """executor.submit; çağıranın contextvar'ları (istek kimliği) worker thread'ine taşınır."""
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+def bind_context(iterable):
+    """
+    Akış yanıtlarının (SSE) gövdesi istek kapandıktan sonra üretilir; oluşturulduğu andaki
+    bağlam (istek kimliği) her adımda yeniden etkinleştirilir.
+    """
+    context = contextvars.copy_context()
+    iterator = iter(iterable)
+
+    def generate():
+        while True:
+            try:
+                item = context.run(next, iterator)
+            except StopIteration:
+                return
+            yield item
+
+    return generate()
+
+
+class _RequestIdStream:
+    """print çıktısındaki her satırın başına etkin istek kimliğini ekler."""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+
+    def write(self, text):
+        rid = request_id.get()
+        at_line_start = getattr(self._local, "at_line_start", True)
+        if rid and text:
+            lines = text.split("\n")
+            text = "\n".join(
+                f"[{rid}] {line}" if line and (i > 0 or at_line_start) else line
+                for i, line in enumerate(lines)
+            )
+        if text:
+            self._local.at_line_start = text.endswith("\n")
+        return self._stream.write(text)
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+def install_log_prefix():
+    if not isinstance(sys.stdout, _RequestIdStream):
+        sys.stdout = _RequestIdStream(sys.stdout)
+
+
+def init_app(app):
+    """Her isteğe kimlik atar (gelen X-Request-ID veya yeni), süresini ölçer ve yanıta ekler."""
+    from flask import request, g
+
+    install_log_prefix()
+    start_flusher()
+
+    @app.before_request
+    def _start_request():
+        incoming = request.headers.get("X-Request-ID", "")
+        rid = incoming if _REQUEST_ID.fullmatch(incoming) else uuid.uuid4().hex[:12]
+        g.request_started = time.perf_counter()
+        g.request_id = rid
+        g.request_id_token = request_id.set(rid)
+
+    @app.after_request
+    def _finish_request(response):
+        response.headers["X-Request-ID"] = g.get("request_id", "")
+        if "request_started" in g:
+            HTTP_SECONDS.observe(time.perf_counter() - g.request_started,
+                                 endpoint=request.endpoint or "unknown", method=request.method,
+                                 status=response.status_code)
+        return response
+
+    @app.teardown_request
+    def _clear_request_id(exc):
+        token = g.pop("request_id_token", None)
+        if token is not None:
+            try:
+                request_id.reset(token)
+            except ValueError:
+                request_id.set(None)  # akış yanıtı farklı bir bağlamda kapandı
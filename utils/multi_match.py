@@ -0,0 +1,59 @@
+from collections import deque
+
+
+class AhoCorasick:
+    """
+    Çok kalıplı alt dizgi eşleyici: metin bir kez taranır ve içinde geçen tüm kalıplar bulunur
+    (kalıp sayısından bağımsız olarak metin uzunluğunda). Toplu üretimde her satır, tüm konuların
+    arama terimlerine karşı tek geçişte eşlenir.
+
+        matcher = AhoCorasick(["7.rp", "ratio"])
+        matcher.search("7.rp.a.1 p12")  -> {0}
+    """
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [frozenset()]
+
+        for pattern_id, pattern in enumerate(self.patterns):
+            if not pattern:
+                continue
+            node = 0
+            for ch in pattern:
+                child = self._goto[node].get(ch)
+                if child is None:
+                    child = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(frozenset())
+                    self._goto[node][ch] = child
+                node = child
+            self._out[node] = self._out[node] | {pattern_id}
+
+        # Genişlik öncelikli: her düğümün hata bağlantısı, kendisinin en uzun özel son ekine gider
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] | self._out[self._fail[child]]
+
+    def search(self, text):
+        """text içinde geçen kalıpların numaraları (küme)."""
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        found = set()
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found |= out[node]
+        return found
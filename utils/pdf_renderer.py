@@ -0,0 +1,102 @@
+"""
+Kaynak PDF'i için süreç başına bir kez kurulan WeasyPrint çizim bağlamı.
+
+Jinja şablonu bir kez derlenir (bytecode diske yazılır, yenilenen worker'lar yeniden derlemez),
+CSS bir kez ayrıştırılır ve `stylesheets=` ile verilir, FontConfiguration ve görsel önbelleği
+belgeler arasında paylaşılır. Böylece tekrar eden çizimlerde süre yalnızca AI'nın ürettiği
+gövdeye harcanır.
+"""
+import os
+import threading
+from datetime import datetime
+
+from jinja2 import Environment, DictLoader, FileSystemBytecodeCache
+from weasyprint import HTML, CSS
+from weasyprint.text.fonts import FontConfiguration
+
+
+TEMPLATE_CACHE_DIR = os.getenv("TEMPLATE_CACHE_DIR", os.path.join("data", "template_cache"))
+# Fontları alt kümeye ayırmadan gömer: çizim hızlanır, dosya büyür
+PDF_FULL_FONTS = os.getenv("PDF_FULL_FONTS", "0") == "1"
+IMAGE_CACHE_LIMIT = 64
+
+RESOURCES_CSS = """
+@page { margin: 2cm; }
+body { font-family: 'Helvetica', sans-serif; line-height: 1.6; color: #333; }
+h1 { color: #2c3e50; border-bottom: 2px solid #3498db; padding-bottom: 10px; }
+h3 { color: #e67e22; margin-top: 25px; border-left: 5px solid #e67e22; padding-left: 10px; }
+table { width: 100%; border-collapse: collapse; margin-top: 15px; font-size: 0.9em; }
+th, td { border: 1px solid #ddd; padding: 12px; text-align: left; }
+th { background-color: #f2f2f2; color: #2c3e50; }
+tr:nth-child(even) { background-color: #f9f9f9; }
+a { color: #2980b9; text-decoration: none; font-weight: bold; }
+ul { margin-top: 0; }
+.meta { font-size: 0.8em; color: #777; margin-bottom: 30px; }
+"""
+
+RESOURCES_TEMPLATE = """
+<html>
+<body>
+    <h1>Öğrenme Planı: {{ topic }}</h1>
+    <div class="meta">
+        <strong>Tarih:</strong> {{ date }} <br>
+        <strong>Program Türü:</strong> {{ subtitle }}
+    </div>
+
+    {{ ai_plan | safe }}
+
+</body>
+</html>
+"""
+
+
+class PdfRenderer:
+    def __init__(self, cache_dir=TEMPLATE_CACHE_DIR, full_fonts=PDF_FULL_FONTS):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.env = Environment(
+            loader=DictLoader({"resources.html": RESOURCES_TEMPLATE}),
+            bytecode_cache=FileSystemBytecodeCache(cache_dir),
+            autoescape=True
+        )
+        self.template = self.env.get_template("resources.html")
+        self.font_config = FontConfiguration()
+        self.stylesheets = [CSS(string=RESOURCES_CSS, font_config=self.font_config)]
+        self.image_cache = {}
+        self.full_fonts = full_fonts
+
+    def render_html(self, topic, ai_plan_html, duration=None):
+        return self.template.render(
+            topic=topic,
+            subtitle=f"Hedef Süre: {duration}" if duration else "Kapsamlı Öğrenme Rehberi",
+            date=datetime.today().strftime("%d.%m.%Y"),
+            ai_plan=ai_plan_html
+        )
+
+    def write_resources_pdf(self, topic, ai_plan_html, target=None, duration=None):
+        """target verilmezse PDF baytlarını döndürür."""
+        if len(self.image_cache) > IMAGE_CACHE_LIMIT:
+            self.image_cache.clear()
+        return HTML(string=self.render_html(topic, ai_plan_html, duration)).write_pdf(
+            target,
+            stylesheets=self.stylesheets,
+            font_config=self.font_config,
+            cache=self.image_cache,
+            full_fonts=self.full_fonts
+        )
+
+    def warm_up(self):
+        self.write_resources_pdf("Öğrenme", "<h3>Plan</h3><table><tr><th>Hafta</th></tr></table>")
+
+
+_local = threading.local()
+
+
+def get_renderer():
+    """
+    Thread başına tek çizici: Pango/FontConfiguration thread'ler arasında paylaşılmaz.
+    Çizim havuzu worker'larında bu, süreç başına bir çizici demektir.
+    """
+    renderer = getattr(_local, "renderer", None)
+    if renderer is None:
+        renderer = _local.renderer = PdfRenderer()
+    return renderer
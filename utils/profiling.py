@@ -0,0 +1,278 @@
+"""
+İstek bazında profil çıkarma. Kapalıyken (PROFILE_SECRET ve PROFILE_SAMPLE_RATE verilmemişse) hiçbir kanca
+kurulmaz, isteklere ek yük binmez.
+
+- İmzalı jeton: X-Profile-Token başlığı veya ?profile=<jeton> ile gelen istek cProfile altında çalışır;
+  pstats (.prof) ve ondan türetilen yaklaşık yığınlar (.collapsed) yazılır.
+      python -m utils.profiling token 3600   -> bir saat geçerli jeton
+- Örnekleme: PROFILE_SAMPLE_RATE=N ile ortalama her N istekten biri düşük yüklü örnekleyiciyle izlenir
+  (istek thread'inin yığını PROFILE_INTERVAL aralıkla okunur); yalnızca .collapsed yazılır.
+
+.collapsed dosyaları flamegraph.pl / speedscope ile açılır; .prof dosyaları pstats veya snakeviz ile.
+Son profiller GET /admin/profiles ile listelenir.
+"""
+import os
+import re
+import sys
+import hmac
+import json
+import time
+import random
+import pstats
+import hashlib
+import cProfile
+import threading
+from collections import Counter
+
+from . import metrics
+
+
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join("data", "profiles"))
+# Jetonları imzalayan gizli anahtar; yoksa jetonla profil ve yönetim uç noktası kapalıdır
+SECRET = os.getenv("PROFILE_SECRET", "")
+# 0: örnekleme kapalı, N: ortalama her N istekten biri
+SAMPLE_RATE = int(os.getenv("PROFILE_SAMPLE_RATE", 0))
+SAMPLE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", 0.005))
+# Saklanan en fazla profil sayısı (eskiler silinir)
+KEEP = int(os.getenv("PROFILE_KEEP", 50))
+# Profillenmeyen uç noktalar (kendi kendini ölçmesin)
+SKIP_ENDPOINTS = {"routes.metrics_endpoint", "routes.profiles_list", "routes.profile_file", "static"}
+MAX_DEPTH = 64
+
+PROFILES = metrics.counter("profiles_total", "Yazılan istek profilleri", ("trigger",))
+
+_NAME = re.compile(r"[^A-Za-z0-9._-]+")
+_prune_lock = threading.Lock()
+
+
+def enabled():
+    return bool(SECRET) or SAMPLE_RATE > 0
+
+
+# --- İmzalı Jeton ---
+
+def _sign(expires):
+    return hmac.new(SECRET.encode("utf-8"), f"profile:{expires}".encode("utf-8"), hashlib.sha256).hexdigest()[:32]
+
+
+def make_token(ttl=3600):
+    """'<bitiş zamanı>.<imza>' biçiminde jeton."""
+    if not SECRET:
+        raise ValueError("PROFILE_SECRET tanımlı değil.")
+    expires = int(time.time() + ttl)
+    return f"{expires}.{_sign(expires)}"
+
+
+def verify_token(token):
+    if not SECRET or not token or "." not in token:
+        return False
+    expires, signature = token.split(".", 1)
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    return hmac.compare_digest(signature, _sign(int(expires)))
+
+
+# --- Profil Çıkarıcılar ---
+
+class _CProfile:
+    kind = "cprofile"
+
+    def __init__(self):
+        self._profiler = cProfile.Profile()
+
+    def start(self):
+        self._profiler.enable()
+
+    def stop(self):
+        self._profiler.disable()
+
+    def write(self, base):
+        self._profiler.dump_stats(f"{base}.prof")
+        with open(f"{base}.collapsed", "w", encoding="utf-8") as f:
+            for stack, weight in collapse_pstats(pstats.Stats(self._profiler)):
+                f.write(f"{stack} {weight}\n")
+        return [f"{base}.prof", f"{base}.collapsed"]
+
+
+class _Sampler:
+    """İstek thread'inin yığınını ayrı bir thread'den periyodik okur (sys._current_frames)."""
+    kind = "sample"
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.samples = Counter()
+        self._target = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            stack = []
+            while frame is not None and len(stack) < MAX_DEPTH:
+                stack.append(_label(frame.f_code.co_filename, frame.f_code.co_name))
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def write(self, base):
+        with open(f"{base}.collapsed", "w", encoding="utf-8") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+        return [f"{base}.collapsed"]
+
+
+def _label(filename, name):
+    return f"{os.path.basename(filename)}:{name}".replace(";", ":").replace(" ", "_")
+
+
+def collapse_pstats(stats):
+    """
+    pstats çağrı grafiğinden yaklaşık yığınlar ((yığın, mikrosaniye) çiftleri).
+    cProfile tam yığın tutmaz: bir fonksiyonun süresi, onu çağıranlara kenar sürelerine (ct) göre paylaştırılır.
+    """
+    children = {}
+    totals = {}
+    for func, (_, _, tt, ct, callers) in stats.stats.items():
+        totals[func] = (tt, ct)
+        for caller, edge in callers.items():
+            children.setdefault(caller, []).append((func, edge[3]))
+
+    roots = [func for func, entry in stats.stats.items() if not entry[4]]
+    # Toplamın on binde birinden küçük dallar atlanır (yol sayısı sınırlı kalır)
+    floor = max(1e-6, sum(totals[root][1] for root in roots) * 1e-4)
+    out = Counter()
+
+    def walk(func, inclusive, stack, active):
+        tt, ct = totals[func]
+        scale = inclusive / ct if ct else 0.0
+        stack = stack + [_label(func[0], func[2])]
+        weight = int(tt * scale * 1e6)
+        if weight:
+            out[";".join(stack)] += weight
+        if len(stack) >= MAX_DEPTH:
+            return
+        for child, edge_ct in children.get(func, ()):
+            # Özyinelemeli çağrılar yığında bir kez gösterilir
+            if child not in active and edge_ct * scale >= floor:
+                walk(child, edge_ct * scale, stack, active | {child})
+
+    for root in roots:
+        walk(root, totals[root][1], [], {root})
+    return out.most_common()
+
+
+# --- Flask Kancaları ---
+
+def _wanted(request):
+    """İstek profillenecek mi: ('token', _CProfile) / ('sample', _Sampler) / None."""
+    if request.endpoint in SKIP_ENDPOINTS:
+        return None
+    token = request.headers.get("X-Profile-Token") or request.args.get("profile")
+    if token and verify_token(token):
+        return "token", _CProfile
+    if SAMPLE_RATE > 0 and random.random() * SAMPLE_RATE < 1:
+        return "sample", _Sampler
+    return None
+
+
+def init_app(app):
+    """Profil kapalıysa hiçbir kanca kurulmaz."""
+    if not enabled():
+        return
+    from flask import request, g
+
+    @app.before_request
+    def _start_profile():
+        wanted = _wanted(request)
+        if wanted is None:
+            return
+        trigger, factory = wanted
+        profiler = factory()
+        try:
+            profiler.start()
+        except ValueError as e:  # başka bir profil çıkarıcı etkin
+            print(f"Profil başlatılamadı: {e}")
+            return
+        g.profile = (trigger, profiler, time.perf_counter())
+
+    # Akış yanıtlarında teardown gövde bittikten sonra çalışır; profil gövdeyi de kapsar
+    @app.teardown_request
+    def _finish_profile(exc):
+        state = g.pop("profile", None)
+        if state is None:
+            return
+        trigger, profiler, started = state
+        profiler.stop()
+        try:
+            save(profiler, trigger, request.endpoint or "unknown", request.path, time.perf_counter() - started)
+        except OSError as e:
+            print(f"Profil yazılamadı: {e}")
+
+
+def save(profiler, trigger, endpoint, path, seconds):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    rid = metrics.request_id.get() or "-"
+    name = _NAME.sub("-", f"{time.strftime('%Y%m%d-%H%M%S')}_{endpoint}_{rid}")
+    base = os.path.join(PROFILE_DIR, name)
+    files = profiler.write(base)
+    with open(f"{base}.json", "w", encoding="utf-8") as f:
+        json.dump({
+            "name": name,
+            "endpoint": endpoint,
+            "path": path,
+            "request_id": rid,
+            "trigger": trigger,
+            "profiler": profiler.kind,
+            "seconds": round(seconds, 4),
+            "created": time.time(),
+            "files": [os.path.basename(p) for p in files]
+        }, f, ensure_ascii=False)
+    PROFILES.inc(trigger=trigger)
+    print(f"Profil yazıldı: {name} ({seconds:.3f} sn, {profiler.kind})")
+    prune()
+    return name
+
+
+def recent(limit=KEEP):
+    """Son profillerin bilgileri (yeniden eskiye)."""
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    entries = []
+    for name in os.listdir(PROFILE_DIR):
+        if not name.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(PROFILE_DIR, name), encoding="utf-8") as f:
+                entries.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    entries.sort(key=lambda e: e.get("created", 0), reverse=True)
+    return entries[:limit]
+
+
+def prune(keep=KEEP):
+    with _prune_lock:
+        for entry in recent(limit=None)[keep:]:
+            for name in entry.get("files", []) + [f"{entry['name']}.json"]:
+                try:
+                    os.remove(os.path.join(PROFILE_DIR, name))
+                except OSError:
+                    pass
+
+
+if __name__ == "__main__":
+    # Kullanım: python -m utils.profiling token [saniye] | python -m utils.profiling list
+    command = sys.argv[1] if len(sys.argv) > 1 else "list"
+    if command == "token":
+        print(make_token(int(sys.argv[2]) if len(sys.argv) > 2 else 3600))
+    else:
+        for item in recent():
+            print(f"{item['name']}  {item['seconds']} sn  {item['profiler']}  {', '.join(item['files'])}")
@@ -0,0 +1,169 @@
+import os
+import time
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+from . import metrics
+
+
+# RENDER_POOL_WORKERS sunucu geneli toplamdır (0 = havuz kapalı, istek thread'inde çiz). gunicorn altında her
+# worker kendi havuzunu açtığından toplam worker sayısına (SERVER_WORKERS, gunicorn.conf.py ayarlar) bölünür;
+# RENDER_POOL_PER_WORKER verilirse worker başına boyut doğrudan odur.
+RENDER_POOL_SIZE = int(os.getenv("RENDER_POOL_WORKERS", 2))
+SERVER_WORKERS = max(1, int(os.getenv("SERVER_WORKERS", 1)))
+
+
+def _workers_per_process():
+    explicit = os.getenv("RENDER_POOL_PER_WORKER")
+    if explicit:
+        return int(explicit)
+    if RENDER_POOL_SIZE <= 0:
+        return 0
+    return max(1, RENDER_POOL_SIZE // SERVER_WORKERS)
+
+
+RENDER_WORKERS = _workers_per_process()
+RENDER_MAX_TASKS = int(os.getenv("RENDER_POOL_MAX_TASKS", 50))  # bu kadar işten sonra worker yenilenir
+RENDER_TIMEOUT = float(os.getenv("RENDER_TIMEOUT", 60))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _init_worker():
+    """Worker açılışında ağır kütüphaneleri (WeasyPrint, fontlar, matplotlib) bir kez yükler."""
+    from . import ai_pdf_generator
+    ai_pdf_generator.warm_up_renderers()
+
+
+def _ping():
+    return os.getpid()
+
+
+def _render_task(kind, path, args):
+    from . import ai_pdf_generator as gen
+
+    if kind == "resources":
+        topic, plan_html, duration = args
+        return gen.render_atomic(lambda tmp: gen.export_resources_pdf(topic, plan_html, tmp, duration), path)
+    if kind == "timeline":
+        (steps,) = args
+        return gen.render_atomic(lambda tmp: gen.create_timeline_pdf(steps, tmp), path)
+    raise ValueError(f"Bilinmeyen çizim türü: {kind}")
+
+
+def _context():
+    # fork, thread'li bir sunucuda kilit durumlarını kopyalayabilir; forkserver/spawn güvenlidir.
+    # forkserver, çizim modülünü bir kez yükler; yenilenen worker'lar bu hazır süreçten kopyalanır.
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(["utils.ai_pdf_generator", "utils.pdf_renderer"])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+def _get_pool():
+    global _pool
+    if RENDER_WORKERS <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=RENDER_WORKERS,
+                mp_context=_context(),
+                initializer=_init_worker,
+                max_tasks_per_child=RENDER_MAX_TASKS
+            )
+        return _pool
+
+
+def _reset_pool():
+    """Takılan/çöken havuzu kapatır; bir sonraki çizim yeni worker'larla başlar."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is None:
+        return
+    for process in list((getattr(pool, "_processes", None) or {}).values()):
+        process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def start():
+    """Worker'ları önceden başlatır (ilk istek süreç açılışını beklemesin)."""
+    pool = _get_pool()
+    if pool is None:
+        return
+    try:
+        for future in [pool.submit(_ping) for _ in range(RENDER_WORKERS)]:
+            future.result()
+        print(f"PDF çizim havuzu hazır: {RENDER_WORKERS} worker.")
+    except Exception as e:
+        print(f"PDF çizim havuzu başlatılamadı: {e}")
+        _reset_pool()
+
+
+def render_all(tasks, timeout=RENDER_TIMEOUT, progress=None):
+    """
+    tasks: [(aşama, tür, hedef_yol, argümanlar), ...] -> {hedef_yol: başarılı_mı}
+    Belgeler havuzdaki ayrı süreçlerde paralel çizilir; her birine `timeout` saniye verilir.
+    Havuz kapalıysa veya çökerse aynı işler istek thread'inde sırayla yapılır.
+    """
+    report = progress or (lambda stage: None)
+    results = {}
+
+    pool = _get_pool()
+    if pool is not None:
+        try:
+            report(tasks[0][0])
+            futures = []
+            for stage, kind, path, args in tasks:
+                future = pool.submit(_render_task, kind, path, args)
+                future.add_done_callback(_observer(kind, time.perf_counter()))
+                futures.append((stage, path, future))
+            deadline = time.monotonic() + timeout
+            timed_out = False
+
+            for i, (stage, path, future) in enumerate(futures):
+                try:
+                    results[path] = future.result(timeout=max(0, deadline - time.monotonic()))
+                except FutureTimeout:
+                    print(f"PDF çizimi zaman aşımına uğradı ({timeout} sn): {path}")
+                    results[path] = False
+                    timed_out = True
+                except BrokenProcessPool:
+                    raise
+                except Exception as e:
+                    print(f"PDF çizim hatası: {e}")
+                    results[path] = False
+                if i + 1 < len(futures):
+                    report(futures[i + 1][0])
+
+            if timed_out:
+                # Takılan worker başka türlü durdurulamaz
+                _reset_pool()
+            return results
+        except BrokenProcessPool:
+            print("PDF çizim havuzu çöktü, yeniden başlatılıyor; bu istek için sırayla çiziliyor.")
+            _reset_pool()
+
+    for stage, kind, path, args in tasks:
+        report(stage)
+        # Başarısız çizim istisna değil False döndürür; metrics.span bunu 'ok' sayacağı için durum elle yazılır
+        started = time.perf_counter()
+        results[path] = False
+        try:
+            results[path] = _render_task(kind, path, args)
+        finally:
+            metrics.observe_stage("render", time.perf_counter() - started, kind, "ok" if results[path] else "error")
+    return results
+
+
+def _observer(kind, started):
+    """Her belgenin çizim süresi, işi bitiren future'ın tamamlanma anına göre ölçülür."""
+    def observe(future):
+        status = "ok" if not future.cancelled() and future.exception() is None and future.result() else "error"
+        metrics.observe_stage("render", time.perf_counter() - started, kind, status)
+    return observe
@@ -0,0 +1,74 @@
+import os
+import time
+import threading
+
+from .disk_cache import DiskCache
+
+
+# Sağlayıcı başına tazelik süresi (saniye): Wikipedia nadiren değişir, arama sonuçları daha sık
+PROVIDER_TTLS = {
+    "Wikipedia": int(os.getenv("RESOURCE_TTL_WIKIPEDIA", 7 * 24 * 60 * 60)),
+    "Videos": int(os.getenv("RESOURCE_TTL_VIDEOS", 6 * 60 * 60)),
+    "Articles": int(os.getenv("RESOURCE_TTL_ARTICLES", 6 * 60 * 60))
+}
+DEFAULT_TTL = 60 * 60
+# Süresi dolan kayıt bu kadar süre daha "bayat" olarak sunulabilir (arka planda yenilenirken)
+STALE_GRACE = int(os.getenv("RESOURCE_STALE_GRACE", 7 * 24 * 60 * 60))
+
+_cache = DiskCache("resources", max_entries=int(os.getenv("RESOURCE_CACHE_SIZE", 20000)), stale_grace=STALE_GRACE)
+
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+_stale_hits = 0
+
+
+def cache_key(provider, topic):
+    return f"{provider}:{' '.join(topic.casefold().split())}"
+
+
+def lookup(provider, topic):
+    """
+    (items, 'fresh' | 'stale') veya kayıt yoksa (None, None) döndürür.
+    Önbellek okunamazsa (disk/kilit hatası) kayıt yokmuş gibi davranılır.
+    """
+    global _stale_hits
+    try:
+        entry = _cache.get(cache_key(provider, topic), allow_stale=True)
+    except Exception as e:
+        print(f"Kaynak önbelleği okunamadı: {e}")
+        return None, None
+
+    if entry is None:
+        return None, None
+    if entry.expires < time.time():
+        _stale_hits += 1
+        return entry.value, "stale"
+    return entry.value, "fresh"
+
+
+def store(provider, topic, items):
+    try:
+        _cache.set(cache_key(provider, topic), items, PROVIDER_TTLS.get(provider, DEFAULT_TTL))
+    except Exception as e:
+        print(f"Kaynak önbelleğine yazılamadı: {e}")
+
+
+def claim_refresh(provider, topic):
+    """Aynı kayıt için süreç içinde tek bir arka plan yenilemesi çalışsın."""
+    key = cache_key(provider, topic)
+    with _refreshing_lock:
+        if key in _refreshing:
+            return False
+        _refreshing.add(key)
+        return True
+
+
+def release_refresh(provider, topic):
+    with _refreshing_lock:
+        _refreshing.discard(cache_key(provider, topic))
+
+
+def stats():
+    data = _cache.stats()
+    data["stale_hits"] = _stale_hits
+    return data
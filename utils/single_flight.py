@@ -0,0 +1,195 @@
+"""
+Aynı anda gelen özdeş isteklerin tek bir hesaplamada birleştirilmesi (single-flight).
+
+    flight = SingleFlight("generate")
+    stem = flight.do(make_key(topic, duration, source), run_generation, topic, duration)
+
+Süreç içinde: aynı anahtarla ilk gelen (leader) işi yapar, sonradan gelenler onun bitmesini bekleyip
+aynı sonucu (veya aynı hatayı) alır. progress=callback verilirse fn'e leader'ın yayın callback'i geçer:
+her aşama leader'a ve bekleyenlere bildirilir, sonradan katılan o anki aşamayı hemen alır.
+Süreçler arasında: leader işi LOCK_DIR altında anahtara özgü bir kilit dosyasını (fcntl.flock) tutarak
+yapar (süreç içinde paylaşan istekler kilit almaz); diğer worker'daki leader kilidi bekler, sonra işi
+kendisi çalıştırır ve iş kendi önbelleklerine (artifact_cache, resource_cache) baktığı için ilk sürecin
+sonucunu hazır bulur.
+"""
+import os
+import time
+import hashlib
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: yalnızca süreç içi birleştirme
+    fcntl = None
+
+from . import metrics
+
+
+LOCK_DIR = os.getenv("SINGLE_FLIGHT_DIR", os.path.join("data", "locks"))
+# Bekleyen istek bu süreden sonra işi kendisi yapar
+WAIT_TIMEOUT = float(os.getenv("SINGLE_FLIGHT_WAIT", 120))
+POLL_INTERVAL = 0.05
+
+FLIGHTS = metrics.counter(
+    "single_flight_total",
+    "Tekilleştirme: leader = işi yapan, shared = süreç içinde sonucu paylaşan, waited = başka sürecin işini bekleyen",
+    ("name", "role")
+)
+
+
+def make_key(*parts):
+    return "\x1f".join(" ".join(str(part).casefold().split()) if part else "" for part in parts)
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.stage = None
+        self.listeners = []
+        self.lock = threading.Lock()
+
+    def listen(self, progress):
+        with self.lock:
+            self.listeners.append(progress)
+            if self.stage is not None:
+                progress(self.stage)
+
+    def report(self, stage):
+        with self.lock:
+            self.stage = stage
+            for listener in self.listeners:
+                try:
+                    listener(stage)
+                except Exception as e:
+                    print(f"İlerleme bildirilemedi ({stage}): {e}")
+
+
+class SingleFlight:
+    def __init__(self, name, lock_dir=LOCK_DIR, wait_timeout=WAIT_TIMEOUT):
+        self.name = name
+        self.lock_dir = lock_dir
+        self.wait_timeout = wait_timeout
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, *args, **kwargs):
+        share_progress = "progress" in kwargs
+        progress = kwargs.pop("progress", None)
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if share_progress:
+            kwargs["progress"] = progress
+        if not leader:
+            FLIGHTS.inc(name=self.name, role="shared")
+            if progress:
+                call.listen(progress)
+            if not call.done.wait(self.wait_timeout):
+                print(f"Tekilleştirme bekleme süresi doldu ({self.name}), istek ayrıca işleniyor.")
+                return fn(*args, **kwargs)
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        FLIGHTS.inc(name=self.name, role="leader")
+        if share_progress:
+            if progress:
+                call.listen(progress)
+            kwargs["progress"] = call.report
+        try:
+            with self._process_lock(key):
+                call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+    # --- Süreçler Arası Kilit ---
+
+    def _lock_path(self, key):
+        """Her anahtarın kendi kilit dosyası; farklı anahtarlar birbirini beklemez."""
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.lock_dir, f"{self.name}-{digest}.lock")
+
+    @contextmanager
+    def _process_lock(self, key):
+        if fcntl is None or not self.lock_dir:
+            yield
+            return
+        path = self._lock_path(key)
+        fd = self._acquire(path)
+        try:
+            yield
+        finally:
+            if fd is not None:
+                # Dosya kilit tutulurken silinir; bekleyenler _acquire'da yeni dosyayı açar (dosyalar birikmez)
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
+
+    def _open_lock(self, path):
+        try:
+            os.makedirs(self.lock_dir, exist_ok=True)
+            return os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        except OSError as e:
+            print(f"Kilit dosyası açılamadı ({self.name}): {e}")
+            return None
+
+    @staticmethod
+    def _is_current(fd, path):
+        """Kilitlenen dosya hâlâ yoldaki dosya mı (önceki sahibi silip yenisi oluşturulmuş olabilir)."""
+        try:
+            return os.fstat(fd).st_ino == os.stat(path).st_ino
+        except OSError:
+            return False
+
+    def _acquire(self, path):
+        """
+        Kilidi alıp dosya tanıtıcısını döndürür; başka süreç tutuyorsa WAIT_TIMEOUT'a kadar bekler.
+        Süre dolarsa veya kilit alınamazsa None (kilitsiz devam edilir).
+        """
+        deadline = time.monotonic() + self.wait_timeout
+        waited = False
+        while True:
+            fd = self._open_lock(path)
+            if fd is None:
+                return None
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    pass
+                except OSError as e:
+                    print(f"Kilit alınamadı ({self.name}): {e}")
+                    os.close(fd)
+                    return None
+                if not waited:
+                    waited = True
+                    FLIGHTS.inc(name=self.name, role="waited")
+                if time.monotonic() >= deadline:
+                    os.close(fd)
+                    print(f"Süreçler arası kilit bekleme süresi doldu ({self.name}), kilitsiz devam ediliyor.")
+                    return None
+                time.sleep(POLL_INTERVAL)
+            if self._is_current(fd, path):
+                return fd
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
@@ -0,0 +1,160 @@
+import os
+import json
+import shutil
+
+import numpy as np
+
+
+INDEX_DIRNAME = "index"
+NGRAM = 3
+
+
+def ngrams(text, n=NGRAM):
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def _csr(groups, size):
+    """{anahtar_indeksi: [id, ...]} -> (offsets, postings) sıkıştırılmış int32 dizileri."""
+    counts = np.zeros(size, dtype=np.int64)
+    for key, ids in groups.items():
+        counts[key] = len(ids)
+    offsets = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    postings = np.empty(offsets[-1], dtype=np.int32)
+    for key, ids in groups.items():
+        postings[offsets[key]:offsets[key + 1]] = sorted(ids)
+    return offsets, postings
+
+
+class SkillIndex:
+    """
+    skills ve problem_id sütunları için iki seviyeli ters indeks:
+      trigram  -> sözlük girdileri (ör. '.rp' -> ['7.RP.A.1', '7.RP.A.2', ...])
+      girdi    -> satır numaraları (ör. '7.RP.A.1' -> [12, 57, ...], artan sırada)
+    Alt dizgi sorgusu, terimin trigramlarının posting listelerinin kesişimi olur;
+    aday girdiler son olarak gerçek alt dizgi kontrolünden geçirilir.
+    """
+
+    def __init__(self, path, lower_strings):
+        self.path = path
+        self.lower = lower_strings
+        self._columns = {}
+
+    # --- Kalıcılık ---
+
+    @staticmethod
+    def build(store_path, columns, lower_strings):
+        """Verilen versiyon klasörünün yanına index/ klasörünü oluşturur."""
+        target = os.path.join(store_path, INDEX_DIRNAME)
+        if os.path.isdir(target):
+            return target
+
+        tmp = f"{target}.{os.getpid()}.tmp"
+        os.makedirs(tmp, exist_ok=True)
+        try:
+            for col, codes in columns.items():
+                values = lower_strings[col]
+
+                # girdi -> satırlar: kararlı sıralama satırları artan tutar
+                codes = np.asarray(codes)
+                order = np.argsort(codes, kind="stable").astype(np.int32)
+                row_offsets = np.zeros(len(values) + 1, dtype=np.int64)
+                np.cumsum(np.bincount(codes, minlength=len(values)), out=row_offsets[1:])
+                np.save(os.path.join(tmp, f"{col}.rows.npy"), order)
+                np.save(os.path.join(tmp, f"{col}.row_offsets.npy"), row_offsets)
+
+                # trigram -> girdiler
+                grams = {}
+                for entry, value in enumerate(values):
+                    for gram in ngrams(value):
+                        grams.setdefault(gram, []).append(entry)
+                keys = sorted(grams)
+                offsets, postings = _csr({i: grams[k] for i, k in enumerate(keys)}, len(keys))
+                np.save(os.path.join(tmp, f"{col}.gram_offsets.npy"), offsets)
+                np.save(os.path.join(tmp, f"{col}.gram_postings.npy"), postings)
+                with open(os.path.join(tmp, f"{col}.grams.json"), "w", encoding="utf-8") as f:
+                    json.dump(keys, f, ensure_ascii=False)
+
+            try:
+                os.rename(tmp, target)
+            except OSError:
+                pass  # başka bir süreç aynı anda oluşturdu
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        return target
+
+    def _column(self, col):
+        """Sütun indeksini ilk ihtiyaçta mmap ile yükler."""
+        data = self._columns.get(col)
+        if data is None:
+            def load(name):
+                return np.load(os.path.join(self.path, f"{col}.{name}.npy"), mmap_mode='r')
+
+            with open(os.path.join(self.path, f"{col}.grams.json"), encoding="utf-8") as f:
+                keys = json.load(f)
+            data = {
+                "grams": {k: i for i, k in enumerate(keys)},
+                "gram_offsets": load("gram_offsets"),
+                "gram_postings": load("gram_postings"),
+                "row_offsets": load("row_offsets"),
+                "rows": load("rows")
+            }
+            self._columns[col] = data
+        return data
+
+    # --- Sorgu ---
+
+    def match_entries(self, col, term):
+        """term'i alt dizgi olarak içeren sözlük girdilerini döndürür."""
+        values = self.lower[col]
+        if len(term) < NGRAM:
+            return np.array([e for e, v in enumerate(values) if term in v], dtype=np.int32)
+
+        data = self._column(col)
+        grams = data["grams"]
+        offsets, postings = data["gram_offsets"], data["gram_postings"]
+
+        lists = []
+        for gram in ngrams(term):
+            key = grams.get(gram)
+            if key is None:
+                return np.empty(0, dtype=np.int32)
+            lists.append(postings[offsets[key]:offsets[key + 1]])
+
+        lists.sort(key=len)
+        candidates = lists[0]
+        for other in lists[1:]:
+            if not len(candidates):
+                break
+            candidates = np.intersect1d(candidates, other, assume_unique=True)
+
+        return np.array([e for e in candidates if term in values[e]], dtype=np.int32)
+
+    def rows_for_entries(self, col, entries, limit=None):
+        data = self._column(col)
+        offsets, rows = data["row_offsets"], data["rows"]
+        chunks = []
+        for e in entries:
+            start, end = offsets[e], offsets[e + 1]
+            if limit is not None:
+                end = min(end, start + limit)
+            chunks.append(rows[start:end])
+        return chunks
+
+    def search(self, terms, limit=50):
+        """
+        Terimlerden herhangi biriyle eşleşen satır numaralarını (veri seti sırasıyla) döndürür.
+        Her girdinin satır listesi sıralı olduğundan ilk `limit` sonuç için
+        her listeden en fazla `limit` eleman yeterlidir.
+        """
+        chunks = []
+        for col in self.lower:
+            for term in terms:
+                entries = self.match_entries(col, term)
+                if len(entries):
+                    chunks.extend(self.rows_for_entries(col, entries, limit))
+
+        if not chunks:
+            return np.empty(0, dtype=np.int32)
+        found = np.unique(np.concatenate(chunks))
+        return found if limit is None else found[:limit]
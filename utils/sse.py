@@ -0,0 +1,6 @@
+import json
+
+
+def format_event(event, data):
+    """Tek bir server-sent events mesajı üretir (data JSON olarak kodlanır)."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
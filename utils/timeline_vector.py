@@ -0,0 +1,319 @@
+"""
+Yol haritası (timeline) için matplotlib'siz vektör çizici.
+
+create_timeline_pdf'in matplotlib sürümüyle aynı yerleşimi hesaplar (sinüs yolu üzerinde
+numaralı daireler, kesikli bağlantı çizgisi, 25 karakterde kırılan etiketler, aynı renk
+döngüsü) ve sonucu doğrudan PDF çizim komutları veya SVG olarak yazar.
+Modül düzeyinde değişen durum yoktur; aynı anda birden çok thread'den çağrılabilir.
+"""
+import math
+import zlib
+import textwrap
+import unicodedata
+
+
+COLORS = ['#e74c3c', '#3498db', '#9b59b6', '#2ecc71', '#f1c40f', '#34495e']
+LINE_COLOR = '#bdc3c7'
+TEXT_COLOR = '#2c3e50'
+
+# matplotlib varsayılanlarıyla aynı ölçüler (pt)
+FIG_WIDTH = 8 * 72
+AXES_BOX = (0.125, 0.11, 0.9, 0.88)  # figure.subplot.left/bottom/right/top
+X_LIMITS = (-5, 5)
+CIRCLE_RADIUS = 0.3
+LABEL_OFFSET = 0.6
+LINE_WIDTH = 4
+DASH = (3.7 * LINE_WIDTH, 1.6 * LINE_WIDTH)
+NUMBER_SIZE = 10
+LABEL_SIZE = 11
+LINE_SPACING = 1.2
+BOX_PAD = 0.4 * LABEL_SIZE
+BOX_LINE_WIDTH = 1.5
+TIGHT_PAD = 0.1 * 72
+WRAP_WIDTH = 25
+
+# Helvetica-Bold genişlikleri (1/1000 em, Adobe AFM), ASCII 32..126
+_HELVETICA_BOLD = [
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584
+]
+_DEFAULT_WIDTH = 556
+
+# Türkçe karakterler cp1254 ile kodlanır; WinAnsi'den farklı olan 6 konum font kodlamasında tanımlanır
+_TURKISH_DIFFERENCES = "[208 /Gbreve 221 /Idotaccent 222 /Scedilla 240 /gbreve 253 /dotlessi 254 /scedilla]"
+
+
+def text_width(text, size):
+    total = 0
+    for char in text:
+        code = ord(char)
+        if not 32 <= code <= 126:
+            # ç -> c, Ğ -> G ...; ı için i'nin genişliği
+            base = unicodedata.normalize("NFD", char)[0] if char != "ı" else "i"
+            code = ord(base)
+        total += _HELVETICA_BOLD[code - 32] if 32 <= code <= 126 else _DEFAULT_WIDTH
+    return total * size / 1000
+
+
+def _hex_to_rgb(color):
+    color = color.lstrip("#")
+    return tuple(int(color[i:i + 2], 16) / 255 for i in (0, 2, 4))
+
+
+def layout(steps):
+    """
+    Tüm çizim öğelerini sayfa koordinatlarında (pt, sol-alt köşe orijin) hesaplar.
+    Sayfa, bbox_inches='tight' gibi içeriğin etrafına kırpılır.
+    """
+    import numpy as np
+
+    num_steps = len(steps)
+    fig_height = max(8, num_steps * 1.2) * 72
+
+    left, bottom, right, top = AXES_BOX
+    ax_x, ax_y = left * FIG_WIDTH, bottom * fig_height
+    sx = (right - left) * FIG_WIDTH / (X_LIMITS[1] - X_LIMITS[0])
+    sy = (top - bottom) * fig_height / (num_steps + 2)  # ylim(-1, num_steps + 1)
+
+    def to_page(x, y):
+        return ax_x + (x - X_LIMITS[0]) * sx, ax_y + (y + 1) * sy
+
+    y_positions = np.linspace(num_steps, 0, num_steps)
+    x_positions = np.sin(np.linspace(0, num_steps, num_steps) * 1.5) * 2
+
+    path = [to_page(x, y) for x, y in zip(x_positions, y_positions)]
+    markers = []
+    labels = []
+
+    for i, (x, y, text) in enumerate(zip(x_positions, y_positions, steps)):
+        color = COLORS[i % len(COLORS)]
+        cx, cy = to_page(x, y)
+        markers.append({"cx": cx, "cy": cy, "rx": CIRCLE_RADIUS * sx, "ry": CIRCLE_RADIUS * sy,
+                        "color": color, "number": str(i + 1)})
+
+        anchor = "left" if x >= 0 else "right"
+        tx, _ = to_page(x + (LABEL_OFFSET if x >= 0 else -LABEL_OFFSET), y)
+        lines = textwrap.wrap(text, width=WRAP_WIDTH) or [""]
+        width = max(text_width(line, LABEL_SIZE) for line in lines)
+        height = len(lines) * LABEL_SIZE * LINE_SPACING
+        x0 = tx if anchor == "left" else tx - width
+        labels.append({
+            "lines": lines, "anchor": anchor, "x": tx, "cy": cy, "color": color,
+            "box": (x0 - BOX_PAD, cy - height / 2 - BOX_PAD, width + 2 * BOX_PAD, height + 2 * BOX_PAD)
+        })
+
+    # İçerik sınırları + 0.1 inç pay
+    xs, ys = [], []
+    for px, py in path:
+        xs += [px - LINE_WIDTH, px + LINE_WIDTH]
+        ys += [py - LINE_WIDTH, py + LINE_WIDTH]
+    for m in markers:
+        xs += [m["cx"] - m["rx"], m["cx"] + m["rx"]]
+        ys += [m["cy"] - m["ry"], m["cy"] + m["ry"]]
+    for label in labels:
+        bx, by, bw, bh = label["box"]
+        xs += [bx - BOX_LINE_WIDTH, bx + bw + BOX_LINE_WIDTH]
+        ys += [by - BOX_LINE_WIDTH, by + bh + BOX_LINE_WIDTH]
+    if not xs:
+        xs, ys = [0, FIG_WIDTH], [0, fig_height]
+
+    origin_x, origin_y = min(xs) - TIGHT_PAD, min(ys) - TIGHT_PAD
+    return {
+        "width": max(xs) + TIGHT_PAD - origin_x,
+        "height": max(ys) + TIGHT_PAD - origin_y,
+        "origin": (origin_x, origin_y),
+        "path": path,
+        "markers": markers,
+        "labels": labels
+    }
+
+
+def _line_baselines(label):
+    """Çok satırlı etiket bloğu dikeyde ortalanır; her satırın taban çizgisi."""
+    line_height = LABEL_SIZE * LINE_SPACING
+    top = label["cy"] + len(label["lines"]) * line_height / 2
+    return [top - (i + 0.5) * line_height - 0.36 * LABEL_SIZE for i in range(len(label["lines"]))]
+
+
+# --- PDF ---
+
+def _num(value):
+    return f"{value:.2f}".rstrip("0").rstrip(".") or "0"
+
+
+def _ellipse_ops(cx, cy, rx, ry):
+    k = 0.5523
+    return (
+        f"{_num(cx + rx)} {_num(cy)} m "
+        f"{_num(cx + rx)} {_num(cy + k * ry)} {_num(cx + k * rx)} {_num(cy + ry)} {_num(cx)} {_num(cy + ry)} c "
+        f"{_num(cx - k * rx)} {_num(cy + ry)} {_num(cx - rx)} {_num(cy + k * ry)} {_num(cx - rx)} {_num(cy)} c "
+        f"{_num(cx - rx)} {_num(cy - k * ry)} {_num(cx - k * rx)} {_num(cy - ry)} {_num(cx)} {_num(cy - ry)} c "
+        f"{_num(cx + k * rx)} {_num(cy - ry)} {_num(cx + rx)} {_num(cy - k * ry)} {_num(cx + rx)} {_num(cy)} c h"
+    )
+
+
+def _round_rect_ops(x, y, w, h, r):
+    k = 0.5523 * r
+    return (
+        f"{_num(x + r)} {_num(y)} m {_num(x + w - r)} {_num(y)} l "
+        f"{_num(x + w - r + k)} {_num(y)} {_num(x + w)} {_num(y + r - k)} {_num(x + w)} {_num(y + r)} c "
+        f"{_num(x + w)} {_num(y + h - r)} l "
+        f"{_num(x + w)} {_num(y + h - r + k)} {_num(x + w - r + k)} {_num(y + h)} {_num(x + w - r)} {_num(y + h)} c "
+        f"{_num(x + r)} {_num(y + h)} l "
+        f"{_num(x + r - k)} {_num(y + h)} {_num(x)} {_num(y + h - r + k)} {_num(x)} {_num(y + h - r)} c "
+        f"{_num(x)} {_num(y + r)} l "
+        f"{_num(x)} {_num(y + r - k)} {_num(x + r - k)} {_num(y)} {_num(x + r)} {_num(y)} c h"
+    )
+
+
+def can_encode(steps):
+    """
+    Adımlar gömülü Type1 fontla (cp1254) yazılabiliyor mu. √, π, ≤ gibi karakterler yazılamaz;
+    bu adımlar için matplotlib çizicisi kullanılmalıdır.
+    """
+    try:
+        "".join(steps).encode("cp1254")
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+def _pdf_string(text):
+    # Sessizce '?' yazmak yerine hata verir (UnicodeEncodeError); çağıran can_encode ile önceden bakar
+    data = text.encode("cp1254")
+    return b"(" + data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def _rgb(color, op):
+    r, g, b = _hex_to_rgb(color)
+    return f"{_num(r)} {_num(g)} {_num(b)} {op}"
+
+
+def render_pdf(steps):
+    """Yol haritasını PDF baytları olarak üretir."""
+    page = layout(steps)
+    ox, oy = page["origin"]
+    ops = [f"1 0 0 1 {_num(-ox)} {_num(-oy)} cm".encode()]
+
+    # Kesikli bağlantı çizgisi (alpha 0.5)
+    if len(page["path"]) > 1:
+        points = page["path"]
+        segments = [f"{_num(points[0][0])} {_num(points[0][1])} m"]
+        segments += [f"{_num(x)} {_num(y)} l" for x, y in points[1:]]
+        ops.append((
+            f"q /GS50 gs {_rgb(LINE_COLOR, 'RG')} {LINE_WIDTH} w 0 J 1 j "
+            f"[{_num(DASH[0])} {_num(DASH[1])}] 0 d {' '.join(segments)} S Q"
+        ).encode())
+
+    for marker in page["markers"]:
+        ops.append((
+            f"q {_rgb(marker['color'], 'rg')} {_rgb(marker['color'], 'RG')} 1 w "
+            f"{_ellipse_ops(marker['cx'], marker['cy'], marker['rx'], marker['ry'])} B Q"
+        ).encode())
+        width = text_width(marker["number"], NUMBER_SIZE)
+        ops.append(
+            f"BT /F1 {NUMBER_SIZE} Tf 1 1 1 rg {_num(marker['cx'] - width / 2)} "
+            f"{_num(marker['cy'] - 0.36 * NUMBER_SIZE)} Td ".encode()
+            + _pdf_string(marker["number"]) + b" Tj ET"
+        )
+
+    for label in page["labels"]:
+        x, y, w, h = label["box"]
+        ops.append((
+            f"q /GS90 gs 1 1 1 rg {_rgb(label['color'], 'RG')} {BOX_LINE_WIDTH} w "
+            f"{_round_rect_ops(x, y, w, h, BOX_PAD)} B Q"
+        ).encode())
+        for line, baseline in zip(label["lines"], _line_baselines(label)):
+            line_x = label["x"] if label["anchor"] == "left" else label["x"] - text_width(line, LABEL_SIZE)
+            ops.append(
+                f"BT /F1 {LABEL_SIZE} Tf {_rgb(TEXT_COLOR, 'rg')} {_num(line_x)} {_num(baseline)} Td ".encode()
+                + _pdf_string(line) + b" Tj ET"
+            )
+
+    content = zlib.compress(b"\n".join(ops))
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {_num(page['width'])} {_num(page['height'])}] "
+         "/Resources << /Font << /F1 4 0 R >> /ExtGState << /GS50 5 0 R /GS90 6 0 R >> >> "
+         "/Contents 7 0 R >>").encode(),
+        (f"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold "
+         f"/Encoding << /Type /Encoding /BaseEncoding /WinAnsiEncoding /Differences {_TURKISH_DIFFERENCES} >> >>").encode(),
+        b"<< /Type /ExtGState /CA 0.5 /ca 0.5 >>",
+        b"<< /Type /ExtGState /CA 0.9 /ca 0.9 >>",
+        f"<< /Length {len(content)} /Filter /FlateDecode >>\nstream\n".encode() + content + b"\nendstream"
+    ]
+
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def write_pdf(steps, filename):
+    data = render_pdf(steps)
+    with open(filename, "wb") as f:
+        f.write(data)
+
+
+# --- SVG ---
+
+def _escape(text):
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def render_svg(steps):
+    """Aynı yerleşimi SVG olarak üretir (web/mobil önizleme için)."""
+    page = layout(steps)
+    ox, oy = page["origin"]
+    height = page["height"]
+
+    def fx(x):
+        return _num(x - ox)
+
+    def fy(y):
+        # SVG'de y aşağı doğru artar
+        return _num(height - (y - oy))
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{_num(page["width"])}pt" height="{_num(height)}pt" '
+        f'viewBox="0 0 {_num(page["width"])} {_num(height)}" '
+        'font-family="Helvetica, Arial, sans-serif" font-weight="bold">'
+    ]
+    if len(page["path"]) > 1:
+        points = " ".join(f"{fx(x)},{fy(y)}" for x, y in page["path"])
+        parts.append(
+            f'<polyline points="{points}" fill="none" stroke="{LINE_COLOR}" stroke-opacity="0.5" '
+            f'stroke-width="{LINE_WIDTH}" stroke-dasharray="{_num(DASH[0])} {_num(DASH[1])}" stroke-linejoin="round"/>'
+        )
+    for marker in page["markers"]:
+        parts.append(
+            f'<ellipse cx="{fx(marker["cx"])}" cy="{fy(marker["cy"])}" rx="{_num(marker["rx"])}" '
+            f'ry="{_num(marker["ry"])}" fill="{marker["color"]}"/>'
+            f'<text x="{fx(marker["cx"])}" y="{fy(marker["cy"])}" fill="white" font-size="{NUMBER_SIZE}" '
+            f'text-anchor="middle" dominant-baseline="central">{marker["number"]}</text>'
+        )
+    for label in page["labels"]:
+        x, y, w, h = label["box"]
+        parts.append(
+            f'<rect x="{fx(x)}" y="{fy(y + h)}" width="{_num(w)}" height="{_num(h)}" rx="{_num(BOX_PAD)}" '
+            f'fill="white" stroke="{label["color"]}" stroke-width="{BOX_LINE_WIDTH}" opacity="0.9"/>'
+        )
+        anchor = "start" if label["anchor"] == "left" else "end"
+        for line, baseline in zip(label["lines"], _line_baselines(label)):
+            parts.append(
+                f'<text x="{fx(label["x"])}" y="{fy(baseline)}" fill="{TEXT_COLOR}" font-size="{LABEL_SIZE}" '
+                f'text-anchor="{anchor}">{_escape(line)}</text>'
+            )
+    parts.append("</svg>")
+    return "".join(parts)
@@ -0,0 +1,221 @@
+"""
+Kullanıcının yazdığı konuyu LLM'e gitmeden USER_TOPIC_MAP'teki bir konuya eşler.
+
+    resolve("Oran-Orantı")        -> Resolution(key="oran orantı", confidence=1.0, method="exact", ...)
+    resolve("kare köklü sayılar") -> Resolution(key="kareköklü sayılar", confidence=0.865, method="fuzzy", ...)
+
+Karşılaştırma katlanmış metin üzerinden yapılır: Türkçe büyük/küçük harf (I -> ı, İ -> i), aksan/şapka
+katlama (ç -> c, ı -> i ...) ve noktalama -> boşluk. Tam eşleşme yoksa harf trigram benzerliği (Dice)
+ve kelime bazlı içerme puanlanır; güven MIN_CONFIDENCE'ın altındaysa ya da sorgudaki bir kelimenin
+ifadede karşılığı yoksa ("veri tabanı", "ayrık matematik") konu çeviriye (LLM) gider.
+Ek eş anlamlılar TOPIC_SYNONYMS_FILE (JSON: {"harita konusu": ["eş anlamlı", ...]}) ile yüklenir.
+"""
+import os
+import re
+import json
+import threading
+import unicodedata
+from collections import namedtuple
+from functools import lru_cache
+
+
+USER_TOPIC_MAP = {
+    "matematik": ["8.NS.A.2-1", "7.EE.B.4a-1", "6.NS.B.3-3"],
+    "sayılar": ["8.NS.A.2-1", "6.NS.B.3-3", "8.NS.A.2-2"],
+    "oran orantı": ["7.RP.A.1", "7.RP.A.2", "7.RP.A.3"],
+    "oran": ["7.RP.A.1"],
+    "orantı": ["7.RP.A.2"],
+    "denklem çözme": ["6.EE.B.7", "7.EE.B.4a-1", "8.EE.C.7"],
+    "denklemler": ["6.EE.B.7", "8.EE.C.7"],
+    "fonksiyonlar": ["8.F.B.5", "8.F.A.1"],
+    "veri": ["8.SP.A.1"],
+    "geometri": ["8.G.A.3-1", "8.G.A.1"],
+    "ifadeler": ["7.EE.A.2"],
+    "üslü sayılar": ["8.EE.A.1"],
+    "kareköklü sayılar": ["8.EE.A.2"],
+    "olasılık": ["7.SP.C.5"]
+}
+
+# Yerleşik eş anlamlılar (İngilizce karşılıklar dahil; bunlar için de çeviri gerekmez)
+SYNONYMS = {
+    "matematik": ["math", "mathematics"],
+    "sayılar": ["numbers"],
+    "oran orantı": ["ratio and proportion", "ratios", "oranlar"],
+    "oran": ["ratio"],
+    "orantı": ["proportion", "orantılar"],
+    "denklem çözme": ["solving equations", "denklem çözümü"],
+    "denklemler": ["equations", "denklem"],
+    "fonksiyonlar": ["functions", "fonksiyon"],
+    "veri": ["data", "istatistik", "veri analizi"],
+    "geometri": ["geometry"],
+    "ifadeler": ["expressions", "cebirsel ifadeler"],
+    "üslü sayılar": ["exponents", "üsler", "üslü ifadeler"],
+    "kareköklü sayılar": ["square roots", "karekök", "köklü sayılar"],
+    "olasılık": ["probability", "ihtimal"]
+}
+
+SYNONYMS_FILE = os.getenv("TOPIC_SYNONYMS_FILE")
+MIN_CONFIDENCE = float(os.getenv("TOPIC_MIN_CONFIDENCE", 0.6))
+# İçerme puanı için eşlenen ifadenin sorguda kaplaması gereken en az pay
+MIN_COVERAGE = float(os.getenv("TOPIC_MIN_COVERAGE", 0.75))
+# Sorgudaki bir kelimenin ifadedeki bir kelimeyle eşleşmiş sayılması için trigram benzerliği
+WORD_SIMILARITY = float(os.getenv("TOPIC_WORD_SIMILARITY", 0.5))
+
+Resolution = namedtuple("Resolution", "topic key skills confidence method")
+
+_TR_UPPER = str.maketrans({"I": "ı", "İ": "i"})
+_DOTLESS = str.maketrans({"ı": "i"})
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def turkish_casefold(text):
+    """str.lower() 'I' -> 'i' ve 'İ' -> 'i̇' (birleşik nokta) yapar; Türkçede 'I' -> 'ı', 'İ' -> 'i'."""
+    return text.translate(_TR_UPPER).casefold()
+
+
+def fold(text):
+    """Karşılaştırma anahtarı: Türkçe küçük harf, aksansız, noktalamasız, tek boşluklu."""
+    text = unicodedata.normalize("NFKD", turkish_casefold(text or "")).translate(_DOTLESS)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return " ".join(_NON_WORD.sub(" ", text).split())
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _dice(a, b):
+    return 2 * len(a & b) / (len(a) + len(b)) if a or b else 0.0
+
+
+class TopicResolver:
+    def __init__(self, topic_map=USER_TOPIC_MAP, synonyms=SYNONYMS, min_confidence=MIN_CONFIDENCE):
+        self.topic_map = topic_map
+        self.min_confidence = min_confidence
+        # katlanmış ifade -> (harita konusu, yöntem)
+        self._phrases = {}
+        for key in topic_map:
+            self._phrases[fold(key)] = (key, "exact")
+        for key, aliases in synonyms.items():
+            self._add_synonyms(key, aliases)
+        self._build()
+
+    def add_synonyms(self, key, aliases):
+        self._add_synonyms(key, aliases)
+        self._build()
+
+    def _add_synonyms(self, key, aliases):
+        if key not in self.topic_map:
+            print(f"Eş anlamlı atlandı, haritada olmayan konu: {key}")
+            return
+        for alias in aliases:
+            self._phrases.setdefault(fold(alias), (key, "synonym"))
+
+    def _build(self):
+        self._grams = {phrase: trigrams(phrase) for phrase in self._phrases}
+        self._postings = {}
+        for phrase, grams in self._grams.items():
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(phrase)
+        self.resolve.cache_clear()
+
+    def _candidates(self, folded):
+        """Sorguyla en az bir trigramı ortak olan ifadeler ve Dice benzerlikleri."""
+        grams = trigrams(folded)
+        shared = {}
+        for gram in grams:
+            for phrase in self._postings.get(gram, ()):
+                shared[phrase] = shared.get(phrase, 0) + 1
+        return {phrase: 2 * count / (len(grams) + len(self._grams[phrase])) for phrase, count in shared.items()}
+
+    @staticmethod
+    def _containment(folded, phrase):
+        """
+        İfade sorguda tam kelimeler olarak geçiyor ve sorgunun çoğunu (MIN_COVERAGE) kaplıyorsa, kapladığı
+        paya göre puan. Tek bir ortak kelime ("veri tabanı" içinde "veri") eşleşme sayılmaz.
+        """
+        if f" {phrase} " not in f" {folded} ":
+            return 0.0
+        coverage = len(phrase) / len(folded)
+        if coverage < MIN_COVERAGE:
+            return 0.0
+        return 0.5 + 0.5 * coverage
+
+    @staticmethod
+    def _words_covered(folded, phrase):
+        """
+        Sorgudaki her kelime ifadedeki bir kelimeye benziyor mu (ya da onun parçası mı: "kare köklü" ->
+        "karekoklu"). Fazladan bir kelime ("ayrık matematik", "python veri analizi") konuyu değiştirebilir.
+        """
+        words = phrase.split()
+        for token in folded.split():
+            grams = trigrams(token)
+            if not any(token in word or _dice(grams, trigrams(word)) >= WORD_SIMILARITY for word in words):
+                return False
+        return True
+
+    @lru_cache(maxsize=4096)
+    def resolve(self, topic):
+        folded = fold(topic)
+        if not folded:
+            return Resolution(topic, None, None, 0.0, None)
+
+        exact = self._phrases.get(folded)
+        if exact:
+            key, method = exact
+            return Resolution(topic, key, self.topic_map[key], 1.0, method)
+
+        best_phrase, best_score = None, 0.0
+        for phrase, score in self._candidates(folded).items():
+            score = max(score, self._containment(folded, phrase))
+            if score >= self.min_confidence and not self._words_covered(folded, phrase):
+                continue
+            # Eşitlikte daha uzun (daha belirgin) ifade
+            if (score, len(phrase)) > (best_score, len(best_phrase or "")):
+                best_phrase, best_score = phrase, score
+
+        if best_phrase is None or best_score < self.min_confidence:
+            return Resolution(topic, None, None, round(best_score, 3), None)
+        key = self._phrases[best_phrase][0]
+        return Resolution(topic, key, self.topic_map[key], round(best_score, 3), "fuzzy")
+
+
+def load_synonyms(path):
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError("Eş anlamlı dosyası {konu: [eş anlamlılar]} biçiminde olmalı.")
+    return {key: [aliases] if isinstance(aliases, str) else list(aliases) for key, aliases in data.items()}
+
+
+_resolver = None
+_resolver_lock = threading.Lock()
+
+
+def get_resolver():
+    global _resolver
+    if _resolver is None:
+        with _resolver_lock:
+            if _resolver is None:
+                synonyms = {key: list(aliases) for key, aliases in SYNONYMS.items()}
+                if SYNONYMS_FILE:
+                    try:
+                        for key, aliases in load_synonyms(SYNONYMS_FILE).items():
+                            synonyms.setdefault(key, []).extend(aliases)
+                    except (OSError, ValueError) as e:
+                        print(f"Eş anlamlı dosyası okunamadı ({SYNONYMS_FILE}): {e}")
+                _resolver = TopicResolver(USER_TOPIC_MAP, synonyms)
+    return _resolver
+
+
+def resolve(topic):
+    return get_resolver().resolve(topic)
+
+
+if __name__ == "__main__":
+    import sys
+
+    # Kullanım: python -m utils.topic_resolver "Oran-Orantı" "denklem çözümü" ...
+    for text in sys.argv[1:]:
+        print(resolve(text))
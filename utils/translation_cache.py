@@ -0,0 +1,114 @@
+import os
+import threading
+
+from .disk_cache import DiskCache
+from .topic_resolver import fold
+
+
+TRANSLATION_TTL = int(os.getenv("TRANSLATION_TTL", 30 * 24 * 60 * 60))
+NEGATIVE_TTL = int(os.getenv("TRANSLATION_NEGATIVE_TTL", 120))
+MAX_ENTRIES = int(os.getenv("TRANSLATION_CACHE_SIZE", 5000))
+
+_cache = DiskCache("translations", max_entries=MAX_ENTRIES)
+
+
+def cache_key(text):
+    # Türkçe harf ve aksan katlama: "Python Programlama", "python-programlama" aynı kayıt
+    return fold(text)
+
+
+def cached_translation(text, translate):
+    """
+    Çeviriyi önbellekten döndürür, yoksa translate(text) ile hesaplayıp saklar.
+    translate hata fırlatırsa sonuç NEGATIVE_TTL boyunca 'başarısız' olarak saklanır
+    ve o süre içinde tekrar denenmeden orijinal metin döner (servis kesintisinde yığılmayı önler).
+    """
+    key = cache_key(text)
+    try:
+        entry = _cache.get(key)
+    except Exception as e:
+        print(f"Çeviri önbelleği okunamadı: {e}")
+        entry = None
+
+    if entry is not None:
+        return entry.value if entry.ok else text
+
+    value, ok = _translate_and_store(key, text, translate)
+    return value if ok else text
+
+
+def _translate_and_store(key, text, translate):
+    """(çeviri, True) veya hata olursa negatif kayıt yazıp (None, False) döndürür."""
+    try:
+        value = translate(text)
+    except Exception as e:
+        print(f"Çeviri hatası ({text}): {e}")
+        _safe_set(key, None, NEGATIVE_TTL, ok=False)
+        return None, False
+
+    _safe_set(key, value, TRANSLATION_TTL)
+    return value, True
+
+
+def _safe_set(key, value, ttl, ok=True):
+    try:
+        _cache.set(key, value, ttl, ok=ok)
+    except Exception as e:
+        print(f"Çeviri önbelleğine yazılamadı: {e}")
+
+
+def load_topics(path):
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+def warm_up(topics, translate):
+    """
+    Konu listesini önbelleğe doldurur, başarıyla çevrilen yeni konu sayısını döndürür.
+    Varlık kontrolü isabet/ıska istatistiklerini değiştirmez; negatif kaydı süren konu atlanır.
+    """
+    translated = failed = 0
+    for topic in topics:
+        key = cache_key(topic)
+        try:
+            if _cache.contains(key):
+                continue
+        except Exception as e:
+            print(f"Çeviri önbelleği okunamadı: {e}")
+        _, ok = _translate_and_store(key, topic, translate)
+        if ok:
+            translated += 1
+        else:
+            failed += 1
+    print(f"Çeviri önbelleği ısıtıldı: {len(topics)} konu, {translated} yeni çeviri, {failed} başarısız.")
+    return translated
+
+
+def start_warm_up(path, translate):
+    """Açılışta konu dosyasını arka planda önbelleğe alır (TRANSLATION_WARM_FILE)."""
+    if not path or not os.path.exists(path):
+        return None
+    thread = threading.Thread(target=warm_up, args=(load_topics(path), translate), daemon=True,
+                              name="translation-warmup")
+    thread.start()
+    return thread
+
+
+def stats():
+    return _cache.stats()
+
+
+if __name__ == "__main__":
+    import sys
+
+    # Kullanım:
+    #   python -m utils.translation_cache warm konular.txt
+    #   python -m utils.translation_cache stats
+    #   python -m utils.translation_cache clear
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    if command == "warm":
+        from routes import translate_remote
+        warm_up(load_topics(sys.argv[2]), translate_remote)
+    elif command == "clear":
+        _cache.clear()
+    print(stats())